@@ -0,0 +1,31 @@
+"""
+Compares pushing a batch of input rows through a network one `activate()` call at a
+time with a single `activate_batch()` call, for both feed-forward network classes.
+"""
+
+import numpy as np
+
+import neat
+from common import best_time, load_config, make_feed_forward_genome
+
+
+def run():
+    config = load_config()
+    num_inputs = config.genome_config.num_inputs
+    print(f"{'nodes':>6} {'rows':>6} {'activate (ms)':>14} {'batch (ms)':>11} {'vectorized batch (ms)':>22}")
+    for num_nodes in (10, 100, 1000):
+        g = make_feed_forward_genome(config, 1, num_nodes)
+        net = neat.nn.FeedForwardNetwork.create(g, config)
+        vnet = neat.nn.VectorizedFeedForwardNetwork.create(g, config)
+        for num_rows in (100, 10000):
+            inputs = np.random.uniform(-1.0, 1.0, (num_rows, num_inputs))
+            rows = inputs.tolist()
+
+            t_loop = best_time(lambda: [net.activate(row) for row in rows], repeat=3)
+            t_batch = best_time(lambda: net.activate_batch(inputs), repeat=3)
+            t_vbatch = best_time(lambda: vnet.activate_batch(inputs), repeat=3)
+            print(f"{num_nodes:>6} {num_rows:>6} {t_loop * 1e3:>14.2f} {t_batch * 1e3:>11.2f} {t_vbatch * 1e3:>22.2f}")
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,58 @@
+"""
+Runs 60 generations of a population of 500 with a cheap fitness function and a low
+compatibility threshold, fixed versus adjusted toward 20 species, and reports the
+number of species and the time spent in speciate() every 10 generations.
+"""
+
+import random
+import time
+
+from common import load_config
+import neat
+
+POP_SIZE = 500
+GENERATIONS = 60
+
+
+def eval_genomes(genomes, config):
+    for genome_id, genome in genomes:
+        genome.fitness = sum(c.weight for c in genome.connections.values() if c.enabled)
+
+
+def run_population(target_num_species):
+    config = load_config()
+    config.pop_size = POP_SIZE
+    config.no_fitness_termination = True
+    config.species_set_config.compatibility_threshold = 1.0
+    config.species_set_config.target_num_species = target_num_species
+    config.species_set_config.max_compatibility_threshold = 10.0
+    random.seed(1)
+    population = neat.Population(config)
+    species_set = population.species
+    speciate = species_set.speciate
+    times = []
+
+    def timed_speciate(*args):
+        t0 = time.perf_counter()
+        speciate(*args)
+        times.append(time.perf_counter() - t0)
+
+    species_set.speciate = timed_speciate
+    rows = []
+    for generation in range(GENERATIONS):
+        population.run(eval_genomes, 1)
+        if (generation + 1) % 10 == 0:
+            rows.append((generation + 1, len(species_set.species), sum(times[-10:]),
+                         species_set.compatibility_threshold))
+    return rows
+
+
+def run():
+    print(f"{'target':>7} {'generation':>10} {'species':>8} {'threshold':>9} {'speciate (s/10 gen)':>20}")
+    for target_num_species in (0, 20):
+        for generation, num_species, t, threshold in run_population(target_num_species):
+            print(f"{target_num_species or 'fixed':>7} {generation:>10} {num_species:>8} {threshold:>9.3f} {t:>20.3f}")
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,60 @@
+"""
+Compares DefaultGenome with ArrayGenome for populations of genomes with about 100 to
+3,000 connections: memory held by the population, pickled size, and the time per
+genome of mutate(), configure_crossover() and distance(). Requires NumPy.
+"""
+
+import copy
+import pickle
+import random
+import tracemalloc
+
+from common import best_time, load_config, make_feed_forward_genome
+from neat.array_genome import ArrayGenome
+
+
+def population_memory(make, size):
+    tracemalloc.start()
+    population = [make(key) for key in range(size)]
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current, population
+
+
+def run():
+    config = load_config()
+    genome_config = config.genome_config
+    print(f"{'connections':>11} {'genome':>13} {'memory/genome (kB)':>19} {'pickle (kB)':>12} "
+          f"{'mutate (us)':>12} {'crossover (us)':>15} {'distance (us)':>14}")
+    for num_connections in (100, 1000, 3000):
+        genome_config.node_indexer = None
+        template = make_feed_forward_genome(config, 0, num_connections // 4)
+        template.fitness = 1.0
+        other = copy.deepcopy(template)
+        for cg in other.connections.values():
+            cg.weight = random.gauss(0.0, 1.0)
+        other.fitness = 0.0
+        size = max(10, 20000 // num_connections)
+
+        for name, convert, genome_type in (
+                ('DefaultGenome', lambda g, key: copy.deepcopy(g), type(template)),
+                ('ArrayGenome', lambda g, key: ArrayGenome.from_genome(g, genome_config, key), ArrayGenome)):
+            memory, population = population_memory(lambda key: convert(template, key), size)
+            pickled = len(pickle.dumps(population)) / size
+            g1 = convert(template, 1)
+            g2 = convert(other, 2)
+
+            def crossover():
+                child = genome_type(3)
+                child.configure_crossover(g1, g2, genome_config)
+
+            g = convert(template, 4)
+            t_mutate = best_time(lambda: g.mutate(genome_config), number=10)
+            t_crossover = best_time(crossover, number=10)
+            t_distance = best_time(lambda: g1.distance(g2, genome_config), number=10)
+            print(f"{num_connections:>11} {name:>13} {memory / size / 1024:>19.1f} {pickled / 1024:>12.1f} "
+                  f"{t_mutate * 1e6:>12.0f} {t_crossover * 1e6:>15.0f} {t_distance * 1e6:>14.0f}")
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,67 @@
+"""
+Compares genomes built from the default gene classes with genomes built from their
+compact (__slots__) versions, made by the compact_genes option, for genomes of about
+100 to 10,000 connections: memory held per genome, pickled size per genome, and the
+time to copy and to cross over every gene of a genome.
+"""
+
+import copy
+import pickle
+import random
+import tracemalloc
+
+from common import best_time, load_config, make_feed_forward_genome
+from neat.genes import compact_gene_type
+
+
+def convert(genome, genome_config):
+    """Returns a copy of the genome with its genes in the configuration's gene classes."""
+    g = copy.copy(genome)
+    g.nodes = {}
+    g.connections = {}
+    for genes, new_genes, gene_type in ((genome.nodes, g.nodes, genome_config.node_gene_type),
+                                        (genome.connections, g.connections, genome_config.connection_gene_type)):
+        for key, gene in genes.items():
+            new_gene = gene_type(key)
+            for a in gene_type._gene_attributes:
+                setattr(new_gene, a.name, getattr(gene, a.name))
+            new_genes[key] = new_gene
+    return g
+
+
+def run():
+    config = load_config()
+    genome_config = config.genome_config
+    default_types = (genome_config.node_gene_type, genome_config.connection_gene_type)
+    compact_types = tuple(compact_gene_type(gene_type) for gene_type in default_types)
+    print(f"{'connections':>11} {'genes':>8} {'memory/genome (kB)':>19} {'pickle (kB)':>12} "
+          f"{'copy (us)':>10} {'crossover (us)':>15}")
+    for num_connections in (100, 1000, 10000):
+        genome_config.node_indexer = None
+        template = make_feed_forward_genome(config, 0, num_connections // 4)
+        size = max(5, 20000 // num_connections)
+        for name, (node_type, connection_type) in (('default', default_types), ('compact', compact_types)):
+            genome_config.node_gene_type = node_type
+            genome_config.connection_gene_type = connection_type
+            g = convert(template, genome_config)
+
+            tracemalloc.start()
+            population = [convert(g, genome_config) for _ in range(size)]
+            memory = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+            pickled = len(pickle.dumps(population)) / size
+            del population
+
+            genes = list(g.connections.values()) + list(g.nodes.values())
+            others = [gene.copy() for gene in genes]
+            for gene in others:
+                if hasattr(gene, 'weight'):
+                    gene.weight = random.gauss(0.0, 1.0)
+            t_copy = best_time(lambda: [gene.copy() for gene in genes])
+            t_crossover = best_time(lambda: [gene1.crossover(gene2) for gene1, gene2 in zip(genes, others)])
+            print(f"{num_connections:>11} {name:>8} {memory / size / 1024:>19.1f} {pickled / 1024:>12.1f} "
+                  f"{t_copy * 1e6:>10.0f} {t_crossover * 1e6:>15.0f}")
+
+
+if __name__ == '__main__':
+    run()
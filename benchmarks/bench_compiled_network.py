@@ -0,0 +1,42 @@
+"""
+Compares the per-call activation time of the interpreted feed-forward and recurrent
+networks with their compiled counterparts, along with the one-off cost of creating
+each kind of network.
+"""
+
+import random
+
+import neat
+from common import best_time, load_config, make_feed_forward_genome
+
+
+def run():
+    config = load_config()
+    num_inputs = config.genome_config.num_inputs
+    inputs = [random.uniform(-1.0, 1.0) for _ in range(num_inputs)]
+    print(f"{'nodes':>6} {'kind':>10} {'create (us)':>12} {'compiled create (us)':>21} "
+          f"{'activate (us)':>14} {'compiled activate (us)':>23}")
+    for num_nodes in (10, 30, 100, 300):
+        g = make_feed_forward_genome(config, 1, num_nodes)
+        for kind, net_type, compiled_type in (('ff', neat.nn.FeedForwardNetwork, neat.nn.CompiledFeedForwardNetwork),
+                                              ('recurrent', neat.nn.RecurrentNetwork,
+                                               neat.nn.CompiledRecurrentNetwork)):
+            net = net_type.create(g, config)
+            cnet = compiled_type.create(g, config)
+            first_connection = next(iter(g.connections.values()))
+
+            def cold_compile():
+                # Compiled code is cached by its source, so change a weight to measure a cold compile.
+                first_connection.weight = random.random()
+                compiled_type.create(g, config)
+
+            t_create = best_time(lambda: net_type.create(g, config), number=10)
+            t_ccreate = best_time(cold_compile, number=10)
+            t_act = best_time(lambda: net.activate(inputs), number=1000)
+            t_cact = best_time(lambda: cnet.activate(inputs), number=1000)
+            print(f"{num_nodes:>6} {kind:>10} {t_create * 1e6:>12.1f} {t_ccreate * 1e6:>21.1f} "
+                  f"{t_act * 1e6:>14.2f} {t_cact * 1e6:>23.2f}")
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,71 @@
+"""
+Times one speciate() call on 300 genomes mutated from a common ancestor of 10 to
+300 nodes, each genome in a species of its own (the most distances): with every
+distance computed in full by DefaultGenome.distance, with distances stopping at the
+bound speciation needs, and with bounded distances computed from cached
+DistanceArrays for genomes of at least DISTANCE_ARRAYS_MIN_GENES genes.
+"""
+
+import copy
+import random
+
+import neat
+import neat.species
+from common import best_time, load_config, make_feed_forward_genome
+from neat.reporting import ReporterSet
+
+POP_SIZE = 300
+
+
+def make_population(config, num_nodes, pop_size=POP_SIZE):
+    genome_config = config.genome_config
+    ancestor = make_feed_forward_genome(config, 0, num_nodes)
+    population = {}
+    for key in range(1, pop_size + 1):
+        g = copy.deepcopy(ancestor)
+        g.key = key
+        for _ in range(5):
+            g.mutate(genome_config)
+        population[key] = g
+    return population
+
+
+class UnboundedGenome(neat.DefaultGenome):
+    """A DefaultGenome whose distances are always computed in full."""
+
+    def distance(self, other, config):
+        return neat.DefaultGenome.distance(self, other, config)
+
+
+def speciate(config, population, min_genes):
+    neat.species.DISTANCE_ARRAYS_MIN_GENES = min_genes
+    species = config.species_set_type(config.species_set_config, ReporterSet())
+    species.speciate(config, population, 0)
+    return len(species.species)
+
+
+def run():
+    config = load_config()
+    config.genome_config.node_indexer = None
+    config.species_set_config.compatibility_threshold = 1.0
+    min_genes = neat.species.DISTANCE_ARRAYS_MIN_GENES
+    print(f"{'nodes':>6} {'genes':>6} {'species':>8} {'full (s)':>9} {'bounded (s)':>12} {'+ arrays (s)':>13} "
+          f"{'speedup':>8}")
+    for num_nodes in (10, 30, 100, 300):
+        random.seed(num_nodes)
+        population = make_population(config, num_nodes)
+        genes = sum(len(g.nodes) + len(g.connections) for g in population.values()) / POP_SIZE
+        unbounded = copy.deepcopy(population)
+        for g in unbounded.values():
+            g.__class__ = UnboundedGenome
+        full = best_time(lambda: speciate(config, unbounded, min_genes), repeat=3)
+        bounded = best_time(lambda: speciate(config, population, float('inf')), repeat=3)
+        arrays = best_time(lambda: speciate(config, population, min_genes), repeat=3)
+        num_species = speciate(config, population, min_genes)
+        print(f"{num_nodes:>6} {genes:>6.0f} {num_species:>8} {full:>9.3f} {bounded:>12.3f} {arrays:>13.3f} "
+              f"{full / min(bounded, arrays):>7.1f}x")
+    neat.species.DISTANCE_ARRAYS_MIN_GENES = min_genes
+
+
+if __name__ == '__main__':
+    run()
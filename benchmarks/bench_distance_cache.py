@@ -0,0 +1,49 @@
+"""
+Times speciate() for 1,000 genomes of about 150 genes, descended one from another,
+with the genomic distance cache unbounded and limited to 10,000 and 1,000 values,
+and measures the peak memory allocated (with tracemalloc) and the cache's counts.
+"""
+
+import copy
+import random
+import time
+import tracemalloc
+from itertools import count
+
+from bench_representative_index import make_phylogeny
+from common import load_config
+from neat.reporting import ReporterSet
+
+POP_SIZE = 1000
+
+
+def run():
+    config = load_config()
+    config.genome_config.node_indexer = None
+    random.seed(1)
+    population = make_phylogeny(config, 30, POP_SIZE)
+
+    print(f"{'threshold':>9} {'cache size':>10} {'species':>8} {'time (s)':>9} {'peak (MB)':>10} "
+          f"{'stored':>8} {'hits':>6} {'misses':>8}")
+    for threshold in (1.5, 2.5):
+        for cache_size in (0, 10000, 1000):
+            species_set_config = copy.copy(config.species_set_config)
+            species_set_config.compatibility_threshold = threshold
+            species_set_config.distance_cache_size = cache_size
+            species_set = config.species_set_type(species_set_config, ReporterSet())
+
+            tracemalloc.start()
+            t0 = time.perf_counter()
+            species_set.indexer = count(1)
+            species_set.speciate(config, population, 0)
+            t = time.perf_counter() - t0
+            peak = tracemalloc.get_traced_memory()[1] / 2 ** 20
+            tracemalloc.stop()
+
+            cache = species_set.distance_cache
+            print(f"{threshold:>9} {cache_size or 'none':>10} {len(species_set.species):>8} {t:>9.3f} {peak:>10.2f} "
+                  f"{cache.peak_entries:>8} {cache.hits:>6} {cache.misses:>8}")
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,35 @@
+"""
+Times the per-gene operations used in reproduction (attribute initialization,
+mutation, copying and crossover) for DefaultNodeGene and DefaultConnectionGene,
+calling the gene methods directly versus the configuration's precompiled
+GeneOperators.
+"""
+
+from common import best_time, load_config
+
+
+def run():
+    config = load_config()
+    genome_config = config.genome_config
+    number = 10000
+    print(f"{'gene':>22} {'operation':>15} {'method (us)':>12} {'compiled (us)':>14} {'speedup':>8}")
+    for gene_type, key in ((genome_config.node_gene_type, 0), (genome_config.connection_gene_type, (-1, 0))):
+        operators = genome_config.get_gene_operators(gene_type)
+        gene1 = gene_type(key)
+        gene1.init_attributes(genome_config)
+        gene2 = gene_type(key)
+        gene2.init_attributes(genome_config)
+        cases = (('init_attributes', lambda: gene1.init_attributes(genome_config),
+                  lambda: operators.init_attributes(gene1)),
+                 ('mutate', lambda: gene1.mutate(genome_config), lambda: operators.mutate(gene1)),
+                 ('copy', lambda: gene1.copy(), lambda: operators.copy(gene1)),
+                 ('crossover', lambda: gene1.crossover(gene2), lambda: operators.crossover(gene1, gene2)))
+        for name, method, compiled in cases:
+            t_method = best_time(method, repeat=5, number=number)
+            t_compiled = best_time(compiled, repeat=5, number=number)
+            print(f"{gene_type.__name__:>22} {name:>15} {t_method * 1e6:>12.2f} {t_compiled * 1e6:>14.2f} "
+                  f"{t_method / t_compiled:>7.1f}x")
+
+
+if __name__ == '__main__':
+    run()
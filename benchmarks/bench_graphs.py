@@ -0,0 +1,65 @@
+"""
+Times the functions in neat.graphs on random acyclic genomes of about 100 to 10,000
+connections, either 8 layers deep or one node per layer, comparing the original connection-scanning creates_cycle with the
+adjacency-indexed version, both rebuilding the index per query and reusing a prebuilt
+Adjacency.
+"""
+
+import random
+
+from common import best_time, load_config, make_feed_forward_genome
+from neat.graphs import Adjacency, creates_cycle, feed_forward_layers, required_for_output
+
+
+def legacy_creates_cycle(connections, test):
+    i, o = test
+    if i == o:
+        return True
+
+    visited = {o}
+    while True:
+        num_added = 0
+        for a, b in connections:
+            if a in visited and b not in visited:
+                if b == i:
+                    return True
+
+                visited.add(b)
+                num_added += 1
+
+        if num_added == 0:
+            return False
+
+
+def run():
+    config = load_config()
+    inputs = config.genome_config.input_keys
+    outputs = config.genome_config.output_keys
+    print(f"{'connections':>11} {'depth':>6} {'cycle, previous (us)':>21} {'cycle (us)':>11} {'cycle, prebuilt (us)':>21} "
+          f"{'required (us)':>14} {'layers (us)':>12}")
+    for num_connections, depth in ((100, 8), (1000, 8), (3000, 8), (10000, 8), (100, 25), (1000, 250),
+                                   (3000, 750)):
+        g = make_feed_forward_genome(config, 1, num_connections // 4, depth=depth)
+        # Evolved genomes list their connections in the order they were added, not in topological order.
+        connections = list(g.connections)
+        random.shuffle(connections)
+        adjacency = Adjacency(connections)
+        nodes = list(g.nodes)
+        tests = [(random.choice(nodes), random.choice(nodes)) for _ in range(20)]
+
+        def check(func, graph):
+            for test in tests:
+                func(graph, test)
+
+        number = max(1, 1000 // num_connections)
+        t_legacy = best_time(lambda: check(legacy_creates_cycle, connections), repeat=3, number=number) / len(tests)
+        t_cycle = best_time(lambda: check(creates_cycle, connections), repeat=3, number=number) / len(tests)
+        t_prebuilt = best_time(lambda: check(creates_cycle, adjacency), repeat=3, number=number * 10) / len(tests)
+        t_required = best_time(lambda: required_for_output(inputs, outputs, connections), repeat=3, number=number)
+        t_layers = best_time(lambda: feed_forward_layers(inputs, outputs, connections), repeat=3, number=number)
+        print(f"{len(connections):>11} {depth:>6} {t_legacy * 1e6:>21.1f} {t_cycle * 1e6:>11.1f} {t_prebuilt * 1e6:>21.1f} "
+              f"{t_required * 1e6:>14.1f} {t_layers * 1e6:>12.1f}")
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,54 @@
+"""
+Times 10 generations of 2,000 genomes with a cheap fitness function, as one
+Population versus an IslandModel of 2 and 4 islands sharing the genomes between
+them (migrating every 5 generations). The time is mostly reproduction and
+speciation; the islands spread it over processes, and each has less of it to do,
+since speciation time grows with both the population and the number of species.
+"""
+
+import os
+import random
+import time
+
+from common import load_config
+import neat
+
+TOTAL_POP_SIZE = 2000
+GENERATIONS = 10
+
+
+def eval_genomes(genomes, config):
+    for genome_id, genome in genomes:
+        genome.fitness = sum(c.weight for c in genome.connections.values() if c.enabled)
+
+
+def make_config(pop_size):
+    config = load_config()
+    config.pop_size = pop_size
+    config.no_fitness_termination = True
+    config.species_set_config.compatibility_threshold = 2.0
+    return config
+
+
+def run():
+    print(f"{os.cpu_count()} CPUs")
+    print(f"{'islands':>8} {'genomes each':>13} {'time (s)':>9}")
+    random.seed(1)
+    population = neat.Population(make_config(TOTAL_POP_SIZE))
+    t0 = time.perf_counter()
+    population.run(eval_genomes, GENERATIONS)
+    print(f"{'none':>8} {TOTAL_POP_SIZE:>13} {time.perf_counter() - t0:>9.3f}")
+
+    for num_islands in (2, 4):
+        pop_size = TOTAL_POP_SIZE // num_islands
+        islands = neat.IslandModel(make_config(pop_size), num_islands, migration_interval=5)
+        try:
+            t0 = time.perf_counter()
+            islands.run(eval_genomes, GENERATIONS)
+            print(f"{num_islands:>8} {pop_size:>13} {time.perf_counter() - t0:>9.3f}")
+        finally:
+            islands.close()
+
+
+if __name__ == '__main__':
+    run()
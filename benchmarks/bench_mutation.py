@@ -0,0 +1,29 @@
+"""
+Times the attribute mutation step of DefaultGenome.mutate (structural mutation
+probabilities set to zero) on genomes of about 10 to 10,000 connections, with the
+vectorized_mutation option off and on.
+"""
+
+from common import best_time, load_config, make_feed_forward_genome
+
+
+def run():
+    config = load_config()
+    genome_config = config.genome_config
+    genome_config.node_add_prob = genome_config.node_delete_prob = 0.0
+    genome_config.conn_add_prob = genome_config.conn_delete_prob = 0.0
+    print(f"{'connections':>11} {'per gene (us)':>14} {'vectorized (us)':>16} {'speedup':>8}")
+    for num_connections in (10, 100, 1000, 3000, 10000):
+        g = make_feed_forward_genome(config, 1, max(2, num_connections // 4))
+        genome_config.node_indexer = None
+
+        genome_config.vectorized_mutation = False
+        t_per_gene = best_time(lambda: g.mutate(genome_config), repeat=5, number=10)
+        genome_config.vectorized_mutation = True
+        t_vectorized = best_time(lambda: g.mutate(genome_config), repeat=5, number=10)
+        print(f"{len(g.connections):>11} {t_per_gene * 1e6:>14.1f} {t_vectorized * 1e6:>16.1f} "
+              f"{t_per_gene / t_vectorized:>7.1f}x")
+
+
+if __name__ == '__main__':
+    run()
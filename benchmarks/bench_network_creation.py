@@ -0,0 +1,88 @@
+"""
+Measures FeedForwardNetwork.create for genomes of roughly 10 to 10,000 connections,
+against a copy of the previous implementation, which rescanned the full connection
+list for every layer and for every node it evaluated.
+"""
+
+import neat
+from common import best_time, load_config, make_feed_forward_genome
+
+
+def legacy_required_for_output(inputs, outputs, connections):
+    required = set(outputs)
+    s = set(outputs)
+    while 1:
+        t = set(a for (a, b) in connections if b in s and a not in s)
+        if not t:
+            break
+
+        layer_nodes = set(x for x in t if x not in inputs)
+        if not layer_nodes:
+            break
+
+        required = required.union(layer_nodes)
+        s = s.union(t)
+
+    return required
+
+
+def legacy_feed_forward_layers(inputs, outputs, connections):
+    required = legacy_required_for_output(inputs, outputs, connections)
+
+    layers = []
+    s = set(inputs)
+    while 1:
+        c = set(b for (a, b) in connections if a in s and b not in s)
+        t = set()
+        for n in c:
+            if n in required and all(a in s for (a, b) in connections if b == n):
+                t.add(n)
+
+        if not t:
+            break
+
+        layers.append(t)
+        s = s.union(t)
+
+    return layers
+
+
+def legacy_create(genome, config):
+    connections = [cg.key for cg in genome.connections.values() if cg.enabled]
+
+    layers = legacy_feed_forward_layers(config.genome_config.input_keys, config.genome_config.output_keys,
+                                        connections)
+    node_evals = []
+    for layer in layers:
+        for node in layer:
+            inputs = []
+            for conn_key in connections:
+                inode, onode = conn_key
+                if onode == node:
+                    cg = genome.connections[conn_key]
+                    inputs.append((inode, cg.weight))
+
+            ng = genome.nodes[node]
+            aggregation_function = config.genome_config.aggregation_function_defs.get(ng.aggregation)
+            activation_function = config.genome_config.activation_defs.get(ng.activation)
+            node_evals.append((node, activation_function, aggregation_function, ng.bias, ng.response, inputs))
+
+    return neat.nn.FeedForwardNetwork(config.genome_config.input_keys, config.genome_config.output_keys,
+                                      node_evals)
+
+
+def run():
+    config = load_config()
+    print(f"{'connections':>11} {'nodes':>6} {'previous (ms)':>14} {'create (ms)':>12} {'speedup':>8}")
+    for num_connections in (10, 100, 1000, 3000, 10000):
+        fan_in = 4
+        g = make_feed_forward_genome(config, 1, max(1, num_connections // fan_in), fan_in=fan_in, depth=8)
+        number = max(1, 2000 // num_connections)
+        t_legacy = best_time(lambda: legacy_create(g, config), repeat=3, number=number)
+        t_create = best_time(lambda: neat.nn.FeedForwardNetwork.create(g, config), repeat=3, number=number * 10)
+        print(f"{len(g.connections):>11} {len(g.nodes):>6} {t_legacy * 1e3:>14.3f} {t_create * 1e3:>12.3f} "
+              f"{t_legacy / t_create:>7.1f}x")
+
+
+if __name__ == '__main__':
+    run()
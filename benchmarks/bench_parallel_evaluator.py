@@ -0,0 +1,64 @@
+"""
+Times ParallelEvaluator.evaluate on 1,000 genomes of 2 and of 30 nodes with a
+trivial fitness function, so that the time is almost all inter-process overhead: the
+previous implementation (one task per genome, each sending the configuration
+along with the genome and returning the fitness) versus chunks of genomes sent
+to workers given the configuration once, with fixed and adaptive chunk sizes.
+The first evaluation, which starts the workers, is not timed.
+"""
+
+import random
+from multiprocessing import Pool
+
+from common import best_time, load_config, make_feed_forward_genome
+import neat
+
+NUM_GENOMES = 1000
+NUM_NODES = (2, 30)
+NUM_WORKERS = 2
+
+
+def eval_genome(genome, config):
+    return float(len(genome.connections))
+
+
+class PerGenomeEvaluator(object):
+    """The previous ParallelEvaluator: one task per genome, with the configuration."""
+
+    def __init__(self, num_workers, eval_function):
+        self.pool = Pool(processes=num_workers)
+        self.eval_function = eval_function
+
+    def close(self):
+        self.pool.close()
+        self.pool.join()
+
+    def evaluate(self, genomes, config):
+        jobs = []
+        for ignored_genome_id, genome in genomes:
+            jobs.append(self.pool.apply_async(self.eval_function, (genome, config)))
+        for job, (ignored_genome_id, genome) in zip(jobs, genomes):
+            genome.fitness = job.get()
+
+
+def run():
+    config = load_config()
+    print(f"{'nodes':>5} {'evaluator':>12} {'time (s)':>9} {'per genome (us)':>16}")
+    for num_nodes in NUM_NODES:
+        random.seed(1)
+        genomes = [(key, make_feed_forward_genome(config, key, num_nodes)) for key in range(NUM_GENOMES)]
+
+        evaluators = [('per genome', PerGenomeEvaluator(NUM_WORKERS, eval_genome))]
+        for chunk_size in (1, 25, None):
+            name = 'chunks of {0}'.format(chunk_size) if chunk_size else 'adaptive'
+            evaluators.append((name, neat.ParallelEvaluator(NUM_WORKERS, eval_genome, chunk_size=chunk_size)))
+
+        for name, evaluator in evaluators:
+            evaluator.evaluate(genomes, config)
+            t = best_time(lambda: evaluator.evaluate(genomes, config))
+            print(f"{num_nodes:>5} {name:>12} {t:>9.3f} {t / NUM_GENOMES * 1e6:>16.1f}")
+            evaluator.close()
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,52 @@
+"""
+Times one call of reproduce() with DefaultReproduction and with ParallelReproduction
+using 1, 2 and 4 worker processes, for populations of 1,000 and 10,000 genomes of
+about 100 connections in a single species.
+"""
+
+import copy
+import gc
+import time
+
+from bench_reproduction import make_species
+from common import load_config
+from neat.reproduction import DefaultReproduction, ParallelReproduction
+
+
+def run():
+    config = load_config()
+    print(f"{'population':>10} {'default (s)':>12} {'1 worker (s)':>13} {'2 workers (s)':>14} "
+          f"{'4 workers (s)':>14}")
+    for pop_size in (1000, 10000):
+        species, stagnation, reporters = make_species(config, pop_size, 8, 4.0)
+        cases = [(DefaultReproduction, config.reproduction_config)]
+        for num_workers in (1, 2, 4):
+            reproduction_config = ParallelReproduction.parse_config(
+                {'elitism': str(config.reproduction_config.elitism),
+                 'survival_threshold': str(config.reproduction_config.survival_threshold),
+                 'min_species_size': str(config.reproduction_config.min_species_size),
+                 'num_workers': str(num_workers), 'chunk_size': '100'})
+            cases.append((ParallelReproduction, reproduction_config))
+
+        times = []
+        for reproduction_type, reproduction_config in cases:
+            reproduction = reproduction_type(reproduction_config, reporters, copy.deepcopy(stagnation))
+            best = None
+            for _ in range(3):
+                species_copy = copy.deepcopy(species)
+                reproduction.stagnation = copy.deepcopy(stagnation)
+                reproduction.genome_indexer = iter(range(pop_size + 1, 10 * pop_size))
+                gc.collect()
+                # The worker processes are started by the first call, which is included.
+                t0 = time.perf_counter()
+                reproduction.reproduce(config, species_copy, pop_size, 1)
+                elapsed = time.perf_counter() - t0
+                best = elapsed if best is None else min(best, elapsed)
+            if reproduction_type is ParallelReproduction:
+                reproduction.close()
+            times.append(best)
+        print(f"{pop_size:>10} {times[0]:>12.3f} {times[1]:>13.3f} {times[2]:>14.3f} {times[3]:>14.3f}")
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,54 @@
+"""
+Times speciate() for a second generation of 1,000 genomes of about 150 genes,
+against the few dozen species of the first, computing the distances serially and
+in 2 and 4 worker processes (started beforehand).
+"""
+
+import copy
+import random
+from itertools import count
+
+from bench_distance import make_population
+from common import best_time, load_config
+from neat.reporting import ReporterSet
+
+POP_SIZE = 1000
+
+
+def run():
+    config = load_config()
+    genome_config = config.genome_config
+    genome_config.node_indexer = None
+    config.species_set_config.compatibility_threshold = 2.0
+    random.seed(1)
+    population = make_population(config, 30, POP_SIZE)
+    first = config.species_set_type(config.species_set_config, ReporterSet())
+    first.speciate(config, population, 0)
+
+    # The next generation: mutated copies of the first.
+    next_population = {}
+    for key, g in population.items():
+        child = copy.deepcopy(g)
+        child.key = key + POP_SIZE
+        child.mutate(genome_config)
+        next_population[child.key] = child
+
+    print(f"{'workers':>8} {'species':>8} {'time (s)':>9}")
+    for num_workers in (1, 2, 4):
+        species_set_config = copy.copy(config.species_set_config)
+        species_set_config.num_workers = num_workers
+        species_set = config.species_set_type(species_set_config, ReporterSet())
+
+        def speciate():
+            species_set.species = dict((sid, copy.copy(s)) for sid, s in first.species.items())
+            species_set.indexer = count(max(first.species) + 1)
+            species_set.speciate(config, next_population, 1)
+
+        speciate()
+        t = best_time(speciate, repeat=3)
+        print(f"{num_workers:>8} {len(species_set.species):>8} {t:>9.3f}")
+        species_set.close()
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,54 @@
+"""
+Times 10 generations of a population of 500 evaluated by a ParallelEvaluator of 4
+workers with a fitness function that waits 20 ms per genome (as for a simulation running
+elsewhere), run sequentially versus pipelined, evaluating each generation during
+its speciation.
+"""
+
+import random
+import time
+
+from common import load_config
+import neat
+
+POP_SIZE = 500
+GENERATIONS = 10
+
+
+def eval_genome(genome, config):
+    time.sleep(0.02)
+    return sum(c.weight for c in genome.connections.values() if c.enabled)
+
+
+def run_population(evaluator, pipelined):
+    config = load_config()
+    config.pop_size = POP_SIZE
+    config.no_fitness_termination = True
+    config.species_set_config.compatibility_threshold = 1.5
+    random.seed(1)
+    population = neat.Population(config)
+    speciate = population.species.speciate
+    times = []
+
+    def timed_speciate(*args):
+        t0 = time.perf_counter()
+        speciate(*args)
+        times.append(time.perf_counter() - t0)
+
+    population.species.speciate = timed_speciate
+    t0 = time.perf_counter()
+    population.run(evaluator.evaluate, GENERATIONS, pipelined=pipelined)
+    return time.perf_counter() - t0, sum(times), len(population.species.species)
+
+
+def run():
+    evaluator = neat.ParallelEvaluator(4, eval_genome)
+    print(f"{'mode':>10} {'species':>8} {'speciate (s)':>13} {'total (s)':>10}")
+    for pipelined in (False, True):
+        total, speciate_time, num_species = run_population(evaluator, pipelined)
+        mode = 'pipelined' if pipelined else 'sequential'
+        print(f"{mode:>10} {num_species:>8} {speciate_time:>13.3f} {total:>10.3f}")
+
+
+if __name__ == '__main__':
+    run()
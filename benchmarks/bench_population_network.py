@@ -0,0 +1,44 @@
+"""
+Compares evaluating a shared dataset on every genome of a population one network at
+a time with a single `VectorizedPopulationNetwork` covering the whole population.
+Network creation time is included, as it is paid every generation.
+"""
+
+import random
+
+import numpy as np
+
+import neat
+from common import best_time, load_config, make_feed_forward_genome
+
+
+def run():
+    config = load_config()
+    num_inputs = config.genome_config.num_inputs
+    print(f"{'genomes':>8} {'rows':>6} {'activate (ms)':>14} {'activate_batch (ms)':>20} {'population (ms)':>16}")
+    for pop_size in (50, 150, 1000):
+        genomes = [make_feed_forward_genome(config, key, random.randint(10, 40)) for key in range(pop_size)]
+        for num_rows in (4, 200):
+            inputs = np.random.uniform(-1.0, 1.0, (num_rows, num_inputs))
+            rows = inputs.tolist()
+
+            def per_genome():
+                for g in genomes:
+                    net = neat.nn.FeedForwardNetwork.create(g, config)
+                    [net.activate(row) for row in rows]
+
+            def per_genome_batch():
+                for g in genomes:
+                    neat.nn.FeedForwardNetwork.create(g, config).activate_batch(inputs)
+
+            def population():
+                neat.nn.VectorizedPopulationNetwork.create(genomes, config).activate_batch(inputs)
+
+            t_loop = best_time(per_genome, repeat=3)
+            t_batch = best_time(per_genome_batch, repeat=3)
+            t_pop = best_time(population, repeat=3)
+            print(f"{pop_size:>8} {num_rows:>6} {t_loop * 1e3:>14.1f} {t_batch * 1e3:>20.1f} {t_pop * 1e3:>16.1f}")
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,71 @@
+"""
+Times speciate() for 1,000 genomes of about 150 genes, descended one from another,
+forming from about ten to a few hundred species, finding each genome's nearest
+representative among all of them versus with a RepresentativeIndex of 4 and 16
+pivots, and counts the genomic distances computed and skipped.
+"""
+
+import copy
+import random
+from itertools import count
+
+from common import best_time, load_config, make_feed_forward_genome
+from neat.reporting import BaseReporter, ReporterSet
+
+POP_SIZE = 1000
+
+
+class IndexReporter(BaseReporter):
+    def __init__(self):
+        self.message = ''
+
+    def info(self, msg):
+        if msg.startswith('Representative index'):
+            self.message = msg
+
+
+def make_phylogeny(config, num_nodes, pop_size):
+    """Each genome is a mutated copy of one of the last 50 before it, or sometimes of any before it."""
+    genome_config = config.genome_config
+    genomes = [make_feed_forward_genome(config, 0, num_nodes)]
+    population = {}
+    for key in range(1, pop_size + 1):
+        g = copy.deepcopy(random.choice(genomes[-50:] if random.random() < 0.9 else genomes))
+        g.key = key
+        for _ in range(3):
+            g.mutate(genome_config)
+        genomes.append(g)
+        population[key] = g
+    return population
+
+
+def run():
+    config = load_config()
+    config.genome_config.node_indexer = None
+    random.seed(1)
+    population = make_phylogeny(config, 30, POP_SIZE)
+
+    print(f"{'threshold':>9} {'pivots':>7} {'species':>8} {'time (s)':>9}  distances")
+    for threshold in (1.5, 2.0, 2.5):
+        for num_pivots in (0, 4, 16):
+            species_set_config = copy.copy(config.species_set_config)
+            species_set_config.compatibility_threshold = threshold
+            species_set_config.num_pivots = num_pivots
+            species_set_config.distance_is_metric = True
+            reporters = ReporterSet()
+            reporter = IndexReporter()
+            reporters.add(reporter)
+            species_set = config.species_set_type(species_set_config, reporters)
+
+            def speciate():
+                species_set.species = {}
+                species_set.indexer = count(1)
+                species_set.speciate(config, population, 0)
+
+            t = best_time(speciate, repeat=3)
+            counts = reporter.message.partition(': ')[2] or 'all compared'
+            print(f"{threshold:>9} {num_pivots:>7} {len(species_set.species):>8} {t:>9.3f}  {counts}")
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,63 @@
+"""
+Times one call of reproduce() with DefaultReproduction and with BatchReproduction,
+for populations of 1,000 and 10,000 genomes of about 30 and 100 connections in a
+single species, and for 1,000 genomes that are each in a species of their own.
+"""
+
+import copy
+import gc
+import random
+import time
+
+from common import load_config
+from neat.reporting import ReporterSet
+from neat.reproduction import BatchReproduction, DefaultReproduction
+from neat.stagnation import DefaultStagnation
+
+
+def make_species(config, pop_size, num_hidden, compatibility_threshold):
+    config.species_set_config.compatibility_threshold = compatibility_threshold
+    genome_config = config.genome_config
+    genome_config.num_hidden = num_hidden
+    genome_config.initial_connection = 'full_nodirect'
+    genome_config.node_indexer = None
+    reporters = ReporterSet()
+    stagnation = DefaultStagnation(config.stagnation_config, reporters)
+    reproduction = DefaultReproduction(config.reproduction_config, reporters, stagnation)
+    population = reproduction.create_new(config.genome_type, genome_config, pop_size)
+    for g in population.values():
+        g.fitness = random.random()
+    species = config.species_set_type(config.species_set_config, reporters)
+    species.speciate(config, population, 0)
+    return species, stagnation, reporters
+
+
+def run():
+    config = load_config()
+    print(f"{'population':>10} {'connections':>11} {'species':>8} {'default (s)':>12} {'batch (s)':>10} "
+          f"{'speedup':>8}")
+    for pop_size, num_hidden, compatibility_threshold in ((1000, 0, 4.0), (1000, 8, 4.0), (10000, 0, 4.0),
+                                                          (10000, 8, 4.0), (1000, 8, 3.0)):
+        species, stagnation, reporters = make_species(config, pop_size, num_hidden, compatibility_threshold)
+        members = [g for s in species.species.values() for g in s.members.values()]
+        num_connections = sum(len(g.connections) for g in members) / len(members)
+        times = []
+        for reproduction_type in (DefaultReproduction, BatchReproduction):
+            best = None
+            for _ in range(3):
+                species_copy = copy.deepcopy(species)
+                reproduction = reproduction_type(config.reproduction_config, reporters,
+                                                 copy.deepcopy(stagnation))
+                reproduction.genome_indexer = iter(range(pop_size + 1, 10 * pop_size))
+                gc.collect()
+                t0 = time.perf_counter()
+                reproduction.reproduce(config, species_copy, pop_size, 1)
+                elapsed = time.perf_counter() - t0
+                best = elapsed if best is None else min(best, elapsed)
+            times.append(best)
+        print(f"{pop_size:>10} {num_connections:>11.0f} {len(species.species):>8} {times[0]:>12.3f} "
+              f"{times[1]:>10.3f} {times[0] / times[1]:>7.1f}x")
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,54 @@
+"""
+Times 1,000 evaluations with long-tailed run times (a few milliseconds, but
+occasionally a hundred times longer) on 4 worker processes: 5 generations of a
+population of 200 with ParallelEvaluator, versus 5 pseudo-generations of a
+SteadyStatePopulation, which keeps the workers busy instead of waiting for each
+generation's slowest evaluation.
+"""
+
+import random
+import time
+
+from common import load_config
+import neat
+
+POP_SIZE = 200
+GENERATIONS = 5
+NUM_WORKERS = 4
+
+
+def eval_genome(genome, config):
+    # Most evaluations take 2 ms; one in a hundred takes 200 ms.
+    rng = random.Random(genome.key)
+    time.sleep(0.2 if rng.random() < 0.01 else 0.002)
+    return sum(c.weight for c in genome.connections.values() if c.enabled)
+
+
+def make_config():
+    config = load_config()
+    config.pop_size = POP_SIZE
+    config.no_fitness_termination = True
+    return config
+
+
+def run():
+    random.seed(1)
+    population = neat.Population(make_config())
+    evaluator = neat.ParallelEvaluator(NUM_WORKERS, eval_genome)
+    t0 = time.perf_counter()
+    population.run(evaluator.evaluate, GENERATIONS)
+    generational = time.perf_counter() - t0
+
+    random.seed(1)
+    population = neat.SteadyStatePopulation(make_config())
+    t0 = time.perf_counter()
+    population.run(eval_genome, GENERATIONS, num_workers=NUM_WORKERS)
+    steady_state = time.perf_counter() - t0
+
+    print(f"{'mode':>12} {'time (s)':>9}")
+    print(f"{'generational':>12} {generational:>9.3f}")
+    print(f"{'steady-state':>12} {steady_state:>9.3f}")
+
+
+if __name__ == '__main__':
+    run()
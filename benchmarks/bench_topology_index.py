@@ -0,0 +1,42 @@
+"""
+Times DefaultGenome.mutate_add_connection on feed-forward genomes of about 100 to
+10,000 connections, with and without the genome's incrementally maintained
+topology index (the topology_index option).
+"""
+
+import copy
+import random
+
+from common import best_time, load_config, make_feed_forward_genome
+
+
+def run():
+    config = load_config()
+    genome_config = config.genome_config
+    print(f"{'connections':>11} {'without index (us)':>19} {'with index (us)':>16} {'speedup':>8}")
+    for num_connections in (100, 1000, 3000, 10000):
+        base = make_feed_forward_genome(config, 1, num_connections // 4, depth=8)
+        genome_config.node_indexer = None
+        # Mutation normally leaves connections in the order they were added, not in topological order.
+        items = list(base.connections.items())
+        random.shuffle(items)
+        base.connections = dict(items)
+
+        def attempts(g, number=200):
+            for _ in range(number):
+                g.mutate_add_connection(genome_config)
+
+        genome_config.topology_index = False
+        g = copy.deepcopy(base)
+        t_without = best_time(lambda: attempts(g), repeat=3) / 200
+
+        genome_config.topology_index = True
+        g = copy.deepcopy(base)
+        g.get_topology_index()
+        t_with = best_time(lambda: attempts(g), repeat=3) / 200
+        print(f"{num_connections:>11} {t_without * 1e6:>19.1f} {t_with * 1e6:>16.1f} "
+              f"{t_without / t_with:>7.1f}x")
+
+
+if __name__ == '__main__':
+    run()
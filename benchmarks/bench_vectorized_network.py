@@ -0,0 +1,30 @@
+"""
+Compares the per-call activation time of `FeedForwardNetwork` and
+`VectorizedFeedForwardNetwork` for random feed-forward genomes of various sizes.
+"""
+
+import random
+
+import neat
+from common import best_time, load_config, make_feed_forward_genome
+
+
+def run():
+    config = load_config()
+    num_inputs = config.genome_config.num_inputs
+    print(f"{'nodes':>6} {'conns':>7} {'python (us)':>12} {'numpy (us)':>11} {'speedup':>8}")
+    for num_nodes in (10, 30, 100, 300, 1000, 2000):
+        g = make_feed_forward_genome(config, 1, num_nodes)
+        net = neat.nn.FeedForwardNetwork.create(g, config)
+        vnet = neat.nn.VectorizedFeedForwardNetwork.create(g, config)
+        inputs = [random.uniform(-1.0, 1.0) for _ in range(num_inputs)]
+
+        number = max(1, 20000 // num_nodes)
+        t_py = best_time(lambda: net.activate(inputs), number=number)
+        t_np = best_time(lambda: vnet.activate(inputs), number=number)
+        print(f"{num_nodes:>6} {len(g.connections):>7} {t_py * 1e6:>12.1f} {t_np * 1e6:>11.1f} "
+              f"{t_py / t_np:>7.2f}x")
+
+
+if __name__ == '__main__':
+    run()
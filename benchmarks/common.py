@@ -0,0 +1,56 @@
+"""Helpers shared by the benchmark scripts in this directory."""
+
+import os
+import random
+import time
+
+import neat
+
+
+def load_config(genome_type=neat.DefaultGenome, reproduction_type=neat.DefaultReproduction,
+                species_set_type=neat.DefaultSpeciesSet):
+    local_dir = os.path.dirname(__file__)
+    config_path = os.path.join(local_dir, 'config-benchmark')
+    return neat.Config(genome_type, reproduction_type, species_set_type, neat.DefaultStagnation,
+                       config_path)
+
+
+def make_feed_forward_genome(config, key, num_nodes, fan_in=4, depth=4):
+    """
+    Builds a random acyclic genome with ``num_nodes`` non-input nodes arranged in
+    ``depth`` hidden layers plus the output layer. Each node receives up to ``fan_in``
+    connections from the inputs or from nodes in earlier layers.
+    """
+    genome_config = config.genome_config
+    g = config.genome_type(key)
+    for node_key in genome_config.output_keys:
+        g.nodes[node_key] = g.create_node(genome_config, node_key)
+
+    num_outputs = len(genome_config.output_keys)
+    hidden = list(range(num_outputs, max(num_outputs, num_nodes)))
+    for node_key in hidden:
+        g.nodes[node_key] = g.create_node(genome_config, node_key)
+
+    width = max(1, -(-len(hidden) // depth))
+    layers = [hidden[i:i + width] for i in range(0, len(hidden), width)]
+    layers.append(list(genome_config.output_keys))
+
+    sources = list(genome_config.input_keys)
+    for layer in layers:
+        for node_key in layer:
+            for input_key in random.sample(sources, min(fan_in, len(sources))):
+                g.add_connection(genome_config, input_key, node_key, random.gauss(0.0, 1.0), True)
+        sources.extend(layer)
+
+    return g
+
+
+def best_time(func, repeat=5, number=1):
+    """Returns the smallest per-call time of ``func`` over ``repeat`` trials of ``number`` calls."""
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for _ in range(number):
+            func()
+        times.append((time.perf_counter() - t0) / number)
+    return min(times)
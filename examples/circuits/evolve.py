@@ -12,6 +12,7 @@ from neat.activations import ActivationFunctionSet
 from neat.attributes import FloatAttribute, BoolAttribute, StringAttribute
 from neat.config import ConfigParameter, write_pretty_params
 from neat.genes import BaseGene
+from neat.genome import genes_fingerprint
 from neat.six_util import iteritems, iterkeys
 
 import visualize
@@ -272,6 +273,9 @@ class CircuitGenome(object):
 
         return distance
 
+    def fingerprint(self):
+        return genes_fingerprint(self.nodes.values(), self.connections.values())
+
     def size(self):
         """Returns genome 'complexity', taken to be (number of nodes, number of enabled connections)"""
         num_enabled_connections = sum([1 for cg in self.connections.values() if cg.enabled is True])
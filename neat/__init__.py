@@ -6,8 +6,11 @@ import neat.distributed as distributed
 
 from neat.config import Config
 from neat.population import Population, CompleteExtinctionException
+from neat.steady_state import SteadyStatePopulation
+from neat.islands import IslandModel
 from neat.genome import DefaultGenome
-from neat.reproduction import DefaultReproduction
+from neat.array_genome import ArrayGenome
+from neat.reproduction import DefaultReproduction, BatchReproduction, ParallelReproduction
 from neat.stagnation import DefaultStagnation
 from neat.reporting import StdOutReporter
 from neat.species import DefaultSpeciesSet
@@ -16,3 +19,4 @@ from neat.parallel import ParallelEvaluator
 from neat.distributed import DistributedEvaluator, host_is_local
 from neat.threaded import ThreadedEvaluator
 from neat.checkpoint import Checkpointer
+from neat.fitness_cache import FitnessCache
@@ -0,0 +1,489 @@
+"""
+A genome that stores its genes in NumPy arrays (struct-of-arrays) instead of one
+Python object per gene, for large populations of large genomes. Requires NumPy.
+"""
+from collections.abc import Mapping
+from random import choice, random
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+from neat.attributes import new_rng
+from neat.genes import DefaultConnectionGene, DefaultNodeGene
+from neat.genome import DefaultGenome, DefaultGenomeConfig, genes_fingerprint, get_pruned_keys
+from neat.graphs import creates_cycle
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("ArrayGenome requires NumPy")
+
+
+def _connection_codes(inputs, outputs):
+    # Output keys are never negative, so this orders connections by (input, output).
+    return inputs * (1 << 32) + outputs
+
+
+def _attributes(gene_type):
+    return dict((a.name, a) for a in gene_type._gene_attributes)
+
+
+_NODE_ATTRIBUTES = _attributes(DefaultNodeGene)
+_CONNECTION_ATTRIBUTES = _attributes(DefaultConnectionGene)
+
+
+def _recode(codes, names, new_names):
+    if names is new_names or names == new_names:
+        return codes
+    lookup = dict((name, n) for n, name in enumerate(new_names))
+    return np.array([lookup[names[c]] for c in codes], dtype=codes.dtype)
+
+
+class _NodeView(Mapping):
+    """Read-only mapping from node key to a DefaultNodeGene copy of that node."""
+
+    def __init__(self, genome):
+        self.genome = genome
+
+    def __len__(self):
+        return len(self.genome.node_keys)
+
+    def __iter__(self):
+        return iter(self.genome.node_keys.tolist())
+
+    def __contains__(self, key):
+        return self.genome._node_index(key) is not None
+
+    def __getitem__(self, key):
+        n = self.genome._node_index(key)
+        if n is None:
+            raise KeyError(key)
+        g = self.genome
+        ng = DefaultNodeGene(int(key))
+        ng.bias = float(g.bias[n])
+        ng.response = float(g.response[n])
+        ng.activation = g.activation_names[g.activation[n]]
+        ng.aggregation = g.aggregation_names[g.aggregation[n]]
+        return ng
+
+
+class _ConnectionView(Mapping):
+    """Read-only mapping from connection key to a DefaultConnectionGene copy of that connection."""
+
+    def __init__(self, genome):
+        self.genome = genome
+
+    def __len__(self):
+        return len(self.genome.conn_inputs)
+
+    def __iter__(self):
+        return zip(self.genome.conn_inputs.tolist(), self.genome.conn_outputs.tolist())
+
+    def __contains__(self, key):
+        return self.genome._connection_index(key) is not None
+
+    def __getitem__(self, key):
+        n = self.genome._connection_index(key)
+        if n is None:
+            raise KeyError(key)
+        return self.genome._connection_gene(n)
+
+    def values(self):
+        return [self.genome._connection_gene(n) for n in range(len(self))]
+
+
+class ArrayGenome(object):
+    """
+    A genome with the same genes, configuration and behavior as `DefaultGenome`
+    (using `DefaultNodeGene` and `DefaultConnectionGene`), but stored as arrays:
+    node keys, biases, responses and activation/aggregation option indices, and
+    connection input/output keys, weights and enabled flags, each sorted by key.
+    Crossover, attribute mutation and distance work on whole arrays at once.
+
+    The ``nodes`` and ``connections`` attributes are read-only mappings that build
+    gene objects on access, so that code such as `FeedForwardNetwork.create` can
+    use an ArrayGenome; changes to those gene objects are not stored.
+    """
+
+    @classmethod
+    def parse_config(cls, param_dict):
+        param_dict['node_gene_type'] = DefaultNodeGene
+        param_dict['connection_gene_type'] = DefaultConnectionGene
+        return DefaultGenomeConfig(param_dict)
+
+    @classmethod
+    def write_config(cls, f, config):
+        config.save(f)
+
+    def __init__(self, key):
+        _require_numpy()
+        # Unique identifier for a genome instance.
+        self.key = key
+
+        self.node_keys = np.zeros(0, dtype=np.int64)
+        self.bias = np.zeros(0)
+        self.response = np.zeros(0)
+        self.activation = np.zeros(0, dtype=np.int16)
+        self.aggregation = np.zeros(0, dtype=np.int16)
+        self.activation_names = ()
+        self.aggregation_names = ()
+
+        self.conn_inputs = np.zeros(0, dtype=np.int64)
+        self.conn_outputs = np.zeros(0, dtype=np.int64)
+        self.weight = np.zeros(0)
+        self.enabled = np.zeros(0, dtype=bool)
+        # The connection key arrays last searched, and a dict from connection key to
+        # row built on the second lookup in them; connections being added or removed
+        # replaces those arrays, so the dict is built again when next needed.
+        self._connection_rows = None
+
+        # Fitness results.
+        self.fitness = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_connection_rows'] = None
+        return state
+
+    @property
+    def nodes(self):
+        return _NodeView(self)
+
+    @property
+    def connections(self):
+        return _ConnectionView(self)
+
+    @staticmethod
+    def from_genome(genome, config, key=None):
+        """Returns an ArrayGenome with the same genes as the given DefaultGenome."""
+        new = ArrayGenome(genome.key if key is None else key)
+        new.set_genes(genome.nodes, genome.connections, config)
+        new.fitness = genome.fitness
+        return new
+
+    def to_genome(self):
+        """Returns a DefaultGenome with the same genes as this genome."""
+        genome = DefaultGenome(self.key)
+        genome.nodes = dict(self.nodes)
+        genome.connections = dict((cg.key, cg) for cg in self.connections.values())
+        genome.fitness = self.fitness
+        return genome
+
+    def set_genes(self, nodes, connections, config):
+        """Replaces this genome's genes with the given node and connection gene dicts."""
+        self.activation_names = tuple(config.activation_options)
+        self.aggregation_names = tuple(config.aggregation_options)
+        activation_codes = dict((name, n) for n, name in enumerate(self.activation_names))
+        aggregation_codes = dict((name, n) for n, name in enumerate(self.aggregation_names))
+
+        node_keys = sorted(nodes)
+        self.node_keys = np.array(node_keys, dtype=np.int64)
+        self.bias = np.array([nodes[k].bias for k in node_keys], dtype=float)
+        self.response = np.array([nodes[k].response for k in node_keys], dtype=float)
+        self.activation = np.array([activation_codes[nodes[k].activation] for k in node_keys], dtype=np.int16)
+        self.aggregation = np.array([aggregation_codes[nodes[k].aggregation] for k in node_keys], dtype=np.int16)
+
+        connection_keys = sorted(connections)
+        self.conn_inputs = np.array([k[0] for k in connection_keys], dtype=np.int64)
+        self.conn_outputs = np.array([k[1] for k in connection_keys], dtype=np.int64)
+        self.weight = np.array([connections[k].weight for k in connection_keys], dtype=float)
+        self.enabled = np.array([connections[k].enabled for k in connection_keys], dtype=bool)
+
+    def _node_index(self, key):
+        n = int(np.searchsorted(self.node_keys, key))
+        if n < len(self.node_keys) and self.node_keys[n] == key:
+            return n
+        return None
+
+    def _connection_index(self, key):
+        cached = self._connection_rows
+        if cached is None or cached[0] is not self.conn_inputs or cached[1] is not self.conn_outputs:
+            # A single lookup (as after each mutation) is cheaper as a search.
+            self._connection_rows = (self.conn_inputs, self.conn_outputs, None)
+            codes = _connection_codes(self.conn_inputs, self.conn_outputs)
+            code = key[0] * (1 << 32) + key[1]
+            n = int(np.searchsorted(codes, code))
+            if n < len(codes) and codes[n] == code:
+                return n
+            return None
+        if cached[2] is None:
+            rows = dict((k, n) for n, k in enumerate(zip(self.conn_inputs.tolist(), self.conn_outputs.tolist())))
+            self._connection_rows = cached = (self.conn_inputs, self.conn_outputs, rows)
+        return cached[2].get(key)
+
+    def _connection_gene(self, n):
+        cg = DefaultConnectionGene((int(self.conn_inputs[n]), int(self.conn_outputs[n])))
+        cg.weight = float(self.weight[n])
+        cg.enabled = bool(self.enabled[n])
+        return cg
+
+    def configure_new(self, config):
+        """Configure a new genome based on the given configuration."""
+        # Initial connectivity is built exactly as for DefaultGenome, then converted.
+        genome = DefaultGenome(self.key)
+        genome.configure_new(config)
+        self.set_genes(genome.nodes, genome.connections, config)
+
+    def configure_crossover(self, genome1, genome2, config):
+        """ Configure a new genome by crossover from two parent genomes. """
+        if genome1.fitness > genome2.fitness:
+            parent1, parent2 = genome1, genome2
+        else:
+            parent1, parent2 = genome2, genome1
+        rng = new_rng()
+
+        # Inherit all genes of the fittest parent; each attribute of a homologous gene
+        # comes from either parent with equal probability.
+        self.activation_names = parent1.activation_names
+        self.aggregation_names = parent1.aggregation_names
+        self.node_keys = parent1.node_keys.copy()
+        self.bias = parent1.bias.copy()
+        self.response = parent1.response.copy()
+        self.activation = parent1.activation.copy()
+        self.aggregation = parent1.aggregation.copy()
+        common, i1, i2 = np.intersect1d(parent1.node_keys, parent2.node_keys, assume_unique=True,
+                                        return_indices=True)
+        for values, other_values in ((self.bias, parent2.bias),
+                                     (self.response, parent2.response),
+                                     (self.activation, _recode(parent2.activation, parent2.activation_names,
+                                                               self.activation_names)),
+                                     (self.aggregation, _recode(parent2.aggregation, parent2.aggregation_names,
+                                                                self.aggregation_names))):
+            take = rng.random(len(common)) <= 0.5
+            values[i1[take]] = other_values[i2[take]]
+
+        self.conn_inputs = parent1.conn_inputs.copy()
+        self.conn_outputs = parent1.conn_outputs.copy()
+        self.weight = parent1.weight.copy()
+        self.enabled = parent1.enabled.copy()
+        common, i1, i2 = np.intersect1d(_connection_codes(parent1.conn_inputs, parent1.conn_outputs),
+                                        _connection_codes(parent2.conn_inputs, parent2.conn_outputs),
+                                        assume_unique=True, return_indices=True)
+        for values, other_values in ((self.weight, parent2.weight), (self.enabled, parent2.enabled)):
+            take = rng.random(len(common)) <= 0.5
+            values[i1[take]] = other_values[i2[take]]
+
+    def mutate(self, config):
+        """ Mutates this genome. """
+
+        if config.single_structural_mutation:
+            div = max(1, (config.node_add_prob + config.node_delete_prob +
+                          config.conn_add_prob + config.conn_delete_prob))
+            r = random()
+            if r < (config.node_add_prob / div):
+                self.mutate_add_node(config)
+            elif r < ((config.node_add_prob + config.node_delete_prob) / div):
+                self.mutate_delete_node(config)
+            elif r < ((config.node_add_prob + config.node_delete_prob +
+                       config.conn_add_prob) / div):
+                self.mutate_add_connection(config)
+            elif r < ((config.node_add_prob + config.node_delete_prob +
+                       config.conn_add_prob + config.conn_delete_prob) / div):
+                self.mutate_delete_connection()
+        else:
+            if random() < config.node_add_prob:
+                self.mutate_add_node(config)
+
+            if random() < config.node_delete_prob:
+                self.mutate_delete_node(config)
+
+            if random() < config.conn_add_prob:
+                self.mutate_add_connection(config)
+
+            if random() < config.conn_delete_prob:
+                self.mutate_delete_connection()
+
+        # Mutate connection and node attributes, one array at a time.
+        rng = new_rng()
+        _CONNECTION_ATTRIBUTES['weight'].mutate_array(self.weight, config, rng)
+        _CONNECTION_ATTRIBUTES['enabled'].mutate_array(self.enabled, config, rng)
+        _NODE_ATTRIBUTES['bias'].mutate_array(self.bias, config, rng)
+        _NODE_ATTRIBUTES['response'].mutate_array(self.response, config, rng)
+        _NODE_ATTRIBUTES['activation'].mutate_indices(self.activation, config, rng)
+        _NODE_ATTRIBUTES['aggregation'].mutate_indices(self.aggregation, config, rng)
+
+    def add_node(self, config, key):
+        """Adds a node with newly initialized attributes."""
+        ng = DefaultGenome.create_node(config, key)
+        n = int(np.searchsorted(self.node_keys, key))
+        self.node_keys = np.insert(self.node_keys, n, key)
+        self.bias = np.insert(self.bias, n, ng.bias)
+        self.response = np.insert(self.response, n, ng.response)
+        self.activation = np.insert(self.activation, n, self.activation_names.index(ng.activation))
+        self.aggregation = np.insert(self.aggregation, n, self.aggregation_names.index(ng.aggregation))
+
+    def mutate_add_node(self, config):
+        if not len(self.conn_inputs):
+            if config.check_structural_mutation_surer():
+                self.mutate_add_connection(config)
+            return
+
+        # Choose a random connection to split
+        n = choice(range(len(self.conn_inputs)))
+        new_node_id = config.get_new_node_key(self.nodes)
+        self.add_node(config, new_node_id)
+
+        # Disable this connection and create two new connections joining its nodes via
+        # the given node.  The new node+connections have roughly the same behavior as
+        # the original connection (depending on the activation function of the new node).
+        self.enabled[n] = False
+
+        i, o = int(self.conn_inputs[n]), int(self.conn_outputs[n])
+        weight = float(self.weight[n])
+        self.add_connection(config, i, new_node_id, 1.0, True)
+        self.add_connection(config, new_node_id, o, weight, True)
+
+    def add_connection(self, config, input_key, output_key, weight, enabled):
+        assert isinstance(input_key, int)
+        assert isinstance(output_key, int)
+        assert output_key >= 0
+        assert isinstance(enabled, bool)
+        # Initialize attributes as DefaultGenome does, so the same random numbers are drawn.
+        DefaultGenome.create_connection(config, input_key, output_key)
+        self._set_connection(input_key, output_key, weight, enabled)
+
+    def _set_connection(self, input_key, output_key, weight, enabled):
+        n = self._connection_index((input_key, output_key))
+        if n is not None:
+            self.weight[n] = weight
+            self.enabled[n] = enabled
+        else:
+            self._insert_connection(input_key, output_key, weight, enabled)
+
+    def _insert_connection(self, input_key, output_key, weight, enabled):
+        n = int(np.searchsorted(_connection_codes(self.conn_inputs, self.conn_outputs),
+                                input_key * (1 << 32) + output_key))
+        self.conn_inputs = np.insert(self.conn_inputs, n, input_key)
+        self.conn_outputs = np.insert(self.conn_outputs, n, output_key)
+        self.weight = np.insert(self.weight, n, weight)
+        self.enabled = np.insert(self.enabled, n, enabled)
+
+    def mutate_add_connection(self, config):
+        """
+        Attempt to add a new connection, the only restriction being that the output
+        node cannot be one of the network input pins.
+        """
+        possible_outputs = self.node_keys.tolist()
+        out_node = choice(possible_outputs)
+
+        possible_inputs = possible_outputs + config.input_keys
+        in_node = choice(possible_inputs)
+
+        # Don't duplicate connections.
+        key = (in_node, out_node)
+        n = self._connection_index(key)
+        if n is not None:
+            if config.check_structural_mutation_surer():
+                self.enabled[n] = True
+            return
+
+        # Don't allow connections between two output nodes
+        if in_node in config.output_keys and out_node in config.output_keys:
+            return
+
+        # For feed-forward networks, avoid creating cycles.
+        if config.feed_forward and creates_cycle(self.connections, key):
+            return
+
+        cg = DefaultGenome.create_connection(config, in_node, out_node)
+        self._insert_connection(in_node, out_node, cg.weight, cg.enabled)
+
+    def mutate_delete_node(self, config):
+        # Do nothing if there are no non-output nodes.
+        available_nodes = [k for k in self.node_keys.tolist() if k not in config.output_keys]
+        if not available_nodes:
+            return -1
+
+        del_key = choice(available_nodes)
+
+        keep = (self.conn_inputs != del_key) & (self.conn_outputs != del_key)
+        self.conn_inputs = self.conn_inputs[keep]
+        self.conn_outputs = self.conn_outputs[keep]
+        self.weight = self.weight[keep]
+        self.enabled = self.enabled[keep]
+
+        keep = self.node_keys != del_key
+        self.node_keys = self.node_keys[keep]
+        self.bias = self.bias[keep]
+        self.response = self.response[keep]
+        self.activation = self.activation[keep]
+        self.aggregation = self.aggregation[keep]
+
+        return del_key
+
+    def mutate_delete_connection(self):
+        if len(self.conn_inputs):
+            n = choice(range(len(self.conn_inputs)))
+            self.conn_inputs = np.delete(self.conn_inputs, n)
+            self.conn_outputs = np.delete(self.conn_outputs, n)
+            self.weight = np.delete(self.weight, n)
+            self.enabled = np.delete(self.enabled, n)
+
+    def distance(self, other, config, bound=None):
+        """
+        Returns the genetic distance between this genome and the other. This distance value
+        is used to compute genome compatibility for speciation. If a ``bound`` is given, it
+        may return a value between ``bound`` and the distance as soon as disjoint and
+        excess genes show the distance to be at least ``bound``.
+        """
+        num_nodes = max(len(self.node_keys), len(other.node_keys))
+        common, n1, n2 = np.intersect1d(self.node_keys, other.node_keys, assume_unique=True, return_indices=True)
+        disjoint_nodes = len(self.node_keys) + len(other.node_keys) - 2 * len(common)
+        num_connections = max(len(self.conn_inputs), len(other.conn_inputs))
+        common, c1, c2 = np.intersect1d(_connection_codes(self.conn_inputs, self.conn_outputs),
+                                        _connection_codes(other.conn_inputs, other.conn_outputs),
+                                        assume_unique=True, return_indices=True)
+        disjoint_connections = len(self.conn_inputs) + len(other.conn_inputs) - 2 * len(common)
+        if bound is not None:
+            lower = 0.0
+            if num_nodes:
+                lower += config.compatibility_disjoint_coefficient * disjoint_nodes / num_nodes
+            if num_connections:
+                lower += config.compatibility_disjoint_coefficient * disjoint_connections / num_connections
+            if lower >= bound:
+                return lower
+
+        # Compute node gene distance component.
+        node_distance = 0.0
+        if num_nodes:
+            other_activation = _recode(other.activation, other.activation_names, self.activation_names)
+            other_aggregation = _recode(other.aggregation, other.aggregation_names, self.aggregation_names)
+            d = (np.abs(self.bias[n1] - other.bias[n2]) + np.abs(self.response[n1] - other.response[n2]) +
+                 (self.activation[n1] != other_activation[n2]) + (self.aggregation[n1] != other_aggregation[n2]))
+            node_distance = (float(np.sum(d)) * config.compatibility_weight_coefficient +
+                             config.compatibility_disjoint_coefficient * disjoint_nodes) / num_nodes
+
+        # Compute connection gene differences.
+        connection_distance = 0.0
+        if num_connections:
+            d = np.abs(self.weight[c1] - other.weight[c2]) + (self.enabled[c1] != other.enabled[c2])
+            connection_distance = (float(np.sum(d)) * config.compatibility_weight_coefficient +
+                                   config.compatibility_disjoint_coefficient * disjoint_connections) / num_connections
+
+        return node_distance + connection_distance
+
+    def size(self):
+        """
+        Returns genome 'complexity', taken to be
+        (number of nodes, number of enabled connections)
+        """
+        return len(self.node_keys), int(np.count_nonzero(self.enabled))
+
+    def fingerprint(self, genome_config=None, pruned=False, include_disabled=False):
+        """
+        Returns the same fingerprint as `DefaultGenome.fingerprint`, with the same
+        arguments, for the same genes.
+        """
+        if pruned:
+            if genome_config is None:
+                raise RuntimeError("A genome config is needed for a pruned fingerprint")
+            node_keys, connection_keys = get_pruned_keys(self.connections, genome_config.input_keys,
+                                                         genome_config.output_keys)
+            return genes_fingerprint([self.nodes[k] for k in node_keys],
+                                     [self.connections[k] for k in connection_keys])
+        return genes_fingerprint(self.nodes.values(), self.connections.values(), include_disabled)
+
+    def __str__(self):
+        return str(self.to_genome())
@@ -1,8 +1,40 @@
 """Deals with the attributes (variable parameters) of genes"""
-from random import choice, gauss, random, uniform, randint
+from random import choice, gauss, getrandbits, random, uniform, randint
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
 
 from neat.config import ConfigParameter
 
+# Below this many values, mutate_values uses plain Python rather than NumPy.
+NUMPY_MIN_VALUES = 32
+
+
+def new_rng():
+    """
+    Returns a NumPy random generator seeded from the random module, so that
+    random.seed() still makes runs reproducible. Requires NumPy.
+    """
+    return np.random.default_rng(getrandbits(64))
+
+
+def rng_for(n):
+    """Returns a new_rng() if mutate_values would use NumPy for n values, otherwise None."""
+    return new_rng() if (np is not None and n >= NUMPY_MIN_VALUES) else None
+
+
+def coin_flips(n):
+    """
+    Returns, in increasing order, the indices i in range(n) for which a uniform
+    random number is at most 0.5 (the choices of the second parent in crossover).
+    """
+    rng = rng_for(n)
+    if rng is None:
+        return [i for i in range(n) if random() <= 0.5]
+    return np.flatnonzero(rng.random(n) <= 0.5).tolist()
+
 
 # TODO: There is probably a lot of room for simplification of these classes using metaprogramming.
 
@@ -25,6 +57,43 @@ class BaseAttribute(object):
         return [ConfigParameter(self.config_item_name(n), ci[0], ci[1])
                 for n, ci in self._config_items.items()]
 
+    def compile_init(self, config):
+        """
+        Returns a function of no arguments that gives the same values, from the same
+        random numbers, as ``init_value(config)``. Subclasses look up the configuration
+        values once, here, instead of on every call, unless a class derived from them
+        overrides the methods this depends on.
+        """
+        return lambda: self.init_value(config)
+
+    def compile_mutate(self, config):
+        """
+        Returns a function of one value that gives the same results, from the same
+        random numbers, as ``mutate_value(value, config)``. Subclasses look up the
+        configuration values once, here, instead of on every call, unless a class
+        derived from them overrides the methods this depends on.
+        """
+        return lambda value: self.mutate_value(value, config)
+
+    def mutate_values(self, values, config, rng=None):
+        """
+        Returns a list holding the result of ``mutate_value`` for each of the values.
+        Subclasses draw all the random numbers at once (with NumPy, if installed, for
+        long sequences), unless a class derived from them overrides the methods this
+        depends on; the distribution of each result is unchanged. ``rng`` is an
+        optional NumPy generator to draw from.
+        """
+        mutate = self.compile_mutate(config)
+        return [mutate(v) for v in values]
+
+    def _overrides(self, cls, *names):
+        """Returns whether the class of this attribute overrides any of the named methods of cls."""
+        return any(getattr(type(self), name) is not getattr(cls, name) for name in names)
+
+    @staticmethod
+    def _use_numpy(values, rng):
+        return np is not None and (rng is not None or len(values) >= NUMPY_MIN_VALUES)
+
 
 class FloatAttribute(BaseAttribute):
     """
@@ -62,6 +131,47 @@ class FloatAttribute(BaseAttribute):
 
         raise RuntimeError(f"Unknown init_type {getattr(config, self.init_type_name)!r} for {self.init_type_name!s}")
 
+    def compile_init(self, config):
+        if self._overrides(FloatAttribute, 'init_value', 'clamp'):
+            return BaseAttribute.compile_init(self, config)
+        mean = getattr(config, self.init_mean_name)
+        stdev = getattr(config, self.init_stdev_name)
+        init_type = getattr(config, self.init_type_name).lower()
+        min_value = getattr(config, self.min_value_name)
+        max_value = getattr(config, self.max_value_name)
+
+        if ('gauss' in init_type) or ('normal' in init_type):
+            return lambda: max(min(gauss(mean, stdev), max_value), min_value)
+
+        if 'uniform' in init_type:
+            low = max(min_value, (mean - (2 * stdev)))
+            high = min(max_value, (mean + (2 * stdev)))
+            return lambda: uniform(low, high)
+
+        # Leave the error for an unknown init_type to init_value.
+        return BaseAttribute.compile_init(self, config)
+
+    def compile_mutate(self, config):
+        if self._overrides(FloatAttribute, 'mutate_value', 'clamp'):
+            return BaseAttribute.compile_mutate(self, config)
+        mutate_rate = getattr(config, self.mutate_rate_name)
+        replace_rate = getattr(config, self.replace_rate_name) + mutate_rate
+        mutate_power = getattr(config, self.mutate_power_name)
+        min_value = getattr(config, self.min_value_name)
+        max_value = getattr(config, self.max_value_name)
+        # This falls back to init_value if that is overridden.
+        init = self.compile_init(config)
+
+        def mutate(value):
+            r = random()
+            if r < mutate_rate:
+                return max(min(value + gauss(0.0, mutate_power), max_value), min_value)
+            if r < replace_rate:
+                return init()
+            return value
+
+        return mutate
+
     def mutate_value(self, value, config):
         # mutate_rate is usually no lower than replace_rate, and frequently higher -
         # so put first for efficiency
@@ -79,6 +189,49 @@ class FloatAttribute(BaseAttribute):
 
         return value
 
+    def init_array(self, config, rng, n):
+        """Returns a NumPy array of n values, each drawn as by init_value."""
+        mean = getattr(config, self.init_mean_name)
+        stdev = getattr(config, self.init_stdev_name)
+        init_type = getattr(config, self.init_type_name).lower()
+
+        if ('gauss' in init_type) or ('normal' in init_type):
+            return np.clip(rng.normal(mean, stdev, n),
+                           getattr(config, self.min_value_name), getattr(config, self.max_value_name))
+
+        if 'uniform' in init_type:
+            min_value = max(getattr(config, self.min_value_name),
+                            (mean - (2 * stdev)))
+            max_value = min(getattr(config, self.max_value_name),
+                            (mean + (2 * stdev)))
+            return rng.uniform(min_value, max_value, n)
+
+        raise RuntimeError(f"Unknown init_type {getattr(config, self.init_type_name)!r} for {self.init_type_name!s}")
+
+    def mutate_array(self, values, config, rng):
+        """Mutates a NumPy array of values in place, each as by mutate_value."""
+        mutate_rate = getattr(config, self.mutate_rate_name)
+        replace_rate = getattr(config, self.replace_rate_name)
+        r = rng.random(len(values))
+        mutated = r < mutate_rate
+        replaced = ~mutated & (r < replace_rate + mutate_rate)
+
+        num_mutated = np.count_nonzero(mutated)
+        if num_mutated:
+            perturbed = values[mutated] + rng.normal(0.0, getattr(config, self.mutate_power_name), num_mutated)
+            values[mutated] = np.clip(perturbed,
+                                      getattr(config, self.min_value_name), getattr(config, self.max_value_name))
+        num_replaced = np.count_nonzero(replaced)
+        if num_replaced:
+            values[replaced] = self.init_array(config, rng, num_replaced)
+
+    def mutate_values(self, values, config, rng=None):
+        if self._use_numpy(values, rng) and not self._overrides(FloatAttribute, 'mutate_value', 'init_value', 'clamp'):
+            array = np.array(values, dtype=float)
+            self.mutate_array(array, config, rng if rng is not None else new_rng())
+            return array.tolist()
+        return BaseAttribute.mutate_values(self, values, config)
+
     def validate(self, config):
         min_value = getattr(config, self.min_value_name)
         max_value = getattr(config, self.max_value_name)
@@ -106,6 +259,32 @@ class IntegerAttribute(BaseAttribute):
         max_value = getattr(config, self.max_value_name)
         return randint(min_value, max_value)
 
+    def compile_init(self, config):
+        if self._overrides(IntegerAttribute, 'init_value'):
+            return BaseAttribute.compile_init(self, config)
+        min_value = getattr(config, self.min_value_name)
+        max_value = getattr(config, self.max_value_name)
+        return lambda: randint(min_value, max_value)
+
+    def compile_mutate(self, config):
+        if self._overrides(IntegerAttribute, 'mutate_value', 'init_value', 'clamp'):
+            return BaseAttribute.compile_mutate(self, config)
+        mutate_rate = getattr(config, self.mutate_rate_name)
+        replace_rate = getattr(config, self.replace_rate_name) + mutate_rate
+        mutate_power = getattr(config, self.mutate_power_name)
+        min_value = getattr(config, self.min_value_name)
+        max_value = getattr(config, self.max_value_name)
+
+        def mutate(value):
+            r = random()
+            if r < mutate_rate:
+                return max(min(value + int(round(gauss(0.0, mutate_power))), max_value), min_value)
+            if r < replace_rate:
+                return randint(min_value, max_value)
+            return value
+
+        return mutate
+
     def mutate_value(self, value, config):
         # mutate_rate is usually no lower than replace_rate, and frequently higher -
         # so put first for efficiency
@@ -123,6 +302,33 @@ class IntegerAttribute(BaseAttribute):
 
         return value
 
+    def mutate_array(self, values, config, rng):
+        """Mutates a NumPy integer array in place, each value as by mutate_value."""
+        mutate_rate = getattr(config, self.mutate_rate_name)
+        replace_rate = getattr(config, self.replace_rate_name)
+        min_value = getattr(config, self.min_value_name)
+        max_value = getattr(config, self.max_value_name)
+        r = rng.random(len(values))
+        mutated = r < mutate_rate
+        replaced = ~mutated & (r < replace_rate + mutate_rate)
+
+        num_mutated = np.count_nonzero(mutated)
+        if num_mutated:
+            # np.rint rounds halves to even, as round() does.
+            steps = np.rint(rng.normal(0.0, getattr(config, self.mutate_power_name), num_mutated))
+            values[mutated] = np.clip(values[mutated] + steps.astype(values.dtype), min_value, max_value)
+        num_replaced = np.count_nonzero(replaced)
+        if num_replaced:
+            values[replaced] = rng.integers(min_value, max_value, size=num_replaced, endpoint=True)
+
+    def mutate_values(self, values, config, rng=None):
+        if self._use_numpy(values, rng) and not self._overrides(IntegerAttribute, 'mutate_value', 'init_value',
+                                                                'clamp'):
+            array = np.array(values, dtype=np.int64)
+            self.mutate_array(array, config, rng if rng is not None else new_rng())
+            return array.tolist()
+        return BaseAttribute.mutate_values(self, values, config)
+
     def validate(self, config):
         min_value = getattr(config, self.min_value_name)
         max_value = getattr(config, self.max_value_name)
@@ -149,6 +355,36 @@ class BoolAttribute(BaseAttribute):
 
         raise RuntimeError(f"Unknown default value {default!r} for {self.name!s}")
 
+    def compile_init(self, config):
+        if self._overrides(BoolAttribute, 'init_value'):
+            return BaseAttribute.compile_init(self, config)
+        default = str(getattr(config, self.default_name)).lower()
+
+        if default in ('1', 'on', 'yes', 'true'):
+            return lambda: True
+        elif default in ('0', 'off', 'no', 'false'):
+            return lambda: False
+        elif default in ('random', 'none'):
+            return lambda: bool(random() < 0.5)
+
+        # Leave the error for an unknown default to init_value.
+        return BaseAttribute.compile_init(self, config)
+
+    def compile_mutate(self, config):
+        if self._overrides(BoolAttribute, 'mutate_value'):
+            return BaseAttribute.compile_mutate(self, config)
+        mutate_rate = getattr(config, self.mutate_rate_name)
+        true_rate = mutate_rate + getattr(config, self.rate_to_false_add_name)
+        false_rate = mutate_rate + getattr(config, self.rate_to_true_add_name)
+
+        def mutate(value):
+            rate = true_rate if value else false_rate
+            if rate > 0 and random() < rate:
+                return random() < 0.5
+            return value
+
+        return mutate
+
     def mutate_value(self, value, config):
         mutate_rate = getattr(config, self.mutate_rate_name)
 
@@ -168,6 +404,22 @@ class BoolAttribute(BaseAttribute):
 
         return value
 
+    def mutate_array(self, values, config, rng):
+        """Mutates a NumPy boolean array in place, each value as by mutate_value."""
+        mutate_rate = getattr(config, self.mutate_rate_name) + np.where(
+            values, getattr(config, self.rate_to_false_add_name), getattr(config, self.rate_to_true_add_name))
+        mutated = rng.random(len(values)) < mutate_rate
+        num_mutated = np.count_nonzero(mutated)
+        if num_mutated:
+            values[mutated] = rng.random(num_mutated) < 0.5
+
+    def mutate_values(self, values, config, rng=None):
+        if self._use_numpy(values, rng) and not self._overrides(BoolAttribute, 'mutate_value'):
+            array = np.array(values, dtype=bool)
+            self.mutate_array(array, config, rng if rng is not None else new_rng())
+            return array.tolist()
+        return BaseAttribute.mutate_values(self, values, config)
+
     def validate(self, config):
         default = str(getattr(config, self.default_name)).lower()
         if default not in ('1', 'on', 'yes', 'true', '0', 'off', 'no', 'false', 'random', 'none'):
@@ -192,6 +444,33 @@ class StringAttribute(BaseAttribute):
 
         return default
 
+    def compile_init(self, config):
+        if self._overrides(StringAttribute, 'init_value'):
+            return BaseAttribute.compile_init(self, config)
+        default = getattr(config, self.default_name)
+
+        if default.lower() in ('none', 'random'):
+            options = getattr(config, self.options_name)
+            return lambda: choice(options)
+
+        return lambda: default
+
+    def compile_mutate(self, config):
+        if self._overrides(StringAttribute, 'mutate_value'):
+            return BaseAttribute.compile_mutate(self, config)
+        mutate_rate = getattr(config, self.mutate_rate_name)
+        options = getattr(config, self.options_name)
+
+        if mutate_rate <= 0:
+            return lambda value: value
+
+        def mutate(value):
+            if random() < mutate_rate:
+                return choice(options)
+            return value
+
+        return mutate
+
     def mutate_value(self, value, config):
         mutate_rate = getattr(config, self.mutate_rate_name)
 
@@ -203,6 +482,31 @@ class StringAttribute(BaseAttribute):
 
         return value
 
+    def mutate_indices(self, indices, config, rng):
+        """
+        Mutates, in place, a NumPy array of indices into the configured options, each
+        as mutate_value would mutate the option it refers to.
+        """
+        mutate_rate = getattr(config, self.mutate_rate_name)
+        if mutate_rate > 0:
+            mutated = rng.random(len(indices)) < mutate_rate
+            num_mutated = np.count_nonzero(mutated)
+            if num_mutated:
+                indices[mutated] = rng.integers(len(getattr(config, self.options_name)), size=num_mutated)
+
+    def mutate_values(self, values, config, rng=None):
+        mutate_rate = getattr(config, self.mutate_rate_name)
+        if mutate_rate > 0 and self._use_numpy(values, rng) and not self._overrides(StringAttribute, 'mutate_value'):
+            if rng is None:
+                rng = new_rng()
+            options = getattr(config, self.options_name)
+            result = list(values)
+            mutated = np.flatnonzero(rng.random(len(result)) < mutate_rate)
+            for i, option in zip(mutated.tolist(), rng.integers(len(options), size=len(mutated)).tolist()):
+                result[i] = options[option]
+            return result
+        return BaseAttribute.mutate_values(self, values, config)
+
     def validate(self, config):
         default = getattr(config, self.default_name)
         if default not in ('none', 'random'):
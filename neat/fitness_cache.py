@@ -0,0 +1,93 @@
+"""
+Memoizes fitness evaluations, so that genomes whose phenotype has already been
+evaluated (elites carried over unchanged, or identical offspring) are not evaluated again.
+"""
+from collections import OrderedDict
+
+from neat.genome import genes_fingerprint
+
+
+def genome_fingerprint(genome):
+    """
+    Returns the genome's ``fingerprint()`` if it has one, otherwise the combined
+    fingerprint of its node genes and enabled connection genes. Genomes with equal
+    fingerprints have the same phenotype; the genome's own key is not included.
+    """
+    if hasattr(genome, 'fingerprint'):
+        return genome.fingerprint()
+    return genes_fingerprint(genome.nodes.values(), genome.connections.values())
+
+
+class FitnessCache(object):
+    """
+    Wraps a fitness function taking ``(genomes, config)``, such as the ``evaluate``
+    method of `ParallelEvaluator`, so that only genomes with a fingerprint not seen
+    before are passed to it; the others are given the fitness already found for
+    that fingerprint. Only the ``fitness`` attribute is restored from the cache.
+
+    Only use this with deterministic fitness functions; for noisy fitness set
+    ``enabled`` to False (or do not wrap the function), so every genome is evaluated.
+    """
+
+    def __init__(self, eval_function, reporters=None, max_entries=100000, enabled=True):
+        """
+        ``reporters`` (for example ``Population.reporters``) receives a summary of
+        hits and misses after each evaluation. At most ``max_entries`` fitnesses are
+        kept; the least recently used are discarded first.
+        """
+        self.eval_function = eval_function
+        self.reporters = reporters
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self.cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.last_hits = 0
+        self.last_misses = 0
+
+    def clear(self):
+        self.cache.clear()
+
+    def evaluate(self, genomes, config):
+        if not self.enabled:
+            self.eval_function(genomes, config)
+            self.last_hits = 0
+            self.last_misses = len(genomes)
+            self.misses += self.last_misses
+            return
+
+        hits = []
+        to_evaluate = []
+        duplicates = {}
+        for genome_id, genome in genomes:
+            fingerprint = genome_fingerprint(genome)
+            if fingerprint in self.cache:
+                self.cache.move_to_end(fingerprint)
+                hits.append((genome, fingerprint))
+            elif fingerprint in duplicates:
+                # Identical to a genome in this batch that is about to be evaluated.
+                duplicates[fingerprint].append(genome)
+            else:
+                duplicates[fingerprint] = []
+                to_evaluate.append((fingerprint, (genome_id, genome)))
+
+        if to_evaluate:
+            self.eval_function([item for fingerprint, item in to_evaluate], config)
+
+        for genome, fingerprint in hits:
+            genome.fitness = self.cache[fingerprint]
+        for fingerprint, (genome_id, genome) in to_evaluate:
+            if genome.fitness is not None:
+                self.cache[fingerprint] = genome.fitness
+            for duplicate in duplicates[fingerprint]:
+                duplicate.fitness = genome.fitness
+        while self.max_entries is not None and len(self.cache) > self.max_entries:
+            self.cache.popitem(last=False)
+
+        self.last_misses = len(to_evaluate)
+        self.last_hits = len(genomes) - self.last_misses
+        self.hits += self.last_hits
+        self.misses += self.last_misses
+        if self.reporters is not None:
+            self.reporters.info("Fitness cache: {0} hits, {1} misses ({2} hits, {3} misses in total)".format(
+                self.last_hits, self.last_misses, self.hits, self.misses))
@@ -1,12 +1,14 @@
 """Handles node and connection genes."""
+import hashlib
+import keyword
 import warnings
 from random import random
+from types import MemberDescriptorType
 
-from neat.attributes import FloatAttribute, BoolAttribute, StringAttribute
+from neat.attributes import FloatAttribute, BoolAttribute, StringAttribute, rng_for
 
 
 # TODO: There is probably a lot of room for simplification of these classes using metaprogramming.
-# TODO: Evaluate using __slots__ for performance/memory usage improvement.
 
 
 class BaseGene(object):
@@ -15,6 +17,10 @@ class BaseGene(object):
     including crossover and calling mutation methods.
     """
 
+    # Lets the classes made by compact_gene_type do without a __dict__; subclasses
+    # that do not declare __slots__ have one as usual.
+    __slots__ = ()
+
     def __init__(self, key):
         self.key = key
 
@@ -57,6 +63,31 @@ class BaseGene(object):
             v = getattr(self, a.name)
             setattr(self, a.name, a.mutate_value(v, config))
 
+    @classmethod
+    def mutate_genes(cls, genes, config):
+        """
+        Mutates each of the genes (all of this class) as ``mutate`` would, but draws
+        the random numbers for each attribute for all the genes at once. Classes that
+        override ``mutate`` have it called for each gene instead.
+        """
+        genes = list(genes)
+        if cls.mutate is not BaseGene.mutate:
+            for gene in genes:
+                gene.mutate(config)
+            return
+
+        rng = rng_for(len(genes))
+        for a in cls._gene_attributes:
+            name = a.name
+            values = a.mutate_values([getattr(g, name) for g in genes], config, rng)
+            for gene, value in zip(genes, values):
+                setattr(gene, name, value)
+
+    @classmethod
+    def compile_operators(cls, config):
+        """Returns the `GeneOperators` for genes of this class under the given configuration."""
+        return GeneOperators(cls, config)
+
     def copy(self):
         new_gene = self.__class__(self.key)
         for a in self._gene_attributes:
@@ -64,6 +95,17 @@ class BaseGene(object):
 
         return new_gene
 
+    def fingerprint(self):
+        """
+        Returns a 128-bit integer digest of the gene's class name, key and attribute
+        values. It does not depend on the process, so it can be stored and compared later.
+        """
+        attributes = getattr(self, '_gene_attributes', None)
+        if attributes is None:
+            attributes = getattr(self, '__gene_attributes__', ())
+        data = repr((self.__class__.__name__, self.key, tuple([getattr(self, a.name) for a in attributes])))
+        return int.from_bytes(hashlib.blake2b(data.encode(), digest_size=16).digest(), 'little')
+
     def crossover(self, gene2):
         """ Creates a new gene randomly inheriting attributes from its parents."""
         assert self.key == gene2.key
@@ -80,6 +122,154 @@ class BaseGene(object):
         return new_gene
 
 
+def _attribute_ref(obj, name):
+    if name.isidentifier() and not keyword.iskeyword(name):
+        return f'{obj}.{name}'
+    return f'getattr({obj}, {name!r})'
+
+
+def _assign(obj, name, value):
+    if name.isidentifier() and not keyword.iskeyword(name):
+        return f'{obj}.{name} = {value}'
+    return f'setattr({obj}, {name!r}, {value})'
+
+
+def _make_function(name, args, lines, namespace):
+    """Compiles a function with the given arguments and body, like those made by dataclasses."""
+    source = f'def {name}({args}):\n' + ''.join(f'    {line}\n' for line in lines or ['pass'])
+    exec(source, namespace)  # pylint: disable=exec-used
+    return namespace[name]
+
+
+class GeneOperators(object):
+    """
+    Versions of a gene class's ``init_attributes``, ``mutate``, ``copy`` and
+    ``crossover`` methods specialized for one genome configuration, taking the
+    gene(s) as arguments. Each is compiled with one statement per attribute and the
+    configuration values already looked up, rather than looping over the attributes
+    and reading the configuration for every gene. Each gives the same results, from
+    the same random numbers, as the method it replaces; if the gene class overrides
+    a method, that method is called instead.
+    """
+
+    def __init__(self, gene_type, config):
+        self.gene_type = gene_type
+        names = [a.name for a in getattr(gene_type, '_gene_attributes', ())]
+        namespace = {'random': random, 'config': config}
+
+        if gene_type.init_attributes is BaseGene.init_attributes:
+            lines = []
+            for n, a in enumerate(gene_type._gene_attributes):
+                namespace[f'init_{n}'] = a.compile_init(config)
+                lines.append(_assign('gene', a.name, f'init_{n}()'))
+            self.init_attributes = _make_function('init_attributes', 'gene', lines, namespace)
+        else:
+            self.init_attributes = _make_function('init_attributes', 'gene',
+                                                  ['gene.init_attributes(config)'], namespace)
+
+        if gene_type.mutate is BaseGene.mutate:
+            lines = []
+            for n, a in enumerate(gene_type._gene_attributes):
+                namespace[f'mutate_{n}'] = a.compile_mutate(config)
+                lines.append(_assign('gene', a.name, f"mutate_{n}({_attribute_ref('gene', a.name)})"))
+            self.mutate = _make_function('mutate', 'gene', lines, namespace)
+        else:
+            self.mutate = _make_function('mutate', 'gene', ['gene.mutate(config)'], namespace)
+
+        if gene_type.copy is BaseGene.copy:
+            lines = ['new_gene = gene.__class__(gene.key)']
+            lines += [_assign('new_gene', name, _attribute_ref('gene', name)) for name in names]
+            lines.append('return new_gene')
+            self.copy = _make_function('copy', 'gene', lines, namespace)
+        else:
+            self.copy = _make_function('copy', 'gene', ['return gene.copy()'], namespace)
+
+        if gene_type.crossover is BaseGene.crossover:
+            lines = ['assert gene1.key == gene2.key',
+                     'new_gene = gene1.__class__(gene1.key)']
+            lines += [_assign('new_gene', name, f"{_attribute_ref('gene1', name)} if random() > 0.5 "
+                                                f"else {_attribute_ref('gene2', name)}")
+                      for name in names]
+            lines.append('return new_gene')
+            self.crossover = _make_function('crossover', 'gene1, gene2', lines, namespace)
+        else:
+            self.crossover = _make_function('crossover', 'gene1, gene2', ['return gene1.crossover(gene2)'],
+                                            namespace)
+
+
+_compact_gene_types = {}
+
+
+def _gene_attributes(gene_type):
+    attributes = getattr(gene_type, '_gene_attributes', None)
+    if attributes is None:
+        attributes = getattr(gene_type, '__gene_attributes__', ())
+    return attributes
+
+
+def compact_gene_type(gene_type):
+    """
+    Returns a version of the gene class ``gene_type`` whose instances keep their key
+    and the attributes in ``_gene_attributes`` in ``__slots__`` instead of a
+    ``__dict__``, using much less memory. It has the same name and methods (copied
+    from the classes between ``gene_type`` and `BaseGene`), but is not a subclass of
+    ``gene_type``. Its ``copy`` and ``crossover`` are compiled for its attributes and
+    give the same results, from the same random numbers, as those of `BaseGene`, and
+    it pickles as a flat tuple of its values. Instances cannot hold other attributes.
+    """
+    compact_type = _compact_gene_types.get(gene_type)
+    if compact_type is not None:
+        return compact_type
+    if '_compact_base' in gene_type.__dict__:
+        return gene_type
+    if not issubclass(gene_type, BaseGene):
+        raise RuntimeError(f"Cannot make a compact version of {gene_type.__name__}, which is not a BaseGene")
+
+    namespace = {}
+    mro = gene_type.__mro__
+    for cls in reversed(mro[:mro.index(BaseGene)]):
+        for name, value in cls.__dict__.items():
+            if name in ('__dict__', '__weakref__', '__slots__') or isinstance(value, MemberDescriptorType):
+                continue
+            function = getattr(value, '__func__', value)
+            if '__class__' in getattr(getattr(function, '__code__', None), 'co_freevars', ()):
+                raise RuntimeError(f"Cannot make a compact version of {gene_type.__name__}: {name} uses super() "
+                                   f"without arguments")
+            namespace[name] = value
+
+    names = ['key'] + [a.name for a in _gene_attributes(gene_type)]
+    functions = {'random': random, 'new': object.__new__, 'gene_type': gene_type, 'rebuild': _compact_gene}
+    lines = ['new_gene = new(self.__class__)']
+    lines += [f'new_gene.{name} = self.{name}' for name in names]
+    lines.append('return new_gene')
+    namespace['copy'] = _make_function('copy', 'self', lines, functions)
+
+    lines = ['assert self.key == gene2.key',
+             'new_gene = new(self.__class__)',
+             'new_gene.key = self.key']
+    lines += [f'new_gene.{name} = self.{name} if random() > 0.5 else gene2.{name}' for name in names[1:]]
+    lines.append('return new_gene')
+    namespace['crossover'] = _make_function('crossover', 'self, gene2', lines, functions)
+
+    values = ', '.join(f'self.{name}' for name in names)
+    namespace['__reduce__'] = _make_function('__reduce__', 'self', [f'return rebuild, (gene_type, {values})'],
+                                             functions)
+    namespace.update(__slots__=tuple(names), _compact_base=gene_type)
+    compact_type = type(gene_type.__name__, (BaseGene,), namespace)
+    _compact_gene_types[gene_type] = compact_type
+    return compact_type
+
+
+def _compact_gene(gene_type, key, *values):
+    """Recreates a compact gene when unpickling."""
+    compact_type = compact_gene_type(gene_type)
+    gene = object.__new__(compact_type)
+    gene.key = key
+    for a, value in zip(_gene_attributes(gene_type), values):
+        setattr(gene, a.name, value)
+    return gene
+
+
 # TODO: Should these be in the nn module?  iznn and ctrnn can have additional attributes.
 
 
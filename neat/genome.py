@@ -4,10 +4,17 @@ import sys
 from itertools import count
 from random import choice, random, shuffle
 
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
 from neat.activations import ActivationFunctionSet
 from neat.aggregations import AggregationFunctionSet
 from neat.config import ConfigParameter, write_pretty_params
-from neat.genes import DefaultConnectionGene, DefaultNodeGene
+from neat.attributes import coin_flips
+from neat.genes import BaseGene, DefaultConnectionGene, DefaultNodeGene, GeneOperators, compact_gene_type
+from neat.graphs import TopologicalIndex
 from neat.graphs import creates_cycle
 from neat.graphs import required_for_output
 
@@ -37,6 +44,9 @@ class DefaultGenomeConfig(object):
                         ConfigParameter('node_delete_prob', float),
                         ConfigParameter('single_structural_mutation', bool, 'false'),
                         ConfigParameter('structural_mutation_surer', str, 'default'),
+                        ConfigParameter('topology_index', bool, 'false'),
+                        ConfigParameter('vectorized_mutation', bool, 'false'),
+                        ConfigParameter('compact_genes', bool, 'false'),
                         ConfigParameter('initial_connection', str, 'unconnected')]
 
         # Gather configuration data from the gene classes.
@@ -52,6 +62,10 @@ class DefaultGenomeConfig(object):
         self.node_gene_type.validate_attributes(self)
         self.connection_gene_type.validate_attributes(self)
 
+        if self.compact_genes:
+            self.node_gene_type = compact_gene_type(self.node_gene_type)
+            self.connection_gene_type = compact_gene_type(self.connection_gene_type)
+
         # By convention, input pins have negative keys, and the output
         # pins have keys 0,1,...
         self.input_keys = [-i - 1 for i in range(self.num_inputs)]
@@ -85,6 +99,51 @@ class DefaultGenomeConfig(object):
 
         self.node_indexer = None
 
+        # Specialize the gene operations for these settings now they are validated.
+        self.get_gene_operators(self.node_gene_type)
+        self.get_gene_operators(self.connection_gene_type)
+
+    def __setattr__(self, name, value):
+        # The compiled gene operators hold copies of the settings, so changing any
+        # setting discards them; they are rebuilt on next use.
+        if not name.startswith('_') and name != 'node_indexer':
+            self.__dict__.pop('_gene_operators', None)
+        object.__setattr__(self, name, value)
+
+    def __getstate__(self):
+        # The compiled operators are closures, which cannot be pickled, and compact
+        # gene classes are made at run time, so the classes they are made from are
+        # pickled instead.
+        state = self.__dict__.copy()
+        state.pop('_gene_operators', None)
+        state['_compact_gene_types'] = []
+        for name in ('node_gene_type', 'connection_gene_type'):
+            if '_compact_base' in state[name].__dict__:
+                state[name] = state[name]._compact_base
+                state['_compact_gene_types'].append(name)
+        return state
+
+    def __setstate__(self, state):
+        state = state.copy()
+        for name in state.pop('_compact_gene_types', ()):
+            state[name] = compact_gene_type(state[name])
+        self.__dict__.update(state)
+
+    def get_gene_operators(self, gene_type):
+        """
+        Returns the `GeneOperators` for the given gene class and the current settings,
+        compiling them if necessary.
+        """
+        operators = self.__dict__.setdefault('_gene_operators', {})
+        gene_operators = operators.get(gene_type)
+        if gene_operators is None:
+            if hasattr(gene_type, 'compile_operators'):
+                gene_operators = gene_type.compile_operators(self)
+            else:
+                gene_operators = GeneOperators(gene_type, self)
+            operators[gene_type] = gene_operators
+        return gene_operators
+
     def add_activation(self, name, func):
         self.activation_defs.add(name, func)
 
@@ -130,6 +189,88 @@ class DefaultGenomeConfig(object):
             raise RuntimeError(error_string)
 
 
+def _sorted_positions(keys, other_keys):
+    """
+    Returns the indices into each of two sorted, duplicate-free key arrays of
+    the keys that are in both.
+    """
+    positions = np.searchsorted(other_keys, keys)
+    found = positions < len(other_keys)
+    found[found] = other_keys[positions[found]] == keys[found]
+    return np.flatnonzero(found), positions[found]
+
+
+class DistanceArrays(object):
+    """
+    The genes of a `DefaultGenome` (with `DefaultNodeGene` and `DefaultConnectionGene`)
+    as NumPy arrays sorted by key, for computing the same distances as
+    `DefaultGenome.distance` with a merge of the sorted keys rather than a dict
+    lookup and method call per gene. A snapshot: it does not follow later changes
+    to the genome. Requires NumPy.
+    """
+
+    def __init__(self, genome):
+        self.node_keys, self.node_order, (self.bias, self.response, self.activation, self.aggregation) = \
+            self._sorted(list(genome.nodes), genome.nodes.values(), ('bias', 'response', 'activation', 'aggregation'))
+        # Output keys are never negative, so this orders connections by (input, output).
+        keys = [i * (1 << 32) + o for i, o in genome.connections]
+        self.connection_keys, self.connection_order, (self.weight, self.enabled) = \
+            self._sorted(keys, genome.connections.values(), ('weight', 'enabled'))
+
+    @staticmethod
+    def _sorted(keys, genes, names):
+        keys = np.array(keys, dtype=np.int64)
+        order = np.argsort(keys)
+        genes = list(genes)
+        arrays = [np.array([getattr(g, name) for g in genes])[order] for name in names]
+        return keys[order], order, arrays
+
+    @staticmethod
+    def _sum(values, order):
+        # Add up in the genome's own gene order, so that the total is exactly
+        # the one DefaultGenome.distance gets.
+        return sum(values[np.argsort(order)].tolist())
+
+    def distance(self, other, config, bound=None):
+        """
+        Returns the genetic distance between the two genomes, as `DefaultGenome.distance`
+        would (with the same ``bound``).
+        """
+        disjoint_coefficient = config.compatibility_disjoint_coefficient
+        max_nodes = max(len(self.node_keys), len(other.node_keys))
+        node_pairs = _sorted_positions(self.node_keys, other.node_keys)
+        disjoint_nodes = len(self.node_keys) + len(other.node_keys) - 2 * len(node_pairs[0])
+        max_conn = max(len(self.connection_keys), len(other.connection_keys))
+        connection_pairs = _sorted_positions(self.connection_keys, other.connection_keys)
+        disjoint_connections = len(self.connection_keys) + len(other.connection_keys) - 2 * len(connection_pairs[0])
+        connection_lower = (disjoint_coefficient * disjoint_connections) / max_conn if max_conn else 0.0
+        if bound is not None:
+            lower = ((disjoint_coefficient * disjoint_nodes) / max_nodes if max_nodes else 0.0) + connection_lower
+            if lower >= bound:
+                return lower
+
+        node_distance = 0.0
+        if max_nodes:
+            i1, i2 = node_pairs
+            d = (np.abs(self.bias[i1] - other.bias[i2]) + np.abs(self.response[i1] - other.response[i2]) +
+                 (self.activation[i1] != other.activation[i2]) + (self.aggregation[i1] != other.aggregation[i2]))
+            d *= config.compatibility_weight_coefficient
+            node_distance = (self._sum(d, self.node_order[i1]) +
+                             (disjoint_coefficient * disjoint_nodes)) / max_nodes
+
+        connection_distance = 0.0
+        if max_conn:
+            if bound is not None and node_distance + connection_lower >= bound:
+                return node_distance + connection_lower
+            i1, i2 = connection_pairs
+            d = np.abs(self.weight[i1] - other.weight[i2]) + (self.enabled[i1] != other.enabled[i2])
+            d *= config.compatibility_weight_coefficient
+            connection_distance = (self._sum(d, self.connection_order[i1]) +
+                                   (disjoint_coefficient * disjoint_connections)) / max_conn
+
+        return node_distance + connection_distance
+
+
 class DefaultGenome(object):
     """
     A genome for generalized neural networks.
@@ -152,6 +293,9 @@ class DefaultGenome(object):
         4. The input values are applied to the input pins unmodified.
     """
 
+    # Lazily built TopologicalIndex of the connection keys; see get_topology_index.
+    _topology = None
+
     @classmethod
     def parse_config(cls, param_dict):
         param_dict['node_gene_type'] = DefaultNodeGene
@@ -173,6 +317,43 @@ class DefaultGenome(object):
         # Fitness results.
         self.fitness = None
 
+        self._topology = None
+
+    def __getstate__(self):
+        # The topology index is rebuilt on demand rather than pickled or deep-copied.
+        state = self.__dict__.copy()
+        state['_topology'] = None
+        return state
+
+    def get_topology_index(self):
+        """
+        Returns a TopologicalIndex of this genome's connection keys (enabled or not),
+        building it on first use. Structural mutations and crossover keep the index
+        up to date; code that edits ``connections`` directly should call
+        `invalidate_topology_index` afterwards.
+        """
+        if self._topology is None or len(self._topology) != len(self.connections):
+            self._topology = TopologicalIndex(self.connections)
+        return self._topology
+
+    def invalidate_topology_index(self):
+        self._topology = None
+
+    def _update_topology_index(self, added=None, removed=None, removed_node=None):
+        if self._topology is None:
+            return
+        try:
+            if added is not None:
+                self._topology.add(*added)
+            if removed is not None:
+                self._topology.remove(*removed)
+            if removed_node is not None:
+                self._topology.remove_node(removed_node)
+        except (KeyError, RuntimeError):
+            # The index was out of date, or a recurrent connection made the
+            # connections impossible to order; rebuild it when next needed.
+            self._topology = None
+
     def configure_new(self, config):
         """Configure a new genome based on the given configuration."""
 
@@ -238,32 +419,109 @@ class DefaultGenome(object):
             parent1, parent2 = genome2, genome1
 
         # Inherit connection genes
+        operators = config.get_gene_operators(config.connection_gene_type)
+        copy_gene, crossover_genes = operators.copy, operators.crossover
         for key, cg1 in parent1.connections.items():
             cg2 = parent2.connections.get(key)
             if cg2 is None:
                 # Excess or disjoint gene: copy from the fittest parent.
-                self.connections[key] = cg1.copy()
+                self.connections[key] = copy_gene(cg1)
             else:
                 # Homologous gene: combine genes from both parents.
-                self.connections[key] = cg1.crossover(cg2)
+                self.connections[key] = crossover_genes(cg1, cg2)
+
+        # The child has exactly the fittest parent's connection keys.
+        if parent1._topology is not None and len(parent1._topology) == len(parent1.connections):
+            self._topology = parent1._topology.copy()
 
         # Inherit node genes
         parent1_set = parent1.nodes
         parent2_set = parent2.nodes
+        operators = config.get_gene_operators(config.node_gene_type)
+        copy_gene, crossover_genes = operators.copy, operators.crossover
 
         for key, ng1 in parent1_set.items():
             ng2 = parent2_set.get(key)
             assert key not in self.nodes
             if ng2 is None:
                 # Extra gene: copy from the fittest parent
-                self.nodes[key] = ng1.copy()
+                self.nodes[key] = copy_gene(ng1)
             else:
                 # Homologous gene: combine genes from both parents.
-                self.nodes[key] = ng1.crossover(ng2)
+                self.nodes[key] = crossover_genes(ng1, ng2)
+
+    @classmethod
+    def configure_crossover_batch(cls, children, parents, config):
+        """
+        Configures each of the new genomes in ``children`` by crossover from the
+        corresponding ``(genome1, genome2)`` pair in ``parents``, as
+        `configure_crossover` would, but chooses which parent each attribute of the
+        homologous genes of all the children comes from at once. Subclasses that
+        override `configure_crossover` have it called for each child.
+        """
+        if cls.configure_crossover is not DefaultGenome.configure_crossover:
+            for child, (genome1, genome2) in zip(children, parents):
+                child.configure_crossover(genome1, genome2, config)
+            return
+
+        homologous = {}
+        for child, (genome1, genome2) in zip(children, parents):
+            if genome1.fitness > genome2.fitness:
+                parent1, parent2 = genome1, genome2
+            else:
+                parent1, parent2 = genome2, genome1
+
+            for genes, genes1, genes2, gene_type in (
+                    (child.connections, parent1.connections, parent2.connections, config.connection_gene_type),
+                    (child.nodes, parent1.nodes, parent2.nodes, config.node_gene_type)):
+                operators = config.get_gene_operators(gene_type)
+                if gene_type.crossover is not BaseGene.crossover:
+                    for key, g1 in genes1.items():
+                        g2 = genes2.get(key)
+                        genes[key] = operators.copy(g1) if g2 is None else operators.crossover(g1, g2)
+                    continue
+
+                # Copy the fittest parent's genes; attributes are taken from the other
+                # parent below.
+                copy_gene = operators.copy
+                new_genes, other_genes = homologous.setdefault(gene_type, ([], []))
+                for key, g1 in genes1.items():
+                    new_gene = genes[key] = copy_gene(g1)
+                    g2 = genes2.get(key)
+                    if g2 is not None:
+                        new_genes.append(new_gene)
+                        other_genes.append(g2)
+
+            if parent1._topology is not None and len(parent1._topology) == len(parent1.connections):
+                child._topology = parent1._topology.copy()
+
+        for gene_type, (new_genes, other_genes) in homologous.items():
+            for a in gene_type._gene_attributes:
+                name = a.name
+                for i in coin_flips(len(new_genes)):
+                    setattr(new_genes[i], name, getattr(other_genes[i], name))
 
     def mutate(self, config):
         """ Mutates this genome. """
+        self.mutate_structure(config)
+
+        if config.vectorized_mutation:
+            config.connection_gene_type.mutate_genes(self.connections.values(), config)
+            config.node_gene_type.mutate_genes(self.nodes.values(), config)
+            return
 
+        # Mutate connection genes.
+        mutate = config.get_gene_operators(config.connection_gene_type).mutate
+        for cg in self.connections.values():
+            mutate(cg)
+
+        # Mutate node genes (bias, response, etc.).
+        mutate = config.get_gene_operators(config.node_gene_type).mutate
+        for ng in self.nodes.values():
+            mutate(ng)
+
+    def mutate_structure(self, config):
+        """ Applies the structural mutations (adding or deleting nodes and connections) of `mutate`. """
         if config.single_structural_mutation:
             div = max(1, (config.node_add_prob + config.node_delete_prob +
                           config.conn_add_prob + config.conn_delete_prob))
@@ -291,13 +549,24 @@ class DefaultGenome(object):
             if random() < config.conn_delete_prob:
                 self.mutate_delete_connection()
 
-        # Mutate connection genes.
-        for cg in self.connections.values():
-            cg.mutate(config)
+    @classmethod
+    def mutate_batch(cls, genomes, config):
+        """
+        Mutates each of the genomes as `mutate` would: the structural mutations are
+        applied one genome at a time, then the attributes of all the genes of all
+        the genomes are mutated together, drawing each attribute's random numbers
+        at once. Subclasses that override `mutate` have it called for each genome.
+        """
+        genomes = list(genomes)
+        if cls.mutate is not DefaultGenome.mutate:
+            for g in genomes:
+                g.mutate(config)
+            return
 
-        # Mutate node genes (bias, response, etc.).
-        for ng in self.nodes.values():
-            ng.mutate(config)
+        for g in genomes:
+            g.mutate_structure(config)
+        config.connection_gene_type.mutate_genes([cg for g in genomes for cg in g.connections.values()], config)
+        config.node_gene_type.mutate_genes([ng for g in genomes for ng in g.nodes.values()], config)
 
     def mutate_add_node(self, config):
         if not self.connections:
@@ -328,10 +597,11 @@ class DefaultGenome(object):
         assert isinstance(enabled, bool)
         key = (input_key, output_key)
         connection = config.connection_gene_type(key)
-        connection.init_attributes(config)
+        config.get_gene_operators(config.connection_gene_type).init_attributes(connection)
         connection.weight = weight
         connection.enabled = enabled
         self.connections[key] = connection
+        self._update_topology_index(added=key)
 
     def mutate_add_connection(self, config):
         """
@@ -360,11 +630,16 @@ class DefaultGenome(object):
         # they cannot be the output end of a connection (see above).
 
         # For feed-forward networks, avoid creating cycles.
-        if config.feed_forward and creates_cycle(list(self.connections), key):
-            return
+        if config.feed_forward:
+            if config.topology_index:
+                if self.get_topology_index().creates_cycle(key):
+                    return
+            elif creates_cycle(self.connections, key):
+                return
 
         cg = self.create_connection(config, in_node, out_node)
         self.connections[cg.key] = cg
+        self._update_topology_index(added=cg.key)
 
     def mutate_delete_node(self, config):
         # Do nothing if there are no non-output nodes.
@@ -383,6 +658,7 @@ class DefaultGenome(object):
             del self.connections[key]
 
         del self.nodes[del_key]
+        self._update_topology_index(removed_node=del_key)
 
         return del_key
 
@@ -390,58 +666,81 @@ class DefaultGenome(object):
         if self.connections:
             key = choice(list(self.connections.keys()))
             del self.connections[key]
+            self._update_topology_index(removed=key)
 
-    def distance(self, other, config):
+    def distance(self, other, config, bound=None):
         """
         Returns the genetic distance between this genome and the other. This distance value
-        is used to compute genome compatibility for speciation.
+        is used to compute genome compatibility for speciation. If a ``bound`` is given, it
+        may stop as soon as the distance is known to be at least ``bound``, and return a
+        value between ``bound`` and the distance; this assumes that gene distances are
+        never negative.
         """
+        disjoint_coefficient = config.compatibility_disjoint_coefficient
+
+        # Disjoint and excess genes alone give a lower bound on the distance.
+        max_nodes = max(len(self.nodes), len(other.nodes))
+        disjoint_nodes = len(self.nodes) + len(other.nodes) - 2 * len(self.nodes.keys() & other.nodes.keys())
+        max_conn = max(len(self.connections), len(other.connections))
+        disjoint_connections = (len(self.connections) + len(other.connections) -
+                                2 * len(self.connections.keys() & other.connections.keys()))
+        connection_lower = (disjoint_coefficient * disjoint_connections) / max_conn if max_conn else 0.0
+        if bound is not None:
+            lower = ((disjoint_coefficient * disjoint_nodes) / max_nodes if max_nodes else 0.0) + connection_lower
+            if lower >= bound:
+                return lower
 
         # Compute node gene distance component.
         node_distance = 0.0
-        if self.nodes or other.nodes:
-            disjoint_nodes = 0
-            for k2 in other.nodes:
-                if k2 not in self.nodes:
-                    disjoint_nodes += 1
-
+        if max_nodes:
             for k1, n1 in self.nodes.items():
                 n2 = other.nodes.get(k1)
-                if n2 is None:
-                    disjoint_nodes += 1
-                else:
+                if n2 is not None:
                     # Homologous genes compute their own distance value.
                     node_distance += n1.distance(n2, config)
 
-            max_nodes = max(len(self.nodes), len(other.nodes))
-            node_distance = (node_distance +
-                             (config.compatibility_disjoint_coefficient *
-                              disjoint_nodes)) / max_nodes
+            node_distance = (node_distance + (disjoint_coefficient * disjoint_nodes)) / max_nodes
 
         # Compute connection gene differences.
         connection_distance = 0.0
-        if self.connections or other.connections:
-            disjoint_connections = 0
-            for k2 in other.connections:
-                if k2 not in self.connections:
-                    disjoint_connections += 1
+        if max_conn:
+            limit = float('inf')
+            if bound is not None:
+                if node_distance + connection_lower >= bound:
+                    return node_distance + connection_lower
+                # Once the sum passes this, the distance is (about) the bound or more.
+                limit = (bound - node_distance) * max_conn - disjoint_coefficient * disjoint_connections
 
             for k1, c1 in self.connections.items():
                 c2 = other.connections.get(k1)
-                if c2 is None:
-                    disjoint_connections += 1
-                else:
+                if c2 is not None:
                     # Homologous genes compute their own distance value.
                     connection_distance += c1.distance(c2, config)
+                    if connection_distance > limit:
+                        lower = node_distance + (connection_distance + (disjoint_coefficient *
+                                                                        disjoint_connections)) / max_conn
+                        if lower >= bound:
+                            return lower
 
-            max_conn = max(len(self.connections), len(other.connections))
             connection_distance = (connection_distance +
-                                   (config.compatibility_disjoint_coefficient *
+                                   (disjoint_coefficient *
                                     disjoint_connections)) / max_conn
 
         distance = node_distance + connection_distance
         return distance
 
+    def distance_arrays(self, config):
+        """
+        Returns a `DistanceArrays` snapshot of this genome, whose ``distance`` method
+        gives the same values as `distance`, or None if NumPy is not installed or
+        the genome or gene classes compute distance differently.
+        """
+        if (np is None or type(self).distance is not DefaultGenome.distance or
+                config.node_gene_type.distance is not DefaultNodeGene.distance or
+                config.connection_gene_type.distance is not DefaultConnectionGene.distance):
+            return None
+        return DistanceArrays(self)
+
     def size(self):
         """
         Returns genome 'complexity', taken to be
@@ -464,13 +763,13 @@ class DefaultGenome(object):
     @staticmethod
     def create_node(config, node_id):
         node = config.node_gene_type(node_id)
-        node.init_attributes(config)
+        config.get_gene_operators(config.node_gene_type).init_attributes(node)
         return node
 
     @staticmethod
     def create_connection(config, input_id, output_id):
         connection = config.connection_gene_type((input_id, output_id))
-        connection.init_attributes(config)
+        config.get_gene_operators(config.connection_gene_type).init_attributes(connection)
         return connection
 
     def connect_fs_neat_nohidden(self, config):
@@ -566,6 +865,22 @@ class DefaultGenome(object):
             connection = self.create_connection(config, input_id, output_id)
             self.connections[connection.key] = connection
 
+    def fingerprint(self, genome_config=None, pruned=False, include_disabled=False):
+        """
+        Returns a hex digest of the genome's node genes and enabled connection genes;
+        genomes with equal fingerprints have the same phenotype. With ``pruned``, only
+        the genes kept by `get_pruned_genes` (which needs ``genome_config``) are
+        covered; with ``include_disabled``, disabled connection genes are covered too.
+        """
+        if pruned:
+            if genome_config is None:
+                raise RuntimeError("A genome config is needed for a pruned fingerprint")
+            node_keys, connection_keys = get_pruned_keys(self.connections, genome_config.input_keys,
+                                                         genome_config.output_keys)
+            return genes_fingerprint([self.nodes[k] for k in node_keys],
+                                     [self.connections[k] for k in connection_keys])
+        return genes_fingerprint(self.nodes.values(), self.connections.values(), include_disabled)
+
     def get_pruned_copy(self, genome_config):
         used_node_genes, used_connection_genes = get_pruned_genes(self.nodes, self.connections,
                                                                   genome_config.input_keys, genome_config.output_keys)
@@ -575,10 +890,39 @@ class DefaultGenome(object):
         return new_genome
 
 
-def get_pruned_genes(node_genes, connection_genes, input_keys, output_keys):
+def genes_fingerprint(node_genes, connection_genes, include_disabled=False):
+    """
+    Combines the fingerprints of the given genes (and of the enabled connection genes
+    only, unless ``include_disabled``) into a 32-digit hex digest, in a single pass.
+    The result does not depend on the order of the genes, and can be used with any
+    gene classes that derive from `BaseGene`.
+    """
+    total = 0
+    for ng in node_genes:
+        total += ng.fingerprint()
+    for cg in connection_genes:
+        if include_disabled or getattr(cg, 'enabled', True):
+            total += cg.fingerprint()
+    return format(total & ((1 << 128) - 1), '032x')
+
+
+def get_pruned_keys(connection_genes, input_keys, output_keys):
+    """Returns the keys of the used nodes, and of the enabled connections between used pins."""
     used_nodes = required_for_output(input_keys, output_keys, connection_genes)
     used_pins = used_nodes.union(input_keys)
 
+    used_connections = []
+    for key, cg in connection_genes.items():
+        in_node_id, out_node_id = key
+        if cg.enabled and in_node_id in used_pins and out_node_id in used_pins:
+            used_connections.append(key)
+
+    return used_nodes, used_connections
+
+
+def get_pruned_genes(node_genes, connection_genes, input_keys, output_keys):
+    used_nodes, used_connections = get_pruned_keys(connection_genes, input_keys, output_keys)
+
     # Copy used nodes into a new genome.
     used_node_genes = {}
     for n in used_nodes:
@@ -586,9 +930,7 @@ def get_pruned_genes(node_genes, connection_genes, input_keys, output_keys):
 
     # Copy enabled and used connections into the new genome.
     used_connection_genes = {}
-    for key, cg in connection_genes.items():
-        in_node_id, out_node_id = key
-        if cg.enabled and in_node_id in used_pins and out_node_id in used_pins:
-            used_connection_genes[key] = copy.deepcopy(cg)
+    for key in used_connections:
+        used_connection_genes[key] = copy.deepcopy(connection_genes[key])
 
     return used_node_genes, used_connection_genes
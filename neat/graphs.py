@@ -1,28 +1,213 @@
 """Directed graph algorithm implementations."""
+import copy
+
+
+class Adjacency(object):
+    """
+    Successor and predecessor sets of a directed graph, indexed by node.
+
+    The graph functions in this module accept either a list of (input, output)
+    connections, from which they build an Adjacency, or a prebuilt Adjacency,
+    so that callers making several queries on the same graph only index it once.
+    Iterating over an Adjacency yields its (input, output) connections.
+    """
+
+    def __init__(self, connections=()):
+        self.successors = {}
+        self.predecessors = {}
+        self.num_connections = 0
+        for a, b in connections:
+            Adjacency.add(self, a, b)
+
+    def __iter__(self):
+        for a, outputs in self.successors.items():
+            for b in outputs:
+                yield a, b
+
+    def __len__(self):
+        return self.num_connections
+
+    def __contains__(self, connection):
+        a, b = connection
+        return b in self.successors.get(a, ())
+
+    def copy(self):
+        new = copy.copy(self)
+        new.successors = dict((a, set(outputs)) for a, outputs in self.successors.items())
+        new.predecessors = dict((b, set(inputs)) for b, inputs in self.predecessors.items())
+        return new
+
+    def add(self, a, b):
+        outputs = self.successors.setdefault(a, set())
+        if b not in outputs:
+            outputs.add(b)
+            self.predecessors.setdefault(b, set()).add(a)
+            self.num_connections += 1
+
+    def remove(self, a, b):
+        self.successors[a].remove(b)
+        self.predecessors[b].remove(a)
+        self.num_connections -= 1
+        if not self.successors[a]:
+            del self.successors[a]
+        if not self.predecessors[b]:
+            del self.predecessors[b]
+
+    def remove_node(self, node):
+        """Removes every connection into or out of the given node."""
+        for b in list(self.successors.get(node, ())):
+            self.remove(node, b)
+        for a in list(self.predecessors.get(node, ())):
+            self.remove(a, node)
+
+
+class TopologicalIndex(Adjacency):
+    """
+    An Adjacency of an acyclic graph that also maintains a topological order of its
+    nodes, as a mapping from node to position. The order is updated incrementally as
+    connections are added (using the Pearce-Kelly algorithm, which only reorders the
+    nodes between the two ends of a connection that goes against the current order),
+    so `creates_cycle` can answer immediately for any connection that follows the
+    order, and otherwise only searches the nodes between its ends.
+    """
+
+    def __init__(self, connections=()):
+        Adjacency.__init__(self, connections)
+        self.order = {}
+
+        # Number the nodes in the order Kahn's algorithm visits them.
+        remaining = dict((b, len(inputs)) for b, inputs in self.predecessors.items())
+        pending = [a for a in self.successors if a not in remaining]
+        while pending:
+            a = pending.pop()
+            self.order[a] = len(self.order)
+            for b in self.successors.get(a, ()):
+                remaining[b] -= 1
+                if remaining[b] == 0:
+                    pending.append(b)
+
+        if len(self.order) != len(set(self.successors).union(self.predecessors)):
+            raise RuntimeError("Cannot order the nodes of a graph containing a cycle")
+        self.next_position = len(self.order)
+
+    def copy(self):
+        new = Adjacency.copy(self)
+        new.order = dict(self.order)
+        return new
+
+    def topological_order(self):
+        """Returns the nodes with at least one connection, in topological order."""
+        return sorted(self.order, key=self.order.get)
+
+    def creates_cycle(self, test):
+        """Returns true if adding the 'test' connection would create a cycle."""
+        i, o = test
+        if i == o:
+            return True
+
+        # A node without a position has no connections, so cannot be part of a cycle.
+        upper = self.order.get(i)
+        lower = self.order.get(o)
+        if upper is None or lower is None or lower > upper:
+            return False
+
+        # Any path from o back to i only passes through nodes positioned between them.
+        return i in self._search(o, self.successors, lambda n: self.order[n] <= upper)
+
+    def add(self, a, b):
+        if (a, b) in self:
+            return
+        if a == b:
+            raise RuntimeError("Adding connection {0!r} would create a cycle".format((a, b)))
+
+        for n in (a, b):
+            if n not in self.order:
+                self.order[n] = self.next_position
+                self.next_position += 1
+
+        upper = self.order[a]
+        lower = self.order[b]
+        if lower < upper:
+            # Nodes reachable from b, and nodes reaching a, positioned between b and a.
+            forward = self._search(b, self.successors, lambda n: self.order[n] <= upper)
+            if a in forward:
+                raise RuntimeError("Adding connection {0!r} would create a cycle".format((a, b)))
+            backward = self._search(a, self.predecessors, lambda n: self.order[n] > lower)
+
+            # Reuse the same positions, placing everything that reaches a before everything b reaches.
+            moved = sorted(backward, key=self.order.get) + sorted(forward, key=self.order.get)
+            positions = sorted(self.order[n] for n in moved)
+            for n, position in zip(moved, positions):
+                self.order[n] = position
+
+        Adjacency.add(self, a, b)
+
+    def remove_node(self, node):
+        Adjacency.remove_node(self, node)
+        self.order.pop(node, None)
+
+    @staticmethod
+    def _search(start, neighbours, allowed):
+        found = {start}
+        pending = [start]
+        while pending:
+            for n in neighbours.get(pending.pop(), ()):
+                if n not in found and allowed(n):
+                    found.add(n)
+                    pending.append(n)
+        return found
+
+
+def as_adjacency(connections):
+    """Returns connections unchanged if it is already an Adjacency, otherwise indexes it."""
+    if isinstance(connections, Adjacency):
+        return connections
+    return Adjacency(connections)
+
+
+def _successors(connections):
+    # Plain lists are cheaper to build than an Adjacency for a single query.
+    if isinstance(connections, Adjacency):
+        return connections.successors
+    successors = {}
+    for a, b in connections:
+        successors.setdefault(a, []).append(b)
+    return successors
+
+
+def _predecessors(connections):
+    if isinstance(connections, Adjacency):
+        return connections.predecessors
+    predecessors = {}
+    for a, b in connections:
+        predecessors.setdefault(b, []).append(a)
+    return predecessors
 
 
 def creates_cycle(connections, test):
     """
     Returns true if the addition of the 'test' connection would create a cycle,
-    assuming that no cycle already exists in the graph represented by 'connections'.
+    assuming that no cycle already exists in the graph represented by 'connections'
+    (a list of connections or an Adjacency).
     """
     i, o = test
     if i == o:
         return True
 
+    # Search forward from the output of the test connection for its input.
+    successors = _successors(connections)
     visited = {o}
-    while True:
-        num_added = 0
-        for a, b in connections:
-            if a in visited and b not in visited:
+    pending = [o]
+    while pending:
+        for b in successors.get(pending.pop(), ()):
+            if b not in visited:
                 if b == i:
                     return True
 
                 visited.add(b)
-                num_added += 1
+                pending.append(b)
 
-        if num_added == 0:
-            return False
+    return False
 
 
 def required_for_output(inputs, outputs, connections):
@@ -30,7 +215,7 @@ def required_for_output(inputs, outputs, connections):
     Collect the nodes whose state is required to compute the final network output(s).
     :param inputs: list of the input identifiers
     :param outputs: list of the output node identifiers
-    :param connections: list of (input, output) connections in the network.
+    :param connections: list of (input, output) connections in the network, or an Adjacency.
     NOTE: It is assumed that the input identifier set and the node identifier set are disjoint.
     By convention, the output node ids are always the same as the output index.
 
@@ -38,11 +223,18 @@ def required_for_output(inputs, outputs, connections):
     """
     assert not set(inputs).intersection(outputs)
 
+    return _required_for_output(inputs, outputs, _predecessors(connections))
+
+
+def _required_for_output(inputs, outputs, incoming):
+    # Each search step only looks at the connections into the nodes found in the previous step.
+    inputs = set(inputs)
     required = set(outputs)
     s = set(outputs)
+    frontier = s
     while 1:
         # Find nodes not in s whose output is consumed by a node in s.
-        t = set(a for (a, b) in connections if b in s and a not in s)
+        t = set(a for b in frontier for a in incoming.get(b, ()) if a not in s)
 
         if not t:
             break
@@ -51,8 +243,9 @@ def required_for_output(inputs, outputs, connections):
         if not layer_nodes:
             break
 
-        required = required.union(layer_nodes)
-        s = s.union(t)
+        required.update(layer_nodes)
+        s.update(t)
+        frontier = t
 
     return required
 
@@ -62,31 +255,39 @@ def feed_forward_layers(inputs, outputs, connections):
     Collect the layers whose members can be evaluated in parallel in a feed-forward network.
     :param inputs: list of the network input nodes
     :param outputs: list of the output node identifiers
-    :param connections: list of (input, output) connections in the network.
+    :param connections: list of (input, output) connections in the network, or an Adjacency.
 
     Returns a list of layers, with each layer consisting of a set of node identifiers.
     Note that the returned layers do not contain nodes whose output is ultimately
     never used to compute the final network output.
     """
+    assert not set(inputs).intersection(outputs)
+
+    successors = _successors(connections)
+    predecessors = _predecessors(connections)
+    required = _required_for_output(inputs, outputs, predecessors)
 
-    required = required_for_output(inputs, outputs, connections)
+    # A node joins the next layer once every one of its input connections comes from a
+    # node in s, so each connection is visited once over the whole sort.
+    remaining = dict((b, len(a)) for b, a in predecessors.items())
 
     layers = []
     s = set(inputs)
+    frontier = s
     while 1:
-        # Find candidate nodes c for the next layer.  These nodes should connect
-        # a node in s to a node not in s.
-        c = set(b for (a, b) in connections if a in s and b not in s)
-        # Keep only the used nodes whose entire input set is contained in s.
+        # Keep only the used nodes whose entire input set is now contained in s.
         t = set()
-        for n in c:
-            if n in required and all(a in s for (a, b) in connections if b == n):
-                t.add(n)
+        for a in frontier:
+            for b in successors.get(a, ()):
+                remaining[b] -= 1
+                if remaining[b] == 0 and b in required and b not in s:
+                    t.add(b)
 
         if not t:
             break
 
         layers.append(t)
-        s = s.union(t)
+        s.update(t)
+        frontier = t
 
     return layers
@@ -0,0 +1,279 @@
+"""
+Runs several populations ("islands") in separate processes, periodically
+migrating the fittest genomes between them.
+"""
+import atexit
+import heapq
+import random
+import weakref
+from itertools import count
+from multiprocessing import Pipe, Process, util  # pylint: disable=unused-import
+
+from neat.population import Population
+from neat.reporting import BaseReporter, ReporterSet
+from neat.reproduction import ParallelReproduction
+
+TOPOLOGIES = ('ring', 'fully_connected', 'random')
+
+# Island processes are not daemonic, so that an island's evaluator can start worker
+# processes of its own. At exit, multiprocessing waits for such processes, so those of
+# the models not closed are stopped first: atexit calls the functions registered last
+# (after multiprocessing.util, imported above, registered its own) first.
+_started_models = weakref.WeakSet()
+
+
+def _close_started_models():
+    for model in list(_started_models):
+        model.close()
+
+
+atexit.register(_close_started_models)
+
+
+def migration_destinations(num_islands, topology, rng=random):
+    """
+    Returns, for each island, the list of islands to which it sends migrants:
+    the next island for a ``ring``, every other island if ``fully_connected``,
+    or another island chosen at random (with ``rng``) for ``random``.
+    """
+    if topology not in TOPOLOGIES:
+        raise RuntimeError("Unexpected migration topology: {0!r}".format(topology))
+    if num_islands < 2:
+        return [[] for i in range(num_islands)]
+    if topology == 'ring':
+        return [[(i + 1) % num_islands] for i in range(num_islands)]
+    if topology == 'fully_connected':
+        return [[j for j in range(num_islands) if j != i] for i in range(num_islands)]
+    destinations = []
+    for i in range(num_islands):
+        j = rng.randrange(num_islands - 1)
+        destinations.append([j + (j >= i)])
+    return destinations
+
+
+class IslandReporter(BaseReporter):
+    """Keeps the fittest genomes of an island's last evaluated generation, and whether it found a solution."""
+
+    def __init__(self, config, num_genomes):
+        self.config = config
+        self.num_genomes = num_genomes
+        self.fittest = []
+        self.solved = False
+
+    def post_evaluate(self, config, population, species, best_genome):
+        self.fittest = heapq.nlargest(self.num_genomes, population.values(), key=lambda g: g.fitness)
+
+    def found_solution(self, config, generation, best):
+        if not self.config.no_fitness_termination:
+            self.solved = True
+
+
+def create_island(config, index, num_islands):
+    """
+    Returns a new `Population` for island ``index`` of ``num_islands``. Its genome
+    keys, and the keys of the hidden nodes it creates, are those equal to ``index``
+    modulo ``num_islands`` (counting genomes from 1 and hidden nodes after the
+    outputs), so they are unique across the islands. This does not hold with
+    `ParallelReproduction`, which gives out node keys in consecutive ranges.
+    """
+    genome_config = config.genome_config
+    genome_config.node_indexer = count(len(genome_config.output_keys) + index, num_islands)
+    p = Population(config, ({}, None, 0))
+    p.reproduction.genome_indexer = count(index + 1, num_islands)
+    p.population = p.reproduction.create_new(config.genome_type, genome_config, config.pop_size)
+    p.species = config.species_set_type(config.species_set_config, p.reporters)
+    p.species.speciate(config, p.population, p.generation)
+    return p
+
+
+def add_immigrants(p, immigrants):
+    """
+    Replaces offspring (genomes not yet evaluated) of the population ``p``, chosen
+    at random, with copies of the ``immigrants`` under new keys, and divides the
+    population into species again. If there are fewer offspring than immigrants,
+    only the fittest immigrants are added, so the population keeps its size.
+    Returns the number of immigrants added.
+    """
+    offspring = [gid for gid, g in p.population.items() if g.fitness is None]
+    if len(immigrants) > len(offspring):
+        immigrants = sorted(immigrants, key=lambda g: g.fitness, reverse=True)[:len(offspring)]
+    for gid in random.sample(offspring, len(immigrants)):
+        del p.population[gid]
+    for g in immigrants:
+        old_key = g.key
+        g.key = next(p.reproduction.genome_indexer)
+        g.fitness = None
+        p.population[g.key] = g
+        p.reproduction.ancestors[g.key] = (old_key,)
+    p.species.speciate(p.config, p.population, p.generation)
+    return len(immigrants)
+
+
+def _island_main(conn, config, index, num_islands, num_migrants, seed, fitness_function, evaluator_factory):
+    random.seed(seed)
+    try:
+        if fitness_function is None:
+            fitness_function = evaluator_factory(index)
+        p = create_island(config, index, num_islands)
+        reporter = IslandReporter(config, num_migrants)
+        p.add_reporter(reporter)
+    except Exception as e:  # pylint: disable=broad-except
+        conn.send(('error', e))
+        return
+
+    try:
+        while True:
+            command, arg = conn.recv()
+            try:
+                if command == 'run':
+                    p.run(fitness_function, arg)
+                    conn.send(('done', (p.generation, p.best_genome, reporter.fittest, reporter.solved)))
+                elif command == 'immigrate':
+                    conn.send(('done', add_immigrants(p, arg)))
+                elif command == 'population':
+                    conn.send(('done', p.population))
+                else:
+                    break
+            except Exception as e:  # pylint: disable=broad-except
+                conn.send(('error', e))
+    finally:
+        # Shut down the worker processes of an evaluator made for this island, such as
+        # a ParallelEvaluator whose evaluate method the factory returned.
+        close = getattr(getattr(fitness_function, '__self__', None), 'close', None)
+        if evaluator_factory is not None and close is not None:
+            close()
+
+
+class IslandModel(object):
+    """
+    Runs ``num_islands`` populations, each in its own process, for
+    ``migration_interval`` generations at a time; in between, copies of the
+    ``num_migrants`` fittest genomes of each island's last generation replace
+    offspring on the islands it sends to, following the ``topology`` (see
+    `migration_destinations`). Genome keys are unique across the islands.
+
+    Each island evaluates its genomes with the fitness function passed to `run`,
+    which must be picklable; or else, to give each island its own evaluator
+    (such as a `ParallelEvaluator`), ``evaluator_factory`` is called in each
+    island's process with the island's index and returns its fitness function.
+    The island processes are not daemonic, so that such an evaluator can start
+    processes of its own; if the fitness function is a method of an object with
+    a ``close`` method, that is called when the island stops. Call `close` when
+    done with the islands (those still running are closed at exit).
+
+    The islands' reproduction class must not be `ParallelReproduction`, whose
+    node keys would not be unique across the islands.
+    """
+
+    def __init__(self, config, num_islands, migration_interval=10, num_migrants=2, topology='ring',
+                 evaluator_factory=None):
+        if topology not in TOPOLOGIES:
+            raise RuntimeError("Unexpected migration topology: {0!r}".format(topology))
+        if issubclass(config.reproduction_type, ParallelReproduction):
+            raise RuntimeError("IslandModel cannot use ParallelReproduction, "
+                               "whose node keys are not unique across islands")
+        self.config = config
+        self.num_islands = num_islands
+        self.migration_interval = migration_interval
+        self.num_migrants = num_migrants
+        self.topology = topology
+        self.evaluator_factory = evaluator_factory
+        self.reporters = ReporterSet()
+        self.islands = []
+        self.generation = 0
+        self.best_genome = None
+        self.best_genomes = [None] * num_islands
+
+    def __del__(self):
+        self.close()
+
+    def add_reporter(self, reporter):
+        self.reporters.add(reporter)
+
+    def remove_reporter(self, reporter):
+        self.reporters.remove(reporter)
+
+    def start(self, fitness_function=None):
+        """Starts the island processes, each with a new population, unless already started."""
+        if self.islands:
+            return
+        if fitness_function is None and self.evaluator_factory is None:
+            raise RuntimeError("Either a fitness function or an evaluator factory is needed")
+        for index in range(self.num_islands):
+            parent_conn, child_conn = Pipe()
+            process = Process(target=_island_main, name='NEAT-island-{0}'.format(index), daemon=False,
+                              args=(child_conn, self.config, index, self.num_islands, self.num_migrants,
+                                    random.getrandbits(64), fitness_function, self.evaluator_factory))
+            process.start()
+            self.islands.append((process, parent_conn))
+        _started_models.add(self)
+
+    def close(self):
+        """Stops the island processes, if any were started."""
+        for process, conn in getattr(self, 'islands', []):
+            try:
+                conn.send(('stop', None))
+            except (OSError, ValueError):
+                pass
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+                process.join()
+        self.islands = []
+
+    def _request_all(self, commands):
+        for (process, conn), command in zip(self.islands, commands):
+            conn.send(command)
+        results = []
+        for process, conn in self.islands:
+            status, result = conn.recv()
+            if status == 'error':
+                self.close()
+                raise result
+            results.append(result)
+        return results
+
+    def populations(self):
+        """Returns the current population (a dict of genomes by key) of each island."""
+        return self._request_all([('population', None)] * self.num_islands)
+
+    def run(self, fitness_function=None, n=None):
+        """
+        Runs every island for at most n generations (unlimited if n is None), in
+        steps of ``migration_interval`` generations followed by a migration, and
+        returns the best genome seen. Stops once an island finds a solution,
+        after the step in which it did. The best genome and generation of each
+        island are reported through ``info`` after every step.
+        """
+        if self.config.no_fitness_termination and (n is None):
+            raise RuntimeError("Cannot have no generational limit with no fitness termination")
+
+        self.start(fitness_function)
+        k = 0
+        while n is None or k < n:
+            step = self.migration_interval if n is None else min(self.migration_interval, n - k)
+            results = self._request_all([('run', step)] * self.num_islands)
+            k += step
+            self.generation += step
+
+            solved = False
+            for index, (generation, best, fittest, island_solved) in enumerate(results):
+                self.best_genomes[index] = best
+                if self.best_genome is None or best.fitness > self.best_genome.fitness:
+                    self.best_genome = best
+                solved = solved or island_solved
+                self.reporters.info("Island {0}: generation {1}, best fitness {2:.5f} (genome {3})".format(
+                    index, generation, best.fitness, best.key))
+            if solved or (n is not None and k >= n):
+                break
+
+            # Migrate the fittest genomes of each island's last generation.
+            immigrants = [[] for i in range(self.num_islands)]
+            destinations = migration_destinations(self.num_islands, self.topology)
+            for index, (generation, best, fittest, island_solved) in enumerate(results):
+                for destination in destinations[index]:
+                    immigrants[destination].extend(fittest)
+            migrated = self._request_all([('immigrate', genomes) for genomes in immigrants])
+            self.reporters.info("Migrated {0} genomes".format(sum(migrated)))
+
+        return self.best_genome
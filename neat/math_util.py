@@ -36,6 +36,30 @@ def stdev(values):
     return sqrt(variance(values))
 
 
+class RunningStats(object):
+    """
+    The count, mean and variance of a stream of values, updated one value at a time
+    (with Welford's method) instead of keeping the values.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.sum_squares = 0.0
+
+    def add(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.sum_squares += delta * (value - self.mean)
+
+    def variance(self):
+        return self.sum_squares / self.count
+
+    def stdev(self):
+        return sqrt(self.variance())
+
+
 def softmax(values):
     """
     Compute the softmax of the given value set, v_i = exp(v_i) / s,
@@ -0,0 +1,181 @@
+"""
+Compiles network phenotypes into straight-line Python functions: each node becomes a
+local variable, weights, biases and responses are inlined as constants, ``sum``
+aggregation is inlined as additions (for nodes with up to `MAX_INLINE_TERMS` inputs), and activation functions are called directly.
+This removes the interpretive overhead of walking ``node_evals`` on every activation.
+"""
+import math
+from functools import lru_cache
+
+from neat.aggregations import sum_aggregation
+from neat.nn.feed_forward import FeedForwardNetwork
+from neat.nn.recurrent import RecurrentNetwork
+
+
+@lru_cache(maxsize=1024)
+def compile_source(source):
+    """Compiles generated source code, caching the code object by its text."""
+    return compile(source, '<neat.nn.compiled>', 'exec')
+
+
+def _literal(x):
+    x = float(x)
+    if math.isfinite(x):
+        return repr(x)
+    return "float({0!r})".format(repr(x))
+
+# A longer chain of additions nests too deeply for the compiler (a RecursionError at a
+# few thousand terms), so larger sums are computed by calling the aggregation function
+# on a list, as the uncompiled networks do.
+MAX_INLINE_TERMS = 256
+
+
+class _SourceWriter(object):
+    """Accumulates generated lines and the functions they refer to."""
+
+    def __init__(self):
+        self.lines = []
+        self.namespace = {}
+        self.function_names = {}
+
+    def add(self, line):
+        self.lines.append(line)
+
+    def function_name(self, prefix, function):
+        name = self.function_names.get(function)
+        if name is None:
+            name = "{0}{1}".format(prefix, len(self.function_names))
+            self.function_names[function] = name
+            self.namespace[name] = function
+        return name
+
+    def node_expression(self, act_func, agg_func, bias, response, links, names):
+        """Returns the expression computing one node, given the variable names of its sources."""
+        terms = ["{0} * {1}".format(names.get(i, '0.0'), _literal(w)) for i, w in links]
+        if agg_func is sum_aggregation and len(terms) <= MAX_INLINE_TERMS:
+            s = "({0})".format(" + ".join(terms)) if terms else "0.0"
+        else:
+            s = "{0}([{1}])".format(self.function_name('agg', agg_func), ", ".join(terms))
+        return "{0}({1} + {2} * {3})".format(self.function_name('act', act_func), _literal(bias),
+                                            _literal(response), s)
+
+    def build(self, name):
+        source = "\n".join(self.lines) + "\n"
+        namespace = dict(self.namespace)
+        exec(compile_source(source), namespace)
+        return source, namespace[name]
+
+
+def _input_lines(writer, input_nodes, names):
+    writer.add("    if len(inputs) != {0:d}:".format(len(input_nodes)))
+    writer.add("        raise RuntimeError(\"Expected {0:n} inputs, got {{0:n}}\".format(len(inputs)))".format(
+        len(input_nodes)))
+    for n, k in enumerate(input_nodes):
+        names[k] = "i{0:d}".format(n)
+    if input_nodes:
+        writer.add("    {0}, = inputs".format(", ".join(names[k] for k in input_nodes)))
+
+
+def compile_feed_forward(inputs, outputs, node_evals):
+    """
+    Generates and compiles ``activate(inputs)`` for the given feed-forward node_evals
+    (in the format used by `FeedForwardNetwork`). Returns ``(source, function)``.
+    """
+    writer = _SourceWriter()
+    writer.add("def activate(inputs):")
+    names = {}
+    _input_lines(writer, inputs, names)
+
+    for n, (node, act_func, agg_func, bias, response, links) in enumerate(node_evals):
+        expression = writer.node_expression(act_func, agg_func, bias, response, links, names)
+        names[node] = "v{0:d}".format(n)
+        writer.add("    {0} = {1}  # node {2!r}".format(names[node], expression, node))
+
+    writer.add("    return [{0}]".format(", ".join(names.get(k, '0.0') for k in outputs)))
+    return writer.build('activate')
+
+
+def compile_recurrent(inputs, outputs, node_evals):
+    """
+    Generates and compiles ``activate(inputs, state)`` for the given recurrent
+    node_evals (in the format used by `RecurrentNetwork`). ``state`` holds the
+    previous value of each evaluated node, in node_evals order; the function
+    returns ``(new_state, outputs)``. Returns ``(source, function)``.
+    """
+    writer = _SourceWriter()
+    writer.add("def activate(inputs, state):")
+    names = {}
+    _input_lines(writer, inputs, names)
+
+    # Nodes read their sources' values from the previous step.
+    for n, node_eval in enumerate(node_evals):
+        names.setdefault(node_eval[0], "p{0:d}".format(n))
+    if node_evals:
+        writer.add("    {0}, = state".format(", ".join("p{0:d}".format(n) for n in range(len(node_evals)))))
+
+    new_names = {}
+    for n, (node, act_func, agg_func, bias, response, links) in enumerate(node_evals):
+        expression = writer.node_expression(act_func, agg_func, bias, response, links, names)
+        new_names[node] = "v{0:d}".format(n)
+        writer.add("    {0} = {1}  # node {2!r}".format(new_names[node], expression, node))
+
+    state = "".join("{0}, ".format(new_names[ne[0]]) for ne in node_evals)
+    writer.add("    return ({0}), [{1}]".format(state, ", ".join(new_names.get(k, '0.0') for k in outputs)))
+    return writer.build('activate')
+
+
+class CompiledFeedForwardNetwork(object):
+    """
+    A feed-forward network compiled to a single Python function. It produces the
+    same outputs as the `FeedForwardNetwork` built from the same node_evals.
+    The generated code is available as the ``source`` attribute.
+    """
+
+    def __init__(self, inputs, outputs, node_evals):
+        self.input_nodes = inputs
+        self.output_nodes = outputs
+        self.node_evals = node_evals
+        self.source, self.activate = compile_feed_forward(inputs, outputs, node_evals)
+
+    def __reduce__(self):
+        # The generated function cannot be pickled, so it is rebuilt on unpickling.
+        return CompiledFeedForwardNetwork, (self.input_nodes, self.output_nodes, self.node_evals)
+
+    @staticmethod
+    def create(genome, config):
+        """ Receives a genome and returns its phenotype (a CompiledFeedForwardNetwork). """
+        net = FeedForwardNetwork.create(genome, config)
+        return CompiledFeedForwardNetwork(net.input_nodes, net.output_nodes, net.node_evals)
+
+
+class CompiledRecurrentNetwork(object):
+    """
+    A recurrent network compiled to a single Python function. It produces the
+    same sequence of outputs as the `RecurrentNetwork` built from the same
+    node_evals. The generated code is available as the ``source`` attribute.
+    """
+
+    def __init__(self, inputs, outputs, node_evals):
+        self.input_nodes = inputs
+        self.output_nodes = outputs
+        self.node_evals = node_evals
+        self.source, self.function = compile_recurrent(inputs, outputs, node_evals)
+        self.state = None
+        self.reset()
+
+    def __reduce__(self):
+        # The generated function cannot be pickled, so it is rebuilt on unpickling.
+        return CompiledRecurrentNetwork, (self.input_nodes, self.output_nodes, self.node_evals), {'state': self.state}
+
+    def reset(self):
+        self.state = (0.0,) * len(self.node_evals)
+
+    def activate(self, inputs):
+        self.state, outputs = self.function(inputs, self.state)
+        return outputs
+
+    @staticmethod
+    def create(genome, config):
+        """ Receives a genome and returns its phenotype (a CompiledRecurrentNetwork). """
+        net = RecurrentNetwork.create(genome, config)
+        return CompiledRecurrentNetwork(net.input_nodes, net.output_nodes, net.node_evals)
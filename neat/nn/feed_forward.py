@@ -1,4 +1,10 @@
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
 from neat.graphs import feed_forward_layers
+from neat.nn.vectorized import as_input_batch, vectorize_activation, vectorize_aggregation
 
 
 class FeedForwardNetwork(object):
@@ -7,6 +13,7 @@ class FeedForwardNetwork(object):
         self.output_nodes = outputs
         self.node_evals = node_evals
         self.values = dict((key, 0.0) for key in inputs + outputs)
+        self.batch_evals = None
 
     def activate(self, inputs):
         if len(self.input_nodes) != len(inputs):
@@ -24,27 +31,54 @@ class FeedForwardNetwork(object):
 
         return [self.values[i] for i in self.output_nodes]
 
+    def activate_batch(self, inputs):
+        """
+        Feeds each row of the (N x num_inputs) array ``inputs`` through the network,
+        and returns the corresponding (N x num_outputs) NumPy array of outputs.
+        Each node is evaluated once for the whole batch, using vectorized versions
+        of its activation and aggregation functions. Requires NumPy.
+        """
+        inputs = as_input_batch(inputs, len(self.input_nodes))
+        if self.batch_evals is None:
+            self.batch_evals = []
+            for node, act_func, agg_func, bias, response, links in self.node_evals:
+                sources = [i for i, w in links]
+                weights = np.array([w for i, w in links], dtype=float).reshape(-1, 1)
+                self.batch_evals.append((node, vectorize_activation(act_func), vectorize_aggregation(agg_func),
+                                         bias, response, sources, weights))
+
+        n = inputs.shape[0]
+        values = dict((key, np.zeros(n)) for key in self.values)
+        for k, v in zip(self.input_nodes, inputs.T):
+            values[k] = v
+
+        for node, act_func, agg_func, bias, response, sources, weights in self.batch_evals:
+            node_inputs = np.array([values[i] for i in sources]).reshape(len(sources), n) * weights
+            s = agg_func(node_inputs, axis=0)
+            values[node] = act_func(bias + response * s)
+
+        return np.array([values[i] for i in self.output_nodes]).reshape(len(self.output_nodes), n).T
+
     @staticmethod
     def create(genome, config):
         """ Receives a genome and returns its phenotype (a FeedForwardNetwork). """
 
-        # Gather expressed connections.
-        connections = [cg.key for cg in genome.connections.values() if cg.enabled]
+        # Gather expressed connections, grouped by their output node.
+        connections = []
+        node_inputs = {}
+        for cg in genome.connections.values():
+            if cg.enabled:
+                connections.append(cg.key)
+                node_inputs.setdefault(cg.key[1], []).append((cg.key[0], cg.weight))
 
         layers = feed_forward_layers(config.genome_config.input_keys, config.genome_config.output_keys, connections)
         node_evals = []
         for layer in layers:
             for node in layer:
-                inputs = []
-                for conn_key in connections:
-                    inode, onode = conn_key
-                    if onode == node:
-                        cg = genome.connections[conn_key]
-                        inputs.append((inode, cg.weight))
-
                 ng = genome.nodes[node]
                 aggregation_function = config.genome_config.aggregation_function_defs.get(ng.aggregation)
                 activation_function = config.genome_config.activation_defs.get(ng.activation)
-                node_evals.append((node, activation_function, aggregation_function, ng.bias, ng.response, inputs))
+                node_evals.append((node, activation_function, aggregation_function, ng.bias, ng.response,
+                                   node_inputs[node]))
 
         return FeedForwardNetwork(config.genome_config.input_keys, config.genome_config.output_keys, node_evals)
@@ -0,0 +1,499 @@
+"""
+A feed-forward network phenotype evaluated one layer at a time with NumPy array
+operations, instead of one node at a time with Python dict lookups.
+
+NumPy is an optional dependency of neat-python; it is only required when one of
+the classes or functions in this module is actually used.
+"""
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+from neat import activations, aggregations
+from neat.graphs import feed_forward_layers
+
+# Aggregation groups whose weight block is at least this dense (fraction of
+# nonzero entries) are evaluated as a dense matrix product; sparser groups are
+# evaluated as a gather followed by a segmented reduction.
+DENSE_FRACTION = 0.1
+
+# Batches are evaluated in chunks of at most this many rows, which keeps each
+# layer's working set small enough to stay in cache.
+BATCH_CHUNK_SIZE = 1024
+
+# Chunks are further limited so that the (nodes x chunk) value array holds at most
+# this many entries, which matters for packed populations with many nodes.
+BATCH_VALUES_LIMIT = 1 << 20
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("NumPy is required for vectorized network evaluation.")
+
+
+def _clip(z, lo, hi):
+    # Faster than np.clip for the small arrays typical of a single layer.
+    return np.minimum(np.maximum(z, lo), hi)
+
+
+def _sigmoid(z):
+    z = _clip(5.0 * z, -60.0, 60.0)
+    return 1.0 / (1.0 + np.exp(-z))
+
+
+def _tanh(z):
+    return np.tanh(_clip(2.5 * z, -60.0, 60.0))
+
+
+def _sin(z):
+    return np.sin(_clip(5.0 * z, -60.0, 60.0))
+
+
+def _gauss(z):
+    z = _clip(z, -3.4, 3.4)
+    return np.exp(-5.0 * z ** 2)
+
+
+def _relu(z):
+    return np.maximum(z, 0.0)
+
+
+def _elu(z):
+    return np.where(z > 0.0, z, np.exp(np.minimum(z, 0.0)) - 1)
+
+
+def _lelu(z):
+    return np.where(z > 0.0, z, 0.005 * z)
+
+
+def _selu(z):
+    lam = 1.0507009873554804934193349852946
+    alpha = 1.6732632423543772848170429916717
+    return np.where(z > 0.0, lam * z, lam * alpha * (np.exp(np.minimum(z, 0.0)) - 1))
+
+
+def _softplus(z):
+    z = _clip(5.0 * z, -60.0, 60.0)
+    return 0.2 * np.log(1 + np.exp(z))
+
+
+def _identity(z):
+    return np.array(z, dtype=float)
+
+
+def _clamped(z):
+    return _clip(z, -1.0, 1.0)
+
+
+def _inv(z):
+    with np.errstate(divide='ignore', over='ignore'):
+        return np.where(z == 0.0, 0.0, 1.0 / np.where(z == 0.0, 1.0, z))
+
+
+def _log(z):
+    return np.log(np.maximum(z, 1e-7))
+
+
+def _exp(z):
+    return np.exp(_clip(z, -60.0, 60.0))
+
+
+def _abs(z):
+    return np.abs(z)
+
+
+def _hat(z):
+    return np.maximum(0.0, 1 - np.abs(z))
+
+
+def _square(z):
+    return z ** 2
+
+
+def _cube(z):
+    return z ** 3
+
+
+_ACTIVATIONS = {activations.sigmoid_activation: _sigmoid,
+                activations.tanh_activation: _tanh,
+                activations.sin_activation: _sin,
+                activations.gauss_activation: _gauss,
+                activations.relu_activation: _relu,
+                activations.elu_activation: _elu,
+                activations.lelu_activation: _lelu,
+                activations.selu_activation: _selu,
+                activations.softplus_activation: _softplus,
+                activations.identity_activation: _identity,
+                activations.clamped_activation: _clamped,
+                activations.inv_activation: _inv,
+                activations.log_activation: _log,
+                activations.exp_activation: _exp,
+                activations.abs_activation: _abs,
+                activations.hat_activation: _hat,
+                activations.square_activation: _square,
+                activations.cube_activation: _cube}
+
+
+def _maxabs(x, axis=-1):
+    idx = np.expand_dims(np.argmax(np.abs(x), axis=axis), axis)
+    return np.take_along_axis(x, idx, axis).squeeze(axis)
+
+
+_AGGREGATIONS = {aggregations.product_aggregation: np.prod,
+                 aggregations.sum_aggregation: np.sum,
+                 aggregations.max_aggregation: np.max,
+                 aggregations.min_aggregation: np.min,
+                 aggregations.maxabs_aggregation: _maxabs,
+                 aggregations.median_aggregation: np.median,
+                 aggregations.mean_aggregation: np.mean}
+
+# Aggregations that can be computed for many nodes at once as a segmented
+# reduction (``ufunc.reduceat``) over the concatenated node inputs.
+_SEGMENT_REDUCTIONS = {aggregations.product_aggregation: 'multiply',
+                       aggregations.sum_aggregation: 'add',
+                       aggregations.max_aggregation: 'maximum',
+                       aggregations.min_aggregation: 'minimum',
+                       aggregations.mean_aggregation: 'add'}
+
+
+def vectorize_activation(function):
+    """
+    Returns a version of the given activation function that operates elementwise on
+    NumPy arrays. The built-in activation functions are replaced by equivalent
+    NumPy expressions; user-defined functions are applied elementwise.
+    """
+    _require_numpy()
+    f = _ACTIVATIONS.get(function)
+    if f is None:
+        f = np.vectorize(function, otypes=[float])
+    return f
+
+
+def vectorize_aggregation(function):
+    """
+    Returns a version of the given aggregation function with the signature
+    ``f(x, axis=-1)`` that reduces a NumPy array along the given axis.
+    """
+    _require_numpy()
+    f = _AGGREGATIONS.get(function)
+    if f is None:
+        def f(x, axis=-1):
+            return np.apply_along_axis(lambda v: float(function(v)), axis, x)
+    return f
+
+
+class _DenseGroup(object):
+    """Sum-aggregated nodes whose inputs are evaluated as a dense matrix product."""
+
+    def __init__(self, start, stop, links):
+        sources = sorted(set(i for node_links in links for i, w in node_links))
+        column = dict((i, n) for n, i in enumerate(sources))
+        self.start = start
+        self.stop = stop
+        self.sources = np.array(sources, dtype=np.intp)
+        self.weights = np.zeros((len(links), len(sources)))
+        for n, node_links in enumerate(links):
+            for i, w in node_links:
+                self.weights[n, column[i]] += w
+
+    def aggregate(self, values, out):
+        out[self.start:self.stop] = self.weights @ values[self.sources]
+
+
+class _SegmentGroup(object):
+    """
+    Nodes aggregated with a segmented reduction: a single ``ufunc.reduceat`` call
+    for one input row, or for a batch one reduction per distinct number of inputs,
+    over the nodes with that many inputs.
+    """
+
+    def __init__(self, start, stop, links, function):
+        self.start = start
+        self.stop = stop
+        self.sources = np.array([i for node_links in links for i, w in node_links], dtype=np.intp)
+        self.weights = np.array([[w] for node_links in links for i, w in node_links], dtype=float)
+        counts = np.array([[len(node_links)] for node_links in links], dtype=float)
+        self.offsets = np.concatenate(([0], np.cumsum(counts[:, 0], dtype=np.intp)[:-1]))
+        self.ufunc = getattr(np, _SEGMENT_REDUCTIONS[function])
+        self.counts = counts if function is aggregations.mean_aggregation else None
+
+        # reduceat along the first axis of a wide batch is much slower than reducing
+        # a (nodes x inputs x batch) block along its middle axis, which gives the
+        # same results, so nodes are grouped by their number of inputs.
+        fan_in = counts[:, 0].astype(np.intp)
+        self.fan_in_groups = []
+        for k in np.unique(fan_in).tolist():
+            nodes = np.flatnonzero(fan_in == k)
+            rows = (self.offsets[nodes][:, np.newaxis] + np.arange(k)).ravel()
+            self.fan_in_groups.append((nodes, k, self.sources[rows], self.weights[rows].reshape(len(nodes), k, 1)))
+
+    def aggregate(self, values, out):
+        if values.shape[1] == 1:
+            weighted = values[self.sources] * self.weights
+            s = self.ufunc.reduceat(weighted[:, 0], self.offsets).reshape(-1, 1)
+        else:
+            batch_size = values.shape[1]
+            s = np.empty((self.stop - self.start, batch_size))
+            for nodes, k, sources, weights in self.fan_in_groups:
+                weighted = values[sources].reshape(len(nodes), k, batch_size) * weights
+                s[nodes] = self.ufunc.reduce(weighted, axis=1)
+        if self.counts is not None:
+            s = s / self.counts
+        out[self.start:self.stop] = s
+
+
+class _GenericGroup(object):
+    """Nodes whose aggregation must be applied node by node (across the whole batch)."""
+
+    def __init__(self, start, stop, links, function):
+        self.start = start
+        self.stop = stop
+        self.links = [(np.array([i for i, w in node_links], dtype=np.intp),
+                       np.array([w for i, w in node_links], dtype=float).reshape(-1, 1))
+                      for node_links in links]
+        self.aggregation = vectorize_aggregation(function)
+
+    def aggregate(self, values, out):
+        for n, (sources, weights) in enumerate(self.links, self.start):
+            out[n] = self.aggregation(values[sources] * weights, axis=0)
+
+
+class VectorizedLayer(object):
+    """
+    Evaluation data for one layer of a `VectorizedFeedForwardNetwork`. The layer's
+    nodes occupy the contiguous value rows ``start:stop``, ordered so that nodes
+    sharing an aggregation (and activation) function are adjacent.
+    """
+
+    def __init__(self, start, stop, bias, response, aggregation_groups, activation_groups):
+        self.start = start
+        self.stop = stop
+        self.bias = bias
+        self.response = response
+        self.aggregation_groups = aggregation_groups
+        self.activation_groups = activation_groups
+
+    def evaluate(self, values):
+        """Computes this layer's rows of ``values``, a (nodes x batch) array."""
+        s = np.empty((self.stop - self.start, values.shape[1]))
+        for group in self.aggregation_groups:
+            group.aggregate(values, s)
+        z = self.bias + self.response * s
+        for act_func, a, b in self.activation_groups:
+            values[self.start + a:self.start + b] = act_func(z[a:b])
+
+    @staticmethod
+    def create(start, node_evals):
+        """
+        Builds a layer from ``(activation, aggregation, bias, response, links)`` tuples,
+        where the sources in ``links`` are already dense value indices.
+        """
+        stop = start + len(node_evals)
+        bias = np.array([[ne[2]] for ne in node_evals], dtype=float)
+        response = np.array([[ne[3]] for ne in node_evals], dtype=float)
+
+        aggregation_groups = []
+        activation_groups = []
+        for kind, a, b in _runs([ne[1] for ne in node_evals]):
+            links = [ne[4] for ne in node_evals[a:b]]
+            if kind is aggregations.sum_aggregation and _is_dense(links):
+                aggregation_groups.append(_DenseGroup(a, b, links))
+            elif kind in _SEGMENT_REDUCTIONS and all(links):
+                aggregation_groups.append(_SegmentGroup(a, b, links, kind))
+            else:
+                aggregation_groups.append(_GenericGroup(a, b, links, kind))
+
+        for kind, a, b in _runs([ne[0] for ne in node_evals]):
+            activation_groups.append((vectorize_activation(kind), a, b))
+
+        return VectorizedLayer(start, stop, bias, response, aggregation_groups, activation_groups)
+
+
+def _runs(items):
+    """Yields (item, start, stop) for each run of identical adjacent items."""
+    start = 0
+    for n in range(1, len(items) + 1):
+        if n == len(items) or items[n] is not items[start]:
+            yield items[start], start, n
+            start = n
+
+
+def as_input_batch(inputs, num_inputs):
+    """Converts ``inputs`` to an (N x num_inputs) float array, checking its shape."""
+    _require_numpy()
+    inputs = np.asarray(inputs, dtype=float)
+    if inputs.ndim != 2 or inputs.shape[1] != num_inputs:
+        raise RuntimeError("Expected an (N x {0:n}) array of inputs, got shape {1!r}".format(num_inputs, inputs.shape))
+    return inputs
+
+
+def _is_dense(links):
+    if not all(links):
+        return False
+    num_links = sum(len(node_links) for node_links in links)
+    num_sources = len(set(i for node_links in links for i, w in node_links))
+    return num_links >= DENSE_FRACTION * len(links) * num_sources
+
+
+def pack_genomes(genomes, genome_config):
+    """
+    Lays out the expressed feed-forward phenotypes of one or more genomes in a
+    single value array. All genomes share the input rows (followed by one row that
+    is always zero, used for outputs that are never computed); layer ``d`` of the
+    packed network holds layer ``d`` of every genome, so that a single set of array
+    operations per layer evaluates all of them. Because links only ever refer to
+    rows of their own genome, the packed weights form a block-diagonal structure.
+
+    Returns ``(layers, num_values, output_indices)``, where ``output_indices[n]``
+    lists the value rows of the outputs of ``genomes[n]``.
+    """
+    _require_numpy()
+    input_keys = genome_config.input_keys
+    output_keys = genome_config.output_keys
+    zero_row = len(input_keys)
+
+    genome_layers = []
+    genome_inputs = []
+    for genome in genomes:
+        # Gather expressed connections, grouped by their output node.
+        connections = []
+        node_inputs = {}
+        for cg in genome.connections.values():
+            if cg.enabled:
+                connections.append(cg.key)
+                node_inputs.setdefault(cg.key[1], []).append((cg.key[0], cg.weight))
+        genome_layers.append(feed_forward_layers(input_keys, output_keys, connections))
+        genome_inputs.append(node_inputs)
+
+    # Each genome's node keys are mapped to rows through its own index.
+    indexes = [dict((k, n) for n, k in enumerate(input_keys)) for _ in genome_layers]
+    num_values = zero_row + 1
+    vector_layers = []
+    for depth in range(max([len(layers) for layers in genome_layers], default=0)):
+        node_evals = []
+        for n, layers in enumerate(genome_layers):
+            if depth >= len(layers):
+                continue
+            for node in layers[depth]:
+                ng = genomes[n].nodes[node]
+                node_evals.append((ng.aggregation, ng.activation, n, node, ng))
+        node_evals.sort(key=lambda ne: ne[:4])
+
+        start = num_values
+        for ignored_agg, ignored_act, n, node, ignored_ng in node_evals:
+            indexes[n][node] = num_values
+            num_values += 1
+        node_evals = [(genome_config.activation_defs.get(ng.activation),
+                       genome_config.aggregation_function_defs.get(ng.aggregation),
+                       ng.bias, ng.response, [(indexes[n][i], w) for i, w in genome_inputs[n][node]])
+                      for ignored_agg, ignored_act, n, node, ng in node_evals]
+        vector_layers.append(VectorizedLayer.create(start, node_evals))
+
+    output_indices = [[index.get(k, zero_row) for k in output_keys] for index in indexes]
+    return vector_layers, num_values, output_indices
+
+
+class VectorizedFeedForwardNetwork(object):
+    """
+    A feed-forward network whose node values are stored in a dense NumPy array,
+    and whose layers (as computed by `neat.graphs.feed_forward_layers`) are each
+    evaluated with a handful of array operations.
+
+    Node values are held as a (nodes x batch) array, so that single activations
+    and batches of input vectors share the same code path.
+    """
+
+    def __init__(self, inputs, outputs, layers, num_values, output_indices):
+        _require_numpy()
+        self.input_nodes = inputs
+        self.output_nodes = outputs
+        self.layers = layers
+        self.output_indices = np.array(output_indices, dtype=np.intp)
+        self.values = np.zeros((num_values, 1))
+
+    def activate(self, inputs):
+        if len(self.input_nodes) != len(inputs):
+            raise RuntimeError("Expected {0:n} inputs, got {1:n}".format(len(self.input_nodes), len(inputs)))
+
+        self.values[:len(self.input_nodes), 0] = inputs
+        for layer in self.layers:
+            layer.evaluate(self.values)
+
+        return self.values[self.output_indices, 0].tolist()
+
+    def activate_batch(self, inputs):
+        """
+        Feeds each row of the (N x num_inputs) array ``inputs`` through the network,
+        and returns the corresponding (N x num_outputs) array of outputs.
+        """
+        inputs = as_input_batch(inputs, len(self.input_nodes))
+        outputs = np.empty((inputs.shape[0],) + self.output_indices.shape)
+        for start, values in self.evaluate_chunks(inputs):
+            outputs[start:start + values.shape[1]] = np.moveaxis(values[self.output_indices], -1, 0)
+
+        return outputs
+
+    def evaluate_chunks(self, inputs):
+        """
+        Evaluates an (N x num_inputs) array of inputs in chunks of rows, yielding
+        ``(start, values)`` with the (nodes x chunk) value array of each chunk.
+        """
+        num_values = self.values.shape[0]
+        chunk_size = max(1, min(BATCH_CHUNK_SIZE, BATCH_VALUES_LIMIT // num_values))
+        for start in range(0, inputs.shape[0], chunk_size):
+            chunk = inputs[start:start + chunk_size]
+            values = np.zeros((num_values, chunk.shape[0]))
+            values[:len(self.input_nodes)] = chunk.T
+            for layer in self.layers:
+                layer.evaluate(values)
+            yield start, values
+
+    @staticmethod
+    def create(genome, config):
+        """ Receives a genome and returns its phenotype (a VectorizedFeedForwardNetwork). """
+        genome_config = config.genome_config
+        layers, num_values, output_indices = pack_genomes([genome], genome_config)
+        return VectorizedFeedForwardNetwork(genome_config.input_keys, genome_config.output_keys,
+                                            layers, num_values, output_indices[0])
+
+
+class VectorizedPopulationNetwork(VectorizedFeedForwardNetwork):
+    """
+    The feed-forward phenotypes of many genomes (for example a whole population, or
+    one chunk of it) packed into one block-diagonal network by `pack_genomes`, so
+    that a shared batch of inputs is pushed through every genome at once.
+
+    A fitness function for a supervised task might look like::
+
+        net = VectorizedPopulationNetwork.create([g for gid, g in genomes], config)
+        outputs = net.activate_batch(xs)  # shape (len(genomes), len(xs), num_outputs)
+        errors = ((outputs - ys) ** 2).sum(axis=(1, 2))
+        for (gid, g), error in zip(genomes, errors):
+            g.fitness = -error
+    """
+
+    def __init__(self, inputs, outputs, layers, num_values, output_indices, genome_keys):
+        VectorizedFeedForwardNetwork.__init__(self, inputs, outputs, layers, num_values, output_indices)
+        self.genome_keys = genome_keys
+
+    def activate(self, inputs):
+        """Returns a (genomes x num_outputs) array of the outputs of every genome."""
+        return self.activate_batch([inputs])[:, 0, :]
+
+    def activate_batch(self, inputs):
+        """
+        Feeds each row of the (N x num_inputs) array ``inputs`` through every genome,
+        and returns a (genomes x N x num_outputs) array of outputs.
+        """
+        return np.moveaxis(VectorizedFeedForwardNetwork.activate_batch(self, inputs), 0, 1)
+
+    @staticmethod
+    def create(genomes, config):
+        """ Receives a list of genomes and returns their packed phenotype (a VectorizedPopulationNetwork). """
+        genomes = list(genomes)
+        genome_config = config.genome_config
+        layers, num_values, output_indices = pack_genomes(genomes, genome_config)
+        output_indices = np.array(output_indices, dtype=np.intp).reshape(len(genomes), len(genome_config.output_keys))
+        return VectorizedPopulationNetwork(genome_config.input_keys, genome_config.output_keys, layers,
+                                           num_values, output_indices, [g.key for g in genomes])
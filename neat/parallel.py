@@ -2,29 +2,138 @@
 Runs evaluation functions in parallel subprocesses
 in order to evaluate multiple genomes at once.
 """
+import os
+import pickle
+import time
 from multiprocessing import Pool
 
+_worker_eval_function = None
+_worker_config = None
+_worker_version = None
+
+
+def _init_worker(eval_function, config, version):
+    global _worker_eval_function, _worker_config, _worker_version
+    _worker_eval_function = eval_function
+    _worker_config = config
+    _worker_version = version
+
+
+def _evaluate_chunk(task):
+    global _worker_config, _worker_version
+    version, config, genomes = task
+    if config is not None:
+        _worker_config = config
+        _worker_version = version
+    elif version != _worker_version:
+        # The chunk is sent again with the current configuration.
+        return None
+    start = time.perf_counter()
+    fitnesses = [_worker_eval_function(genome, _worker_config) for genome in genomes]
+    return fitnesses, time.perf_counter() - start
+
 
 class ParallelEvaluator(object):
-    def __init__(self, num_workers, eval_function, timeout=None, maxtasksperchild=None):
+    # Chunks are made small enough to take about this long (in seconds), once the
+    # time per genome is known, so that no worker is left with much more work than
+    # the others at the end.
+    target_chunk_time = 0.1
+    # Chunks are also kept to about this many bytes when pickled; larger messages
+    # cost more to pass through the pipes to the workers than they save in tasks.
+    target_chunk_bytes = 16384
+
+    def __init__(self, num_workers, eval_function, timeout=None, maxtasksperchild=None, chunk_size=None):
         """
         eval_function should take one argument, a tuple of (genome object, config object),
         and return a single float (the genome's fitness).
+
+        The worker processes are started on the first evaluation, each given the
+        eval_function and the configuration once. If a different configuration
+        object is passed, it is sent to each worker with the first chunk the
+        worker gets for it (a worker that still has an older one returns the
+        chunk unevaluated, and it is sent again with the configuration). Changes
+        made in place to the same configuration object are not seen by the
+        workers; pass a new one (such as a copy), or call close() first. Genomes
+        are sent in chunks of chunk_size or, if it is None, of a size adapted to
+        the number of genomes and the time they take to evaluate.
+
+        num_workers may be None for one worker per CPU. The timeout is per genome:
+        each chunk is given timeout times its number of genomes.
         """
+        self.num_workers = num_workers if num_workers is not None else os.cpu_count() or 1
         self.eval_function = eval_function
         self.timeout = timeout
-        self.pool = Pool(processes=num_workers, maxtasksperchild=maxtasksperchild)
+        self.maxtasksperchild = maxtasksperchild
+        self.chunk_size = chunk_size
+        self.pool = None
+        self.config = None
+        # Incremented whenever a new configuration is passed; sent with each chunk.
+        self.config_version = 0
+        # Average evaluation time per genome, measured in the workers.
+        self.genome_time = None
+        # Pickled size of a genome from the last evaluation.
+        self.genome_bytes = None
 
     def __del__(self):
-        self.pool.close()
-        self.pool.join()
-        self.pool.terminate()
+        self.close()
+
+    def close(self):
+        """Shuts down the worker processes, if any were started."""
+        if getattr(self, 'pool', None) is not None:
+            self.pool.close()
+            self.pool.join()
+            self.pool.terminate()
+            self.pool = None
+            self.config = None
+
+    def get_chunk_size(self, num_genomes):
+        """Returns the number of genomes to send to a worker at once."""
+        if self.chunk_size is not None:
+            return self.chunk_size
+        # A few chunks per worker, to even out their loads.
+        size = max(1, -(-num_genomes // (4 * self.num_workers)))
+        if self.genome_time:
+            size = min(size, max(1, int(self.target_chunk_time / self.genome_time)))
+        if self.genome_bytes:
+            size = min(size, max(1, self.target_chunk_bytes // self.genome_bytes))
+        return size
+
+    def get_chunk_timeout(self, chunk):
+        """Returns how long to wait for a chunk of genomes (None for no limit)."""
+        if self.timeout is None:
+            return None
+        return self.timeout * len(chunk)
 
     def evaluate(self, genomes, config):
-        jobs = []
-        for ignored_genome_id, genome in genomes:
-            jobs.append(self.pool.apply_async(self.eval_function, (genome, config)))
+        if self.pool is None:
+            self.config_version += 1
+            self.pool = Pool(processes=self.num_workers, maxtasksperchild=self.maxtasksperchild,
+                             initializer=_init_worker, initargs=(self.eval_function, config, self.config_version))
+            self.config = config
+        elif self.config is not config:
+            # The workers are given the new configuration when they next need it.
+            self.config_version += 1
+            self.config = config
+
+        if genomes and self.chunk_size is None:
+            self.genome_bytes = len(pickle.dumps(genomes[0][1], pickle.HIGHEST_PROTOCOL))
+        chunk_size = self.get_chunk_size(len(genomes))
+        chunks = [[genome for ignored_genome_id, genome in genomes[i:i + chunk_size]]
+                  for i in range(0, len(genomes), chunk_size)]
+        jobs = [self.pool.apply_async(_evaluate_chunk, ((self.config_version, None, chunk),)) for chunk in chunks]
+        results = [job.get(timeout=self.get_chunk_timeout(chunk)) for job, chunk in zip(jobs, chunks)]
+
+        # Send the chunks that went to workers with an older configuration again, with this one.
+        stale = [i for i, result in enumerate(results) if result is None]
+        jobs = [self.pool.apply_async(_evaluate_chunk, ((self.config_version, config, chunks[i]),)) for i in stale]
+        for i, job in zip(stale, jobs):
+            results[i] = job.get(timeout=self.get_chunk_timeout(chunks[i]))
 
         # assign the fitness back to each genome
-        for job, (ignored_genome_id, genome) in zip(jobs, genomes):
-            genome.fitness = job.get(timeout=self.timeout)
+        total_time = 0.0
+        for (fitnesses, elapsed), chunk in zip(results, chunks):
+            total_time += elapsed
+            for genome, fitness in zip(chunk, fitnesses):
+                genome.fitness = fitness
+        if genomes:
+            self.genome_time = total_time / len(genomes)
@@ -1,4 +1,5 @@
 """Implements the core evolution algorithm."""
+import threading
 
 from neat.math_util import mean
 from neat.reporting import ReporterSet
@@ -8,6 +9,30 @@ class CompleteExtinctionException(Exception):
     pass
 
 
+class BackgroundEvaluation(object):
+    """Runs a fitness function on a thread, so the caller can do other work meanwhile."""
+
+    def __init__(self, fitness_function, genomes, config):
+        self.fitness_function = fitness_function
+        self.genomes = genomes
+        self.config = config
+        self.error = None
+        self.thread = threading.Thread(target=self._evaluate, name='NEAT-evaluation', daemon=True)
+        self.thread.start()
+
+    def _evaluate(self):
+        try:
+            self.fitness_function(self.genomes, self.config)
+        except BaseException as e:  # pylint: disable=broad-except
+            self.error = e
+
+    def wait(self):
+        """Waits for the fitness function to return, and raises any exception it raised."""
+        self.thread.join()
+        if self.error is not None:
+            raise self.error
+
+
 class Population(object):
     """
     This class implements the core evolution algorithm:
@@ -54,11 +79,21 @@ class Population(object):
     def remove_reporter(self, reporter):
         self.reporters.remove(reporter)
 
-    def run(self, fitness_function, n=None):
+    def run(self, fitness_function, n=None, pipelined=False):
         """
         Runs NEAT's genetic algorithm for at most n generations.  If n
         is None, run until solution is found or extinction occurs.
 
+        If pipelined is True, each new generation is evaluated on a background
+        thread while it is divided into species (which does not need fitness),
+        hiding that time behind the evaluation if the fitness function mostly
+        waits on other processes, as `ParallelEvaluator` and `DistributedEvaluator`
+        do. The evaluation is finished before the end of the generation is
+        reported, so reporters (such as `Checkpointer`) never see genomes whose
+        fitness is being assigned; they see the new generation with its fitness.
+        The results are the same as without pipelining, unless the fitness
+        function uses the random module in the main process.
+
         The user-provided fitness_function must take only two arguments:
             1. The population as a list of (genome id, genome) tuples.
             2. The current configuration object.
@@ -78,13 +113,17 @@ class Population(object):
             raise RuntimeError("Cannot have no generational limit with no fitness termination")
 
         k = 0
+        evaluation = None
         while n is None or k < n:
             k += 1
 
             self.reporters.start_generation(self.generation)
 
-            # Evaluate all genomes using the user-provided function.
-            fitness_function(list(self.population.items()), self.config)
+            # Evaluate all genomes using the user-provided function, unless
+            # that was already done during the last generation's speciation.
+            if evaluation is None:
+                fitness_function(list(self.population.items()), self.config)
+            evaluation = None
 
             # Gather and report statistics.
             best = None
@@ -124,9 +163,17 @@ class Population(object):
                 else:
                     raise CompleteExtinctionException()
 
+            if pipelined and (n is None or k < n):
+                # Start evaluating the new population while it is divided into species.
+                evaluation = BackgroundEvaluation(fitness_function, list(self.population.items()), self.config)
+
             # Divide the new population into species.
             self.species.speciate(self.config, self.population, self.generation)
 
+            if evaluation is not None:
+                # The reporters may save or inspect the genomes, which must not change meanwhile.
+                evaluation.wait()
+
             self.reporters.end_generation(self.config, self.population, self.species)
 
             self.generation += 1
@@ -6,6 +6,7 @@ asexual reproduction from parents.
 import math
 import random
 from itertools import count
+from multiprocessing import Pool
 
 from neat.config import ConfigParameter, DefaultClassConfig
 from neat.math_util import mean
@@ -170,20 +171,258 @@ class DefaultReproduction(DefaultClassConfig):
             old_members = old_members[:repro_cutoff]
 
             # Randomly choose parents and produce the number of offspring allotted to the species.
-            while spawn > 0:
-                spawn -= 1
+            new_population.update(self.create_offspring(config, old_members, spawn))
+
+        return new_population
+
+    def create_offspring(self, config, parents, num_offspring):
+        """
+        Returns a dict of ``num_offspring`` new genomes, each made by crossover from
+        two parents chosen at random from the list of ``(genome_id, genome)`` pairs
+        in ``parents`` and then mutated.
+        """
+        offspring = {}
+        while num_offspring > 0:
+            num_offspring -= 1
+
+            parent1_id, parent1 = random.choice(parents)
+            parent2_id, parent2 = random.choice(parents)
+
+            # Note that if the parents are not distinct, crossover will produce a
+            # genetically identical clone of the parent (but with a different ID).
+            gid = next(self.genome_indexer)
+            child = config.genome_type(gid)
+            child.configure_crossover(parent1, parent2, config.genome_config)
+            child.mutate(config.genome_config)
+            # TODO: if config.genome_config.feed_forward, no cycles should exist
+            offspring[gid] = child
+            self.ancestors[gid] = (parent1_id, parent2_id)
+
+        return offspring
+
+
+class BatchReproduction(DefaultReproduction):
+    """
+    The default reproduction scheme, but creating all the offspring of the
+    population together: the parents for each species are drawn at once, and
+    genome classes that provide ``configure_crossover_batch`` and ``mutate_batch``
+    (such as `DefaultGenome`) combine and mutate the attributes of all the
+    offspring's genes in bulk, leaving only structural mutation to be done one
+    genome at a time. Other genome classes are crossed over and mutated one genome
+    at a time. The offspring have the same distribution as with
+    `DefaultReproduction`, although not the same genomes for a given random seed.
+    """
+
+    def __init__(self, config, reporters, stagnation):
+        DefaultReproduction.__init__(self, config, reporters, stagnation)
+        self.pending = None
+
+    def reproduce(self, config, species, pop_size, generation):
+        # create_offspring only creates the children and chooses their parents;
+        # they are all crossed over and mutated at the end.
+        self.pending = ([], [])
+        try:
+            new_population = DefaultReproduction.reproduce(self, config, species, pop_size, generation)
+            children, parents = self.pending
+        finally:
+            self.pending = None
+        self.breed(config, children, parents)
+        return new_population
+
+    def create_offspring(self, config, parents, num_offspring):
+        # Outside reproduce(), the offspring are bred straight away.
+        children, parent_genomes = pending = self.pending if self.pending is not None else ([], [])
+        chosen = random.choices(parents, k=2 * num_offspring)
+        offspring = {}
+        for i in range(num_offspring):
+            (parent1_id, parent1), (parent2_id, parent2) = chosen[2 * i], chosen[2 * i + 1]
+            gid = next(self.genome_indexer)
+            child = config.genome_type(gid)
+            offspring[gid] = child
+            self.ancestors[gid] = (parent1_id, parent2_id)
+            children.append(child)
+            parent_genomes.append((parent1, parent2))
+
+        if pending is not self.pending:
+            self.breed(config, children, parent_genomes)
+        return offspring
+
+    @staticmethod
+    def breed(config, children, parents):
+        """
+        Configures each of the new genomes in ``children`` by crossover from the
+        corresponding ``(parent1, parent2)`` pair in ``parents``, then mutates them.
+        """
+        genome_type = config.genome_type
+        genome_config = config.genome_config
+        if hasattr(genome_type, 'configure_crossover_batch'):
+            genome_type.configure_crossover_batch(children, parents, genome_config)
+        else:
+            for child, (parent1, parent2) in zip(children, parents):
+                child.configure_crossover(parent1, parent2, genome_config)
+
+        if hasattr(genome_type, 'mutate_batch'):
+            genome_type.mutate_batch(children, genome_config)
+        else:
+            for child in children:
+                child.mutate(genome_config)
+
+
+def breed_offspring(config, seed, first_node_key, parents, pairs):
+    """
+    Creates an offspring for each ``(genome_id, i, j)`` triple in ``pairs`` by
+    crossover from ``parents[i]`` and ``parents[j]`` followed by mutation, after
+    seeding the `random` module with ``seed`` and numbering any new nodes from
+    ``first_node_key``. Returns the list of offspring and the next unused node key.
+    """
+    random.seed(seed)
+    genome_config = config.genome_config
+    genome_config.node_indexer = count(first_node_key)
+    offspring = []
+    for gid, i, j in pairs:
+        child = config.genome_type(gid)
+        child.configure_crossover(parents[i], parents[j], genome_config)
+        child.mutate(genome_config)
+        offspring.append(child)
+    return offspring, next(genome_config.node_indexer)
 
-                parent1_id, parent1 = random.choice(old_members)
-                parent2_id, parent2 = random.choice(old_members)
 
-                # Note that if the parents are not distinct, crossover will produce a
-                # genetically identical clone of the parent (but with a different ID).
+_worker_config = None
+
+
+def _init_worker(config):
+    global _worker_config
+    _worker_config = config
+
+
+def _breed_in_worker(task):
+    return breed_offspring(_worker_config, *task)
+
+
+class ParallelReproduction(DefaultReproduction):
+    """
+    The default reproduction scheme, but with the crossover and mutation of the
+    offspring spread over a pool of worker processes. Parents and genome keys are
+    chosen, and ancestors recorded, in the main process; the offspring are then
+    bred in chunks of at most ``chunk_size`` genomes, each chunk with its own
+    random seed and its own range of new node keys, so a run gives the same
+    genomes for a given random seed whatever the number of workers.
+    """
+
+    @classmethod
+    def parse_config(cls, param_dict):
+        return DefaultClassConfig(param_dict,
+                                  [ConfigParameter('elitism', int, 0),
+                                   ConfigParameter('survival_threshold', float, 0.2),
+                                   ConfigParameter('min_species_size', int, 1),
+                                   ConfigParameter('num_workers', int, 0),
+                                   ConfigParameter('chunk_size', int, 100)])
+
+    def __init__(self, config, reporters, stagnation):
+        DefaultReproduction.__init__(self, config, reporters, stagnation)
+        self.pending = None
+        self.pool = None
+        self.pool_config = None
+
+    def __del__(self):
+        self.close()
+
+    def close(self):
+        """Shuts down the worker processes, if any were started."""
+        if self.pool is not None:
+            self.pool.terminate()
+            self.pool.join()
+            self.pool = None
+            self.pool_config = None
+
+    def reproduce(self, config, species, pop_size, generation):
+        # create_offspring only chooses the parents; all the offspring are bred at the end.
+        self.pending = []
+        try:
+            new_population = DefaultReproduction.reproduce(self, config, species, pop_size, generation)
+            tasks = self.pending
+        finally:
+            self.pending = None
+        for child in self.breed(config, tasks):
+            new_population[child.key] = child
+        return new_population
+
+    def create_offspring(self, config, parents, num_offspring):
+        tasks = self.pending if self.pending is not None else []
+        chunk_size = max(1, self.reproduction_config.chunk_size)
+        offspring = {}
+        while num_offspring > 0:
+            # Only send each chunk the parents it uses.
+            chunk_parents = []
+            indices = {}
+            pairs = []
+            for ignored in range(min(num_offspring, chunk_size)):
+                parent1_id, parent1 = random.choice(parents)
+                parent2_id, parent2 = random.choice(parents)
+                i = indices.setdefault(parent1_id, len(indices))
+                if i == len(chunk_parents):
+                    chunk_parents.append(parent1)
+                j = indices.setdefault(parent2_id, len(indices))
+                if j == len(chunk_parents):
+                    chunk_parents.append(parent2)
+
                 gid = next(self.genome_indexer)
-                child = config.genome_type(gid)
-                child.configure_crossover(parent1, parent2, config.genome_config)
-                child.mutate(config.genome_config)
-                # TODO: if config.genome_config.feed_forward, no cycles should exist
-                new_population[gid] = child
+                pairs.append((gid, i, j))
+                offspring[gid] = None
                 self.ancestors[gid] = (parent1_id, parent2_id)
+            tasks.append((random.getrandbits(64), chunk_parents, pairs))
+            num_offspring -= len(pairs)
 
-        return new_population
+        if tasks is not self.pending:
+            for child in self.breed(config, tasks):
+                offspring[child.key] = child
+        return offspring
+
+    def breed(self, config, tasks):
+        """
+        Breeds the offspring for a list of ``(seed, parents, pairs)`` tasks with
+        `breed_offspring`, in the worker processes unless ``num_workers`` is 1,
+        giving each task a separate range of node keys. Returns a list of the
+        offspring, in order.
+        """
+        if not tasks:
+            return []
+
+        # Structural mutation adds at most one node to a genome, so each task can
+        # be given as many node keys as it has offspring.
+        genome_config = config.genome_config
+        if genome_config.node_indexer is None:
+            next_node_key = max(k for _, parents, _ in tasks for p in parents for k in p.nodes) + 1
+        else:
+            next_node_key = next(genome_config.node_indexer)
+        node_keys = []
+        for seed, parents, pairs in tasks:
+            node_keys.append(next_node_key)
+            next_node_key += len(pairs)
+        tasks = [(seed, first_node_key, parents, pairs)
+                 for first_node_key, (seed, parents, pairs) in zip(node_keys, tasks)]
+
+        if self.reproduction_config.num_workers == 1:
+            # Breed in this process, without disturbing its random state.
+            state = random.getstate()
+            try:
+                results = [breed_offspring(config, *task) for task in tasks]
+            finally:
+                random.setstate(state)
+        else:
+            if self.pool is None or self.pool_config is not config:
+                self.close()
+                self.pool = Pool(processes=self.reproduction_config.num_workers or None,
+                                 initializer=_init_worker, initargs=(config,))
+                self.pool_config = config
+            results = self.pool.map(_breed_in_worker, tasks)
+
+        offspring = []
+        end_node_key = node_keys[0]
+        for (seed, first_node_key, parents, pairs), (children, node_key) in zip(tasks, results):
+            if node_key > first_node_key + len(pairs):
+                raise RuntimeError("ParallelReproduction requires mutation to add at most one node per genome")
+            end_node_key = max(end_node_key, node_key)
+            offspring.extend(children)
+        genome_config.node_indexer = count(end_node_key)
+        return offspring
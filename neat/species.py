@@ -1,8 +1,13 @@
 """Divides the population into species based on genomic distances."""
+import inspect
+import os
+import time
+from collections import OrderedDict
 from itertools import count
+from multiprocessing import Pool
 
 from neat.config import ConfigParameter, DefaultClassConfig
-from neat.math_util import mean, stdev
+from neat.math_util import RunningStats
 
 
 class Species(object):
@@ -24,28 +29,214 @@ class Species(object):
         return [m.fitness for m in self.members.values()]
 
 
+# Genomes with at least this many genes have their distances computed from
+# DistanceArrays; for smaller ones the NumPy call overhead outweighs the gain.
+DISTANCE_ARRAYS_MIN_GENES = 200
+
+
 class GenomeDistanceCache(object):
-    def __init__(self, config):
-        self.distances = {}
+    """
+    Memoizes genomic distances, keyed by the pair of genome keys in increasing order.
+    At most ``max_entries`` values (distances and lower bounds) are kept if it is
+    not None; the least recently used are discarded first. The running mean and
+    variance of the distances computed in full are kept in ``statistics``, and the
+    number of pairs for which only a lower bound was found in ``bounded``.
+    """
+
+    def __init__(self, config, max_entries=None):
+        self.distances = OrderedDict()
         self.config = config
+        self.max_entries = max_entries
         self.hits = 0
         self.misses = 0
+        self.evictions = 0
+        # The most values stored at once.
+        self.peak_entries = 0
+        self.statistics = RunningStats()
+        self.bounded = 0
+        # Values returned for a bound that may be less than the distance.
+        self.lower_bounds = OrderedDict()
+        # The distance_arrays() of each genome seen, or None if it is not used.
+        self.arrays = {}
+        # Whether each genome type's distance method takes a bound.
+        self.bound_types = {}
+
+    def get_arrays(self, genome):
+        try:
+            return self.arrays[genome.key]
+        except KeyError:
+            arrays = None
+            if (hasattr(genome, 'distance_arrays') and
+                    len(genome.nodes) + len(genome.connections) >= DISTANCE_ARRAYS_MIN_GENES):
+                arrays = genome.distance_arrays(self.config)
+            self.arrays[genome.key] = arrays
+            return arrays
 
-    def __call__(self, genome0, genome1):
+    def accepts_bound(self, genome):
+        """Returns whether the genome's distance method takes a ``bound`` argument."""
+        genome_type = type(genome)
+        accepts = self.bound_types.get(genome_type)
+        if accepts is None:
+            accepts = 'bound' in inspect.signature(genome_type.distance).parameters
+            self.bound_types[genome_type] = accepts
+        return accepts
+
+    def __len__(self):
+        """Returns the number of values (distances and lower bounds) stored."""
+        return len(self.distances) + len(self.lower_bounds)
+
+    def clear(self):
+        """Discards the stored values, keeping the counts and statistics."""
+        self.distances.clear()
+        self.lower_bounds.clear()
+        self.arrays.clear()
+
+    def __call__(self, genome0, genome1, bound=None):
+        """
+        Returns the distance between the genomes. If a ``bound`` is given, and the
+        genomes' distance method takes one, the value may instead be between ``bound``
+        and the distance, once the distance is known to be at least ``bound``.
+        """
         g0 = genome0.key
         g1 = genome1.key
-        d = self.distances.get((g0, g1))
-        if d is None:
-            # Distance is not already computed.
-            d = genome0.distance(genome1, self.config)
-            self.distances[g0, g1] = d
-            self.distances[g1, g0] = d
-            self.misses += 1
-        else:
+        pair = (g0, g1) if g0 <= g1 else (g1, g0)
+        d = self.distances.get(pair)
+        if d is not None:
             self.hits += 1
+            if self.max_entries is not None:
+                self.distances.move_to_end(pair)
+            return d
+
+        if bound is not None:
+            d = self.lower_bounds.get(pair)
+            if d is not None and d >= bound:
+                self.hits += 1
+                if self.max_entries is not None:
+                    self.lower_bounds.move_to_end(pair)
+                return d
+            if not self.accepts_bound(genome0):
+                bound = None
 
+        # Distance is not already computed.
+        arrays0 = self.get_arrays(genome0)
+        arrays1 = self.get_arrays(genome1) if arrays0 is not None else None
+        if arrays1 is not None:
+            d = arrays0.distance(arrays1, self.config, bound)
+        elif bound is not None:
+            d = genome0.distance(genome1, self.config, bound)
+        else:
+            d = genome0.distance(genome1, self.config)
+        self.misses += 1
+        self.store(genome0, genome1, d, bound)
         return d
 
+    def store(self, genome0, genome1, d, bound=None):
+        """Records the value ``d`` returned for the given ``bound`` by the distance between the genomes."""
+        g0 = genome0.key
+        g1 = genome1.key
+        pair = (g0, g1) if g0 <= g1 else (g1, g0)
+        if bound is None or d < bound:
+            if pair not in self.distances:
+                self.statistics.add(d)
+            self.distances[pair] = d
+            if self.lower_bounds.pop(pair, None) is not None:
+                self.bounded -= 1
+        else:
+            if pair not in self.lower_bounds:
+                self.bounded += 1
+            self.lower_bounds[pair] = d
+
+        size = len(self.distances) + len(self.lower_bounds)
+        if self.max_entries is not None:
+            # Lower bounds are less often reused, so they are discarded first.
+            while size > self.max_entries:
+                if self.lower_bounds:
+                    self.lower_bounds.popitem(last=False)
+                else:
+                    self.distances.popitem(last=False)
+                self.evictions += 1
+                size -= 1
+        if size > self.peak_entries:
+            self.peak_entries = size
+
+
+class RepresentativeIndex(object):
+    """
+    Finds the nearest species representative to a genome, among those closer than a
+    bound, in the same way as comparing it with every representative in the order
+    they were added, but using the triangle inequality to skip representatives that
+    cannot be closer than the best so far: the distances from a few pivot
+    representatives to every representative are kept, and for a genome at distance
+    d from a pivot, a representative at distance r from it is at least ``|d - r|``
+    away. With no pivots, every representative is compared. Pivots give the same
+    result only if the distance is a metric, which the default genomic distance is
+    not: a representative may be skipped wrongly without any distance computed
+    showing it. If one does show the triangle inequality does not hold, the index
+    falls back to comparing every representative.
+    """
+
+    def __init__(self, distances, num_pivots):
+        self.distances = distances
+        self.num_pivots = num_pivots
+        self.pivots = []
+        # (species key, representative, distance from each pivot) of each representative.
+        self.entries = []
+        self.metric = True
+        self.computed = 0
+        self.pruned = 0
+
+    def add(self, sid, representative):
+        """Adds the representative of species ``sid``; the first ones added become the pivots."""
+        from_pivots = [self.distances(p, representative) for p in self.pivots]
+        self.computed += len(from_pivots)
+        self.entries.append((sid, representative, from_pivots))
+        if len(self.pivots) < self.num_pivots:
+            self.pivots.append(representative)
+            for ignored_sid, r, from_pivots in self.entries:
+                from_pivots.append(self.distances(representative, r) if r is not representative else 0.0)
+                self.computed += r is not representative
+
+    def nearest(self, genome, bound):
+        """Returns the key of the species whose representative is nearest the genome, if any is closer than ``bound``."""
+        to_pivots = []
+        if self.metric:
+            to_pivots = [self.distances(p, genome) for p in self.pivots]
+            self.computed += len(to_pivots)
+
+        sid, best = None, bound
+        for entry_sid, r, from_pivots in self.entries:
+            lower = 0.0
+            if to_pivots:
+                lower = max(abs(a - b) for a, b in zip(to_pivots, from_pivots))
+                if lower >= best:
+                    self.pruned += 1
+                    continue
+
+            d = self.distances(r, genome, best)
+            self.computed += 1
+            if d < best:
+                if d < lower - 1e-9 * (1.0 + lower):
+                    # Not a metric: representatives may have been skipped wrongly.
+                    self.metric = False
+                    return self.nearest(genome, bound)
+                sid, best = entry_sid, d
+
+        return sid
+
+
+_worker_config = None
+
+
+def _init_worker(genome_config):
+    global _worker_config
+    _worker_config = genome_config
+
+
+def _distances_in_worker(task):
+    representatives, genomes, bound = task
+    distances = GenomeDistanceCache(_worker_config)
+    return [[distances(r, g, bound) for r in representatives] for g in genomes]
+
 
 class DefaultSpeciesSet(DefaultClassConfig):
     """ Encapsulates the default speciation scheme. """
@@ -57,11 +248,91 @@ class DefaultSpeciesSet(DefaultClassConfig):
         self.indexer = count(1)
         self.species = {}
         self.genome_to_species = {}
+        self.pool = None
+        self.pool_config = None
+        # The GenomeDistanceCache of the last speciation, emptied afterwards.
+        self.distance_cache = None
+        # The threshold for the next speciation; adjusted if target_num_species is set.
+        self.compatibility_threshold = None
+
+    def __getstate__(self):
+        # Worker processes cannot be pickled; they are started again when needed.
+        state = self.__dict__.copy()
+        state['pool'] = None
+        state['pool_config'] = None
+        return state
+
+    def __del__(self):
+        self.close()
+
+    def close(self):
+        """Shuts down the worker processes, if any were started."""
+        if getattr(self, 'pool', None) is not None:
+            self.pool.terminate()
+            self.pool.join()
+            self.pool = None
+            self.pool_config = None
 
     @classmethod
     def parse_config(cls, param_dict):
-        return DefaultClassConfig(param_dict,
-                                  [ConfigParameter('compatibility_threshold', float)])
+        config = DefaultClassConfig(param_dict,
+                                    [ConfigParameter('compatibility_threshold', float),
+                                     ConfigParameter('num_workers', int, 1),
+                                     ConfigParameter('num_pivots', int, 0),
+                                     ConfigParameter('distance_is_metric', bool, False),
+                                     ConfigParameter('distance_cache_size', int, 0),
+                                     ConfigParameter('target_num_species', int, 0),
+                                     ConfigParameter('threshold_adjust_gain', float, 0.1),
+                                     ConfigParameter('min_compatibility_threshold', float, 0.1),
+                                     ConfigParameter('max_compatibility_threshold', float, 100.0)])
+        if config.target_num_species > 0 and not (
+                0.0 < config.min_compatibility_threshold <= config.max_compatibility_threshold):
+            raise RuntimeError("Invalid compatibility threshold bounds: {0!r} to {1!r}".format(
+                config.min_compatibility_threshold, config.max_compatibility_threshold))
+        if config.num_pivots > 0 and not config.distance_is_metric:
+            raise RuntimeError("num_pivots needs distance_is_metric = True (the genomic distance must be a metric)")
+        return config
+
+    def adjust_compatibility_threshold(self):
+        """
+        Moves the compatibility threshold for the next speciation toward giving
+        ``target_num_species`` species: it is scaled up by ``threshold_adjust_gain``
+        times the relative excess of species, or down by that times the relative
+        shortfall, within the configured bounds.
+        """
+        config = self.species_set_config
+        target = config.target_num_species
+        error = (len(self.species) - target) / float(target)
+        threshold = self.compatibility_threshold * (1.0 + config.threshold_adjust_gain * error)
+        self.compatibility_threshold = min(config.max_compatibility_threshold,
+                                           max(config.min_compatibility_threshold, threshold))
+
+    def compute_distances(self, distances, genome_config, representatives, genomes, bound=None):
+        """
+        Computes the distance from each of the ``representatives`` to each of the
+        ``genomes`` (with the given ``bound``) in the worker processes, and records
+        them in the `GenomeDistanceCache` ``distances``. Returns the number of
+        distances computed.
+        """
+        if not representatives or not genomes:
+            return 0
+
+        num_workers = self.species_set_config.num_workers or os.cpu_count() or 1
+        if self.pool is None or self.pool_config is not genome_config:
+            self.close()
+            self.pool = Pool(processes=num_workers, initializer=_init_worker, initargs=(genome_config,))
+            self.pool_config = genome_config
+
+        # A few chunks per worker, to even out their loads.
+        num_chunks = 4 * num_workers
+        chunk_size = max(1, -(-len(genomes) // num_chunks))
+        chunks = [genomes[i:i + chunk_size] for i in range(0, len(genomes), chunk_size)]
+        tasks = [(representatives, chunk, bound) for chunk in chunks]
+        for chunk, rows in zip(chunks, self.pool.map(_distances_in_worker, tasks)):
+            for g, row in zip(chunk, rows):
+                for r, d in zip(representatives, row):
+                    distances.store(r, g, d, bound)
+        return len(representatives) * len(genomes)
 
     def speciate(self, config, population, generation):
         """
@@ -75,42 +346,61 @@ class DefaultSpeciesSet(DefaultClassConfig):
         """
         assert isinstance(population, dict)
 
-        compatibility_threshold = self.species_set_config.compatibility_threshold
+        adaptive = self.species_set_config.target_num_species > 0
+        if not adaptive or self.compatibility_threshold is None:
+            self.compatibility_threshold = self.species_set_config.compatibility_threshold
+        compatibility_threshold = self.compatibility_threshold
 
         # Find the best representatives for each existing species.
         unspeciated = set(population)
-        distances = GenomeDistanceCache(config.genome_config)
+        distances = GenomeDistanceCache(config.genome_config,
+                                        self.species_set_config.distance_cache_size or None)
+        self.distance_cache = distances
+        parallel = self.species_set_config.num_workers != 1
+        if parallel:
+            # Compute the distances the serial code below needs in worker processes
+            # beforehand; it then finds them in the cache, and makes the same choices.
+            start_time = time.time()
+            num_distances = self.compute_distances(distances, config.genome_config,
+                                                   [s.representative for s in self.species.values()],
+                                                   [population[gid] for gid in unspeciated])
         new_representatives = {}
         new_members = {}
         for sid, s in self.species.items():
-            candidates = []
+            # The new representative is the genome closest to the current representative;
+            # distances need only be computed while they might be closer still.
+            rdist, new_rep = None, None
             for gid in unspeciated:
                 g = population[gid]
-                d = distances(s.representative, g)
-                candidates.append((d, g))
+                d = distances(s.representative, g, rdist)
+                if new_rep is None or d < rdist:
+                    rdist, new_rep = d, g
 
-            # The new representative is the genome closest to the current representative.
-            ignored_rdist, new_rep = min(candidates, key=lambda x: x[0])
             new_rid = new_rep.key
             new_representatives[sid] = new_rid
             new_members[sid] = [new_rid]
             unspeciated.remove(new_rid)
 
         # Partition population into species based on genetic similarity.
+        num_pivots = self.species_set_config.num_pivots
+        index = RepresentativeIndex(distances, num_pivots)
+        for sid, rid in new_representatives.items():
+            index.add(sid, population[rid])
+        if parallel:
+            num_distances += self.compute_distances(distances, config.genome_config,
+                                                    [population[rid] for rid in new_representatives.values()],
+                                                    [population[gid] for gid in unspeciated], compatibility_threshold)
+            self.reporters.info("Computed {0} genomic distances in worker processes in {1:.3f} sec".format(
+                num_distances, time.time() - start_time))
+
         while unspeciated:
             gid = unspeciated.pop()
             g = population[gid]
 
-            # Find the species with the most similar representative.
-            candidates = []
-            for sid, rid in new_representatives.items():
-                rep = population[rid]
-                d = distances(rep, g)
-                if d < compatibility_threshold:
-                    candidates.append((d, sid))
-
-            if candidates:
-                ignored_sdist, sid = min(candidates, key=lambda x: x[0])
+            # Find the species with the most similar representative, among those closer
+            # than the threshold; other distances need not be computed in full.
+            sid = index.nearest(g, compatibility_threshold)
+            if sid is not None:
                 new_members[sid].append(gid)
             else:
                 # No species is similar enough, create a new species, using
@@ -118,6 +408,11 @@ class DefaultSpeciesSet(DefaultClassConfig):
                 sid = next(self.indexer)
                 new_representatives[sid] = gid
                 new_members[sid] = [gid]
+                index.add(sid, g)
+
+        if num_pivots > 0:
+            self.reporters.info("Representative index: {0} genomic distances computed, {1} skipped{2}".format(
+                index.computed, index.pruned, "" if index.metric else " (not a metric; searched exhaustively)"))
 
         # Update species collection based on new speciation.
         self.genome_to_species = {}
@@ -134,12 +429,61 @@ class DefaultSpeciesSet(DefaultClassConfig):
             member_dict = dict((gid, population[gid]) for gid in members)
             s.update(population[rid], member_dict)
 
-        # Mean and std genetic distance info report
-        if len(population) > 1:
-            gdmean = mean(distances.distances.values())
-            gdstdev = stdev(distances.distances.values())
-            self.reporters.info(
-                'Mean genetic distance {0:.3f}, standard deviation {1:.3f}'.format(gdmean, gdstdev))
+        if adaptive:
+            self.adjust_compatibility_threshold()
+            self.reporters.info('Compatibility threshold {0:.3f} for {1} species (target {2}), now {3:.3f}'.format(
+                compatibility_threshold, len(self.species), self.species_set_config.target_num_species,
+                self.compatibility_threshold))
+
+        # Mean and std genetic distance info report, over the distances computed in full;
+        # those cut short, once known to exceed a bound, are left out and counted apart.
+        statistics = distances.statistics
+        if len(population) > 1 and statistics.count:
+            msg = 'Mean genetic distance {0:.3f}, standard deviation {1:.3f}'.format(statistics.mean, statistics.stdev())
+            if distances.bounded:
+                msg += ', of the {0} distances computed in full ({1} more, found to exceed a bound, left out)'.format(
+                    statistics.count, distances.bounded)
+            self.reporters.info(msg)
+        distances.clear()
+
+    def add_genome(self, config, genome, generation):
+        """
+        Places one genome into the species with the nearest representative, among
+        those closer than the compatibility threshold, or a new species of which it
+        is the representative, without changing the other species. Returns the
+        species key.
+        """
+        compatibility_threshold = self.compatibility_threshold
+        if compatibility_threshold is None:
+            compatibility_threshold = self.species_set_config.compatibility_threshold
+        distances = GenomeDistanceCache(config.genome_config)
+        sid, sdist = None, compatibility_threshold
+        for rsid, s in self.species.items():
+            d = distances(s.representative, genome, sdist)
+            if d < sdist:
+                sid, sdist = rsid, d
+
+        if sid is None:
+            sid = next(self.indexer)
+            s = Species(sid, generation)
+            s.update(genome, {})
+            self.species[sid] = s
+
+        self.species[sid].members[genome.key] = genome
+        self.genome_to_species[genome.key] = sid
+        return sid
+
+    def remove_genome(self, individual_id):
+        """
+        Removes a genome from its species, and the species if it has no members
+        left. Returns the species key.
+        """
+        sid = self.genome_to_species.pop(individual_id)
+        s = self.species[sid]
+        del s.members[individual_id]
+        if not s.members:
+            del self.species[sid]
+        return sid
 
     def get_species_id(self, individual_id):
         return self.genome_to_species[individual_id]
@@ -0,0 +1,214 @@
+"""
+Runs NEAT as a steady-state algorithm, in the manner of rtNEAT: instead of
+evaluating and replacing the whole population each generation, genomes are
+evaluated asynchronously in a process pool, and as each evaluation finishes the
+worst genome is replaced by a new offspring.
+"""
+import math
+import os
+import random
+from collections import deque
+from multiprocessing import Pool
+from queue import Queue
+
+from neat.math_util import mean
+from neat.population import CompleteExtinctionException, Population
+
+_worker_eval_function = None
+_worker_config = None
+
+
+def _init_worker(eval_function, config):
+    global _worker_eval_function, _worker_config
+    _worker_eval_function = eval_function
+    _worker_config = config
+
+
+def _evaluate_in_worker(genome):
+    return genome.key, _worker_eval_function(genome, _worker_config)
+
+
+class SteadyStatePopulation(Population):
+    """
+    A population evolved one genome at a time: a fixed number of evaluations are
+    kept in flight in a process pool, and whenever one finishes its genome is
+    placed into a species. Once every genome has been evaluated or is being
+    evaluated, each finished evaluation also replaces the worst genome, by fitness
+    shared within its species, with an offspring of a species chosen in proportion
+    to its adjusted fitness, using the configured reproduction, species set and
+    stagnation classes.
+
+    Every ``pop_size`` finished evaluations make up a pseudo-generation, reported
+    to the reporters as a generation (with the evaluated genomes as the population
+    for ``post_evaluate``), so that `StatisticsReporter` and `Checkpointer` work as
+    with `Population`; at its end the evaluated genomes are divided into species
+    again, and stagnant species are marked, to have their members replaced first.
+    To continue from a checkpoint, pass the restored population's ``population``,
+    ``species`` and ``generation`` as the initial state.
+    """
+
+    def __init__(self, config, initial_state=None):
+        Population.__init__(self, config, initial_state)
+        # Keys of the species found stagnant at the end of the last pseudo-generation.
+        self.stagnant = set()
+
+    def run(self, eval_function, n=None, num_workers=None, max_in_flight=None):
+        """
+        Runs for at most n pseudo-generations. If n is None, run until a solution
+        is found or extinction occurs.
+
+        ``eval_function`` takes a genome and the configuration, and returns the
+        genome's fitness, as for `ParallelEvaluator`; it and the configuration are
+        sent once to each of the ``num_workers`` worker processes (by default one
+        per CPU). ``max_in_flight`` evaluations (by default two per worker) are kept
+        in the pool, so that workers do not wait for the main process.
+        """
+        if self.config.no_fitness_termination and (n is None):
+            raise RuntimeError("Cannot have no generational limit with no fitness termination")
+
+        if num_workers is None:
+            num_workers = os.cpu_count() or 1
+        if max_in_flight is None:
+            max_in_flight = 2 * num_workers
+
+        pool = Pool(processes=num_workers, initializer=_init_worker, initargs=(eval_function, self.config))
+        try:
+            self._run(pool, n, max_in_flight)
+        finally:
+            pool.terminate()
+            pool.join()
+
+        if self.config.no_fitness_termination:
+            self.reporters.found_solution(self.config, self.generation, self.best_genome)
+
+        return self.best_genome
+
+    def _run(self, pool, n, max_in_flight):
+        config = self.config
+        results = Queue()
+
+        def error(e):
+            results.put((None, e))
+
+        # Genomes without a fitness wait to be evaluated, outside the species.
+        waiting = deque()
+        for gid, g in self.population.items():
+            if g.fitness is None:
+                waiting.append(g)
+                if gid in self.species.genome_to_species:
+                    self.species.remove_genome(gid)
+
+        in_flight = {}
+        evaluations = 0
+        k = 0
+        self.reporters.start_generation(self.generation)
+        while True:
+            while waiting and len(in_flight) < max_in_flight:
+                g = waiting.popleft()
+                in_flight[g.key] = g
+                pool.apply_async(_evaluate_in_worker, (g,), callback=results.put, error_callback=error)
+
+            if not in_flight:
+                raise RuntimeError("No genome is waiting for or being evaluated")
+            gid, fitness = results.get()
+            if gid is None:
+                raise fitness
+
+            g = in_flight.pop(gid)
+            g.fitness = fitness
+            self.species.add_genome(config, g, self.generation)
+            if self.best_genome is None or fitness > self.best_genome.fitness:
+                self.best_genome = g
+            evaluations += 1
+
+            if not waiting:
+                # Every genome has been evaluated or is being evaluated.
+                child = self.replace_worst()
+                if child is not None:
+                    waiting.append(child)
+
+            if evaluations % config.pop_size:
+                continue
+
+            # End of a pseudo-generation.
+            k += 1
+            evaluated = dict((gid, g) for gid, g in self.population.items() if g.fitness is not None)
+            self.species.speciate(config, evaluated, self.generation)
+            best = max(evaluated.values(), key=lambda g: g.fitness)
+            self.reporters.post_evaluate(config, evaluated, self.species, best)
+
+            if not config.no_fitness_termination:
+                # End if the fitness threshold is reached.
+                fv = self.fitness_criterion(g.fitness for g in evaluated.values())
+                if fv >= config.fitness_threshold:
+                    self.reporters.found_solution(config, self.generation, best)
+                    break
+
+            self.stagnant = set()
+            for sid, s, stagnant in self.reproduction.stagnation.update(self.species, self.generation):
+                if stagnant:
+                    self.reporters.species_stagnant(sid, s)
+                    self.stagnant.add(sid)
+
+            self.reporters.end_generation(config, self.population, self.species)
+            self.generation += 1
+            if n is not None and k >= n:
+                break
+            self.reporters.start_generation(self.generation)
+
+    def replace_worst(self):
+        """
+        Removes the evaluated genome with the lowest fitness divided by the size of
+        its species (members of stagnant species first, and sparing the ``elitism``
+        fittest members of the others unless every genome is one of those), and
+        returns a new offspring, added to the population, to replace it; or None if
+        no genome has been evaluated.
+        """
+        config = self.config
+        reproduction_config = self.reproduction.reproduction_config
+        species = list(self.species.species.values())
+        fitnesses = [m.fitness for s in species for m in s.members.values()]
+        if not fitnesses:
+            return None
+
+        min_fitness = min(fitnesses)
+        fitness_range = max(1.0, max(fitnesses) - min_fitness)
+        worst, worst_key = None, None
+        for s in species:
+            members = sorted(s.members.values(), key=lambda m: m.fitness, reverse=True)
+            is_stagnant = s.key in self.stagnant
+            for i, m in enumerate(members):
+                is_elite = not is_stagnant and i < reproduction_config.elitism
+                key = (not is_stagnant, is_elite, (m.fitness - min_fitness) / fitness_range / len(s.members))
+                if worst_key is None or key < worst_key:
+                    worst, worst_key = m, key
+
+        self.species.remove_genome(worst.key)
+        del self.population[worst.key]
+
+        if not self.species.species:
+            self.reporters.complete_extinction()
+            if not config.reset_on_extinction:
+                raise CompleteExtinctionException()
+            offspring = self.reproduction.create_new(config.genome_type, config.genome_config, 1)
+        else:
+            # Breed from a species that is not stagnant, if there are any, chosen in
+            # proportion to its adjusted fitness (as for DefaultReproduction).
+            candidates = [s for s in self.species.species.values() if s.key not in self.stagnant]
+            if not candidates:
+                candidates = list(self.species.species.values())
+            weights = [(mean(s.get_fitnesses()) - min_fitness) / fitness_range for s in candidates]
+            if sum(weights) > 0:
+                s = random.choices(candidates, weights)[0]
+            else:
+                s = random.choice(candidates)
+
+            # Only the survival threshold fraction of the members are parents.
+            parents = sorted(s.members.items(), reverse=True, key=lambda x: x[1].fitness)
+            repro_cutoff = int(math.ceil(reproduction_config.survival_threshold * len(parents)))
+            parents = parents[:max(repro_cutoff, 2)]
+            offspring = self.reproduction.create_offspring(config, parents, 1)
+
+        gid, child = offspring.popitem()
+        self.population[gid] = child
+        return child
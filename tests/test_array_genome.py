@@ -0,0 +1,214 @@
+import os
+import pickle
+import random
+import tempfile
+import unittest
+
+import neat
+from neat.array_genome import ArrayGenome
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+
+def load_config():
+    # The genome section of a configuration file is named after the genome class.
+    local_dir = os.path.dirname(__file__)
+    with open(os.path.join(local_dir, 'test_configuration')) as f:
+        text = f.read().replace('[DefaultGenome]', '[ArrayGenome]')
+    with tempfile.TemporaryDirectory() as tmpdir:
+        config_path = os.path.join(tmpdir, 'config')
+        with open(config_path, 'w') as f:
+            f.write(text)
+        return neat.Config(ArrayGenome, neat.DefaultReproduction,
+                           neat.DefaultSpeciesSet, neat.DefaultStagnation,
+                           config_path)
+
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class TestArrayGenome(unittest.TestCase):
+    def setUp(self):
+        self.config = load_config()
+        genome_config = self.config.genome_config
+        genome_config.node_add_prob = 0.5
+        genome_config.conn_add_prob = 0.8
+        genome_config.activation_options = ['sigmoid', 'tanh', 'relu']
+        genome_config.activation_mutate_rate = 0.1
+
+    def random_genome(self, key, num_mutations=20):
+        g = ArrayGenome(key)
+        g.configure_new(self.config.genome_config)
+        for _ in range(num_mutations):
+            g.mutate(self.config.genome_config)
+        return g
+
+    def check_consistent(self, g):
+        n = len(g.node_keys)
+        self.assertTrue(all(len(a) == n for a in (g.bias, g.response, g.activation, g.aggregation)))
+        self.assertTrue(np.all(np.diff(g.node_keys) > 0))
+        m = len(g.conn_inputs)
+        self.assertTrue(all(len(a) == m for a in (g.conn_outputs, g.weight, g.enabled)))
+        codes = g.conn_inputs * (1 << 32) + g.conn_outputs
+        self.assertTrue(np.all(np.diff(codes) > 0))
+        # Every connection refers to existing nodes or inputs.
+        pins = set(g.node_keys.tolist()) | set(self.config.genome_config.input_keys)
+        for i, o in g.connections:
+            self.assertIn(i, pins)
+            self.assertIn(o, pins)
+        # Connections are found at their rows, however the arrays were last changed.
+        for n, key in enumerate(g.connections):
+            self.assertEqual(g._connection_index(key), n)
+
+    def test_configure_new_matches_default(self):
+        for connection in ('full', 'partial 0.5', 'fs_neat_hidden', 'unconnected'):
+            config = self.config.genome_config
+            config.initial_connection, _, fraction = connection.partition(' ')
+            config.connection_fraction = float(fraction) if fraction else None
+            config.num_hidden = 2
+            config.node_indexer = None
+            random.seed(1)
+            g = ArrayGenome(1)
+            g.configure_new(config)
+            config.node_indexer = None
+            random.seed(1)
+            d = neat.DefaultGenome(1)
+            d.configure_new(config)
+            self.assertEqual(g.fingerprint(), d.fingerprint())
+            self.check_consistent(g)
+
+    def test_mutate_and_crossover(self):
+        genomes = [self.random_genome(key) for key in range(20)]
+        for g in genomes:
+            self.check_consistent(g)
+            g.fitness = random.random()
+
+        for key in range(20):
+            p1, p2 = random.choice(genomes), random.choice(genomes)
+            child = ArrayGenome(100 + key)
+            child.configure_crossover(p1, p2, self.config.genome_config)
+            self.check_consistent(child)
+            fitter = p1 if p1.fitness > p2.fitness else p2
+            other = p2 if fitter is p1 else p1
+            self.assertEqual(list(child.nodes), list(fitter.nodes))
+            self.assertEqual(list(child.connections), list(fitter.connections))
+            for key, cg in child.connections.items():
+                choices = [fitter.connections[key].weight]
+                if key in other.connections:
+                    choices.append(other.connections[key].weight)
+                self.assertIn(cg.weight, choices)
+
+    def test_connection_index(self):
+        g = self.random_genome(1)
+        keys = list(g.connections)
+        self.assertEqual([g._connection_index(k) for k in keys], list(range(len(keys))))
+        # The key to row dict is kept between lookups.
+        rows = g._connection_rows
+        self.assertIsNotNone(rows[2])
+        g._connection_index(keys[0])
+        self.assertIs(g._connection_rows, rows)
+        self.assertIsNone(g._connection_index((-1000, -1000)))
+
+        g.add_connection(self.config.genome_config, -1000, 0, 0.5, True)
+        self.assertEqual(g._connection_index((-1000, 0)), 0)
+        self.assertEqual(g._connection_index(keys[-1]), len(keys))
+        g.mutate_delete_connection()
+        for n, key in enumerate(g.connections):
+            self.assertEqual(g._connection_index(key), n)
+        self.assertIsNone(pickle.loads(pickle.dumps(g))._connection_rows)
+
+    def test_distance_matches_default(self):
+        genomes = [self.random_genome(key) for key in range(10)]
+        defaults = [g.to_genome() for g in genomes]
+        for g1, d1 in zip(genomes, defaults):
+            for g2, d2 in zip(genomes, defaults):
+                distance = g1.distance(g2, self.config.genome_config)
+                self.assertAlmostEqual(distance, d1.distance(d2, self.config.genome_config))
+                for bound in (0.5 * distance, 1.5 * distance):
+                    d = g1.distance(g2, self.config.genome_config, bound)
+                    if distance < bound:
+                        self.assertEqual(d, distance)
+                    else:
+                        self.assertTrue(bound <= d <= distance)
+            self.assertEqual(g1.size(), d1.size())
+
+    def test_conversion_and_network(self):
+        g = self.random_genome(1, 40)
+        d = g.to_genome()
+        self.assertEqual(ArrayGenome.from_genome(d, self.config.genome_config).fingerprint(), g.fingerprint())
+        self.assertEqual(d.fingerprint(), g.fingerprint())
+
+        net = neat.nn.FeedForwardNetwork.create(g, self.config)
+        expected = neat.nn.FeedForwardNetwork.create(d, self.config)
+        for _ in range(5):
+            inputs = [random.uniform(-1, 1) for _ in range(2)]
+            self.assertEqual(net.activate(inputs), expected.activate(inputs))
+
+        g2 = pickle.loads(pickle.dumps(g))
+        self.assertEqual(g2.fingerprint(), g.fingerprint())
+
+    def test_fingerprint_matches_default(self):
+        genome_config = self.config.genome_config
+        genomes = [self.random_genome(key, 30) for key in range(20)]
+        for g in genomes:
+            d = g.to_genome()
+            for include_disabled in (False, True):
+                self.assertEqual(g.fingerprint(include_disabled=include_disabled),
+                                 d.fingerprint(include_disabled=include_disabled))
+            self.assertEqual(g.fingerprint(genome_config, pruned=True), d.fingerprint(genome_config, pruned=True))
+        self.assertRaises(RuntimeError, genomes[0].fingerprint, pruned=True)
+
+        # A fitness cached for one genome class is found for the other.
+        evaluated = []
+
+        def eval_genomes(genomes, config):
+            for genome_id, genome in genomes:
+                evaluated.append(genome_id)
+                genome.fitness = float(len(genome.connections) + genome_id)
+
+        cache = neat.FitnessCache(eval_genomes)
+        cache.evaluate([(g.key, g) for g in genomes], self.config)
+        defaults = [g.to_genome() for g in genomes]
+        num_evaluated = len(evaluated)
+        cache.evaluate([(d.key, d) for d in defaults], self.config)
+        self.assertEqual(len(evaluated), num_evaluated)
+        self.assertEqual([d.fitness for d in defaults], [g.fitness for g in genomes])
+
+    def test_mutation_distribution(self):
+        # Weights mutate with weight_mutate_rate perturbations or weight_replace_rate replacements.
+        config = self.config.genome_config
+        config.weight_mutate_rate = 0.5
+        config.weight_replace_rate = 0.2
+        config.weight_mutate_power = 0.1
+        g = self.random_genome(1, 0)
+        g.weight = np.zeros(20000)
+        g.conn_inputs = np.repeat(-1, 20000)
+        g.conn_outputs = np.arange(20000)
+        g.enabled = np.ones(20000, dtype=bool)
+        config.node_add_prob = config.node_delete_prob = config.conn_add_prob = config.conn_delete_prob = 0.0
+        g.mutate(config)
+        attribute = neat.genes.DefaultConnectionGene._gene_attributes[0]
+        expected = np.array([attribute.mutate_value(0.0, config) for _ in range(20000)])
+        for values in (g.weight, expected):
+            self.assertAlmostEqual(np.mean(values != 0.0), 0.7, delta=0.02)
+        for threshold in (0.05, 0.2, 1.0):
+            self.assertAlmostEqual(np.mean(np.abs(g.weight) < threshold), np.mean(np.abs(expected) < threshold),
+                                   delta=0.02)
+
+    def test_run(self):
+        self.config.no_fitness_termination = True
+        p = neat.Population(self.config)
+
+        def eval_genomes(genomes, config):
+            for genome_id, genome in genomes:
+                net = neat.nn.FeedForwardNetwork.create(genome, config)
+                genome.fitness = net.activate((0.5, -0.5))[0]
+
+        p.add_reporter(neat.StatisticsReporter())
+        best = p.run(eval_genomes, 5)
+        self.assertIsInstance(best, ArrayGenome)
+
+
+if __name__ == '__main__':
+    unittest.main()
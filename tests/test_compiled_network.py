@@ -0,0 +1,120 @@
+import os
+import pickle
+import random
+
+import neat
+from neat import activations
+from neat.nn import (CompiledFeedForwardNetwork, CompiledRecurrentNetwork, FeedForwardNetwork,
+                     RecurrentNetwork)
+
+
+def load_config(feed_forward):
+    local_dir = os.path.dirname(__file__)
+    config_path = os.path.join(local_dir, 'test_configuration')
+    config = neat.Config(neat.DefaultGenome, neat.DefaultReproduction,
+                         neat.DefaultSpeciesSet, neat.DefaultStagnation,
+                         config_path)
+    config.genome_config.feed_forward = feed_forward
+    config.genome_config.node_add_prob = 0.5
+    config.genome_config.node_delete_prob = 0.05
+    config.genome_config.conn_delete_prob = 0.05
+    return config
+
+
+def random_genome(config, key):
+    g = neat.DefaultGenome(key)
+    g.configure_new(config.genome_config)
+    for _ in range(random.randint(0, 40)):
+        g.mutate(config.genome_config)
+    activation_names = sorted(config.genome_config.activation_defs.functions)
+    aggregation_names = sorted(config.genome_config.aggregation_function_defs.functions)
+    for ng in g.nodes.values():
+        ng.activation = random.choice(activation_names)
+        ng.aggregation = random.choice(aggregation_names)
+    return g
+
+
+def test_feed_forward_equivalence():
+    config = load_config(True)
+    for key in range(100):
+        g = random_genome(config, key)
+        net = FeedForwardNetwork.create(g, config)
+        cnet = CompiledFeedForwardNetwork.create(g, config)
+        for _ in range(5):
+            inputs = [random.uniform(-2.0, 2.0) for _ in range(2)]
+            assert cnet.activate(inputs) == net.activate(inputs)
+
+
+def test_recurrent_equivalence():
+    config = load_config(False)
+    for key in range(100):
+        g = random_genome(config, key)
+        net = RecurrentNetwork.create(g, config)
+        cnet = CompiledRecurrentNetwork.create(g, config)
+        for _ in range(5):
+            inputs = [random.uniform(-2.0, 2.0) for _ in range(2)]
+            assert cnet.activate(inputs) == net.activate(inputs)
+
+        net.reset()
+        cnet.reset()
+        inputs = [random.uniform(-2.0, 2.0) for _ in range(2)]
+        assert cnet.activate(inputs) == net.activate(inputs)
+
+
+def test_source_and_errors():
+    node_evals = [(0, activations.sigmoid_activation, neat.aggregations.sum_aggregation, 0.5, 2.0,
+                   [(-1, 1.5), (-2, -0.25)])]
+    cnet = CompiledFeedForwardNetwork([-1, -2], [0], node_evals)
+    assert 'i0 * 1.5 + i1 * -0.25' in cnet.source
+    assert 'node 0' in cnet.source
+    try:
+        cnet.activate([1.0])
+    except RuntimeError:
+        pass
+    else:
+        raise AssertionError("Expected a RuntimeError for the wrong number of inputs")
+
+
+def test_unconnected():
+    node_evals = [(0, activations.sigmoid_activation, sum, 0.0, 1.0, [])]
+    cnet = CompiledFeedForwardNetwork([], [0, 1], node_evals)
+    assert cnet.activate([]) == [0.5, 0.0]
+
+    rnet = CompiledRecurrentNetwork([], [0, 1], node_evals)
+    assert rnet.activate([]) == [0.5, 0.0]
+
+
+def test_many_inputs():
+    # Too many terms to inline as a chain of additions.
+    inputs = [-k for k in range(1, 5001)]
+    links = [(k, random.uniform(-1.0, 1.0)) for k in inputs]
+    values = [random.uniform(-2.0, 2.0) for _ in inputs]
+    for agg_func in (neat.aggregations.sum_aggregation, neat.aggregations.max_aggregation):
+        node_evals = [(0, activations.identity_activation, agg_func, 0.5, 2.0, links)]
+        net = FeedForwardNetwork(inputs, [0], node_evals)
+        cnet = CompiledFeedForwardNetwork(inputs, [0], node_evals)
+        assert cnet.activate(values) == net.activate(values)
+
+        rnet = RecurrentNetwork(inputs, [0], node_evals)
+        crnet = CompiledRecurrentNetwork(inputs, [0], node_evals)
+        for _ in range(2):
+            assert crnet.activate(values) == rnet.activate(values)
+
+
+def test_pickle():
+    node_evals = [(0, activations.tanh_activation, neat.aggregations.sum_aggregation, 0.0, 1.0, [(0, 0.5), (-1, 1.0)])]
+    rnet = CompiledRecurrentNetwork([-1], [0], node_evals)
+    rnet.activate([1.0])
+    restored = pickle.loads(pickle.dumps(rnet))
+    assert restored.activate([1.0]) == rnet.activate([1.0])
+
+    cnet = pickle.loads(pickle.dumps(CompiledFeedForwardNetwork([-1], [0], node_evals[:1])))
+    assert cnet.source
+
+
+if __name__ == '__main__':
+    test_feed_forward_equivalence()
+    test_recurrent_equivalence()
+    test_source_and_errors()
+    test_unconnected()
+    test_pickle()
@@ -0,0 +1,122 @@
+import os
+
+import neat
+from neat.fitness_cache import genome_fingerprint
+
+
+def load_config():
+    local_dir = os.path.dirname(__file__)
+    config_path = os.path.join(local_dir, 'test_configuration')
+    return neat.Config(neat.DefaultGenome, neat.DefaultReproduction,
+                       neat.DefaultSpeciesSet, neat.DefaultStagnation,
+                       config_path)
+
+
+class CountingEvaluator(object):
+    """A deterministic fitness function that records which genomes it evaluated."""
+
+    def __init__(self):
+        self.evaluated = []
+
+    def evaluate(self, genomes, config):
+        for genome_id, genome in genomes:
+            self.evaluated.append(genome_id)
+            net = neat.nn.FeedForwardNetwork.create(genome, config)
+            genome.fitness = net.activate((0.5, -0.25))[0]
+
+
+class InfoCollector(neat.reporting.BaseReporter):
+    def __init__(self):
+        self.messages = []
+
+    def info(self, msg):
+        self.messages.append(msg)
+
+
+def test_fingerprint():
+    config = load_config()
+    g1 = neat.DefaultGenome(1)
+    g1.configure_new(config.genome_config)
+    g2 = neat.DefaultGenome(2)
+    g2.nodes = dict((k, ng.copy()) for k, ng in g1.nodes.items())
+    g2.connections = dict((k, cg.copy()) for k, cg in g1.connections.items())
+    assert genome_fingerprint(g1) == genome_fingerprint(g2)
+
+    # Disabled connections do not affect the phenotype.
+    g2.add_connection(config.genome_config, -1, 0, 5.0, False)
+    g1.connections.pop((-1, 0), None)
+    assert genome_fingerprint(g1) == genome_fingerprint(g2)
+
+    cg = next(iter(g2.connections.values()))
+    cg.enabled = True
+    cg.weight += 1.0
+    assert genome_fingerprint(g1) != genome_fingerprint(g2)
+
+
+def test_run_with_cache():
+    config = load_config()
+    config.reproduction_config.elitism = 2
+    config.no_fitness_termination = True
+    p = neat.Population(config)
+    info = InfoCollector()
+    p.add_reporter(info)
+    evaluator = CountingEvaluator()
+    cache = neat.FitnessCache(evaluator.evaluate, p.reporters)
+    num_genomes = []
+
+    def eval_genomes(genomes, config):
+        num_genomes.append(len(genomes))
+        cache.evaluate(genomes, config)
+
+        # Cached fitness values match a fresh evaluation.
+        fitnesses = [g.fitness for k, g in genomes]
+        CountingEvaluator().evaluate(genomes, config)
+        assert fitnesses == [g.fitness for k, g in genomes]
+
+    p.run(eval_genomes, 10)
+
+    # Each generation's elites are at least found in the cache.
+    assert cache.hits >= 9 * config.reproduction_config.elitism
+    assert cache.hits + cache.misses == sum(num_genomes)
+    assert len(evaluator.evaluated) == cache.misses
+    assert len([m for m in info.messages if m.startswith('Fitness cache:')]) == 10
+
+
+def test_duplicates_and_disabled():
+    config = load_config()
+    g1 = neat.DefaultGenome(1)
+    g1.configure_new(config.genome_config)
+    g1.fitness = 0.0
+    g2 = neat.DefaultGenome(2)
+    g2.configure_crossover(g1, g1, config.genome_config)
+
+    evaluator = CountingEvaluator()
+    cache = neat.FitnessCache(evaluator.evaluate)
+    cache.evaluate([(1, g1), (2, g2)], config)
+    assert evaluator.evaluated == [1]
+    assert g1.fitness == g2.fitness
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    cache.evaluate([(1, g1), (2, g2)], config)
+    assert evaluator.evaluated == [1]
+    assert (cache.last_hits, cache.last_misses) == (2, 0)
+
+    cache.enabled = False
+    cache.evaluate([(1, g1), (2, g2)], config)
+    assert evaluator.evaluated == [1, 1, 2]
+
+
+def test_max_entries():
+    config = load_config()
+    genomes = []
+    for key in range(5):
+        g = neat.DefaultGenome(key)
+        g.configure_new(config.genome_config)
+        genomes.append((key, g))
+
+    evaluator = CountingEvaluator()
+    cache = neat.FitnessCache(evaluator.evaluate, max_entries=2)
+    cache.evaluate(genomes, config)
+    assert len(cache.cache) == 2
+    cache.evaluate(genomes[-2:], config)
+    assert cache.last_misses == 0
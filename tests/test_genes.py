@@ -1,2 +1,108 @@
+import copy
+import os
+import pickle
+import random
+import unittest
+
+import neat
 from neat import genes
 
+
+class TestCompactGenes(unittest.TestCase):
+    """Tests using unittest."""
+
+    def setUp(self):
+        local_dir = os.path.dirname(__file__)
+        self.config = neat.Config(neat.DefaultGenome, neat.DefaultReproduction,
+                                  neat.DefaultSpeciesSet, neat.DefaultStagnation,
+                                  os.path.join(local_dir, 'test_configuration'))
+
+    @staticmethod
+    def values(gene):
+        return tuple([gene.key] + [getattr(gene, a.name) for a in gene._gene_attributes])
+
+    def check_gene_type(self, gene_type, key, config):
+        compact_type = genes.compact_gene_type(gene_type)
+        self.assertIs(genes.compact_gene_type(gene_type), compact_type)
+        self.assertIs(genes.compact_gene_type(compact_type), compact_type)
+        self.assertEqual(compact_type.__name__, gene_type.__name__)
+
+        results = []
+        for cls in (gene_type, compact_type):
+            random.seed(1)
+            gene1 = cls(key)
+            gene1.init_attributes(config)
+            gene2 = cls(key)
+            gene2.init_attributes(config)
+            gene1.mutate(config)
+            children = [gene1.copy()] + [gene1.crossover(gene2) for _ in range(10)]
+            for child in children:
+                self.assertIs(type(child), cls)
+            results.append(([self.values(g) for g in [gene1, gene2] + children], str(gene1), gene1.fingerprint(),
+                            gene1.distance(gene2, config)))
+        self.assertEqual(results[0], results[1])
+
+        gene = compact_type(key)
+        gene.init_attributes(config)
+        self.assertFalse(hasattr(gene, '__dict__'))
+        with self.assertRaises(AttributeError):
+            gene.unknown = 1
+        for gene2 in (pickle.loads(pickle.dumps(gene)), copy.deepcopy(gene)):
+            self.assertIs(type(gene2), compact_type)
+            self.assertEqual(self.values(gene2), self.values(gene))
+
+    def test_default_genes(self):
+        config = self.config.genome_config
+        self.check_gene_type(genes.DefaultNodeGene, 0, config)
+        self.check_gene_type(genes.DefaultConnectionGene, (-1, 0), config)
+
+    def test_custom_genes(self):
+        local_dir = os.path.dirname(__file__)
+        config = neat.Config(neat.iznn.IZGenome, neat.DefaultReproduction,
+                             neat.DefaultSpeciesSet, neat.DefaultStagnation,
+                             os.path.join(local_dir, 'test_configuration_iznn'))
+        self.check_gene_type(neat.iznn.IZNodeGene, 0, config.genome_config)
+
+        class Gene(genes.DefaultNodeGene):
+            def __init__(self, key):
+                super().__init__(key)
+
+        with self.assertRaises(RuntimeError):
+            genes.compact_gene_type(Gene)
+
+    def test_config(self):
+        config2 = pickle.loads(pickle.dumps(self.config.genome_config))
+        self.assertIs(config2.node_gene_type, genes.DefaultNodeGene)
+
+        local_dir = os.path.dirname(__file__)
+        with open(os.path.join(local_dir, 'test_configuration')) as f:
+            text = f.read().replace('[DefaultGenome]', '[DefaultGenome]\ncompact_genes = True')
+        path = os.path.join(local_dir, 'test_configuration_compact_genes')
+        with open(path, 'w') as f:
+            f.write(text)
+        try:
+            config = neat.Config(neat.DefaultGenome, neat.DefaultReproduction,
+                                 neat.DefaultSpeciesSet, neat.DefaultStagnation, path)
+        finally:
+            os.remove(path)
+        genome_config = config.genome_config
+        self.assertIs(genome_config.node_gene_type, genes.compact_gene_type(genes.DefaultNodeGene))
+        config2 = pickle.loads(pickle.dumps(config))
+        self.assertIs(config2.genome_config.connection_gene_type, genome_config.connection_gene_type)
+
+        config.no_fitness_termination = True
+        p = neat.Population(config)
+
+        def eval_genomes(genomes, config):
+            for genome_id, genome in genomes:
+                net = neat.nn.FeedForwardNetwork.create(genome, config)
+                genome.fitness = net.activate((0.5, 0.5))[0]
+
+        winner = p.run(eval_genomes, 5)
+        for gene in list(winner.nodes.values()) + list(winner.connections.values()):
+            self.assertFalse(hasattr(gene, '__dict__'))
+        self.assertEqual(pickle.loads(pickle.dumps(winner)).fingerprint(), winner.fingerprint())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,9 @@
 """Tests creating genomes with various configuration options."""
 
 import os
+import pickle
+import random
+import subprocess
 import sys
 import unittest
 
@@ -381,5 +384,596 @@ class TestPruning(unittest.TestCase):
         self.assertEqual(set(g_pruned.connections.keys()), {(-1, 0), (-2, 0)})
 
 
+class TestTopologyIndex(unittest.TestCase):
+    """Tests using unittest."""
+
+    def setUp(self):
+        local_dir = os.path.dirname(__file__)
+        config_path = os.path.join(local_dir, 'test_configuration')
+        self.config = neat.Config(neat.DefaultGenome, neat.DefaultReproduction,
+                                  neat.DefaultSpeciesSet, neat.DefaultStagnation,
+                                  config_path)
+        config = self.config.genome_config
+        config.node_add_prob = 0.3
+        config.node_delete_prob = 0.1
+        config.conn_add_prob = 0.9
+        config.conn_delete_prob = 0.1
+
+    def evolve(self, topology_index, seed):
+        """Mutates and crosses over a small population, returning the genomes."""
+        config = self.config.genome_config
+        config.topology_index = topology_index
+        config.node_indexer = None
+        random.seed(seed)
+        genomes = []
+        for key in range(10):
+            g = neat.DefaultGenome(key)
+            g.configure_new(config)
+            g.fitness = random.random()
+            genomes.append(g)
+        for generation in range(30):
+            children = []
+            for key in range(10):
+                child = neat.DefaultGenome(key)
+                child.configure_crossover(random.choice(genomes), random.choice(genomes), config)
+                child.mutate(config)
+                child.fitness = random.random()
+                children.append(child)
+            genomes = children
+        return genomes
+
+    def test_same_mutations(self):
+        for seed in range(5):
+            expected = self.evolve(False, seed)
+            genomes = self.evolve(True, seed)
+            for g1, g2 in zip(expected, genomes):
+                self.assertEqual(set(g1.connections), set(g2.connections))
+                self.assertEqual(set(g1.nodes), set(g2.nodes))
+
+                index = g2.get_topology_index()
+                self.assertEqual(set(index), set(g2.connections))
+                for a, b in index:
+                    self.assertLess(index.order[a], index.order[b])
+
+    def test_not_pickled(self):
+        config = self.config.genome_config
+        config.topology_index = True
+        g = neat.DefaultGenome(1)
+        g.configure_new(config)
+        for _ in range(20):
+            g.mutate(config)
+        self.assertIsNotNone(g._topology)
+
+        g2 = pickle.loads(pickle.dumps(g))
+        self.assertIsNone(g2._topology)
+        self.assertEqual(set(g2.get_topology_index()), set(g.connections))
+
+    def test_direct_edits(self):
+        config = self.config.genome_config
+        config.initial_connection = 'unconnected'
+        g = neat.DefaultGenome(1)
+        g.configure_new(config)
+        g.add_connection(config, -1, 0, 1.0, True)
+        index = g.get_topology_index()
+        self.assertFalse(index.creates_cycle((-2, 0)))
+
+        # Connections added or deleted outside the genome's methods are picked up when counts differ.
+        del g.connections[(-1, 0)]
+        self.assertEqual(set(g.get_topology_index()), set())
+        g.connections[(-2, 0)] = g.create_connection(config, -2, 0)
+        g.invalidate_topology_index()
+        self.assertEqual(set(g.get_topology_index()), {(-2, 0)})
+
+
+class TestFingerprint(unittest.TestCase):
+    """Tests using unittest."""
+
+    def setUp(self):
+        local_dir = os.path.dirname(__file__)
+        config_path = os.path.join(local_dir, 'test_configuration')
+        self.config = neat.Config(neat.DefaultGenome, neat.DefaultReproduction,
+                                  neat.DefaultSpeciesSet, neat.DefaultStagnation,
+                                  config_path)
+        self.genome = neat.DefaultGenome(1)
+        self.genome.configure_new(self.config.genome_config)
+        for _ in range(20):
+            self.genome.mutate(self.config.genome_config)
+
+    def copy_genome(self, g, key):
+        new = neat.DefaultGenome(key)
+        # Reversed insertion order must not change the fingerprint.
+        new.nodes = dict((k, ng.copy()) for k, ng in reversed(list(g.nodes.items())))
+        new.connections = dict((k, cg.copy()) for k, cg in reversed(list(g.connections.items())))
+        return new
+
+    def test_equal_genomes(self):
+        g2 = self.copy_genome(self.genome, 2)
+        self.assertEqual(self.genome.fingerprint(), g2.fingerprint())
+        self.assertEqual(len(g2.fingerprint()), 32)
+
+        ng = next(iter(g2.nodes.values()))
+        ng.bias += 0.5
+        self.assertNotEqual(self.genome.fingerprint(), g2.fingerprint())
+
+    def test_disabled_connections(self):
+        config = self.config.genome_config
+        g2 = self.copy_genome(self.genome, 2)
+        g2.add_connection(config, -1, 0, 3.0, False)
+        g2.connections.pop((-1, 0))
+        g3 = self.copy_genome(g2, 3)
+        g3.add_connection(config, -1, 0, 3.0, False)
+        self.assertEqual(g2.fingerprint(), g3.fingerprint())
+        self.assertNotEqual(g2.fingerprint(include_disabled=True), g3.fingerprint(include_disabled=True))
+
+    def test_pruned(self):
+        config = self.config.genome_config
+        g2 = self.copy_genome(self.genome, 2)
+        new_node_id = max(g2.nodes) + 1
+        g2.nodes[new_node_id] = g2.create_node(config, new_node_id)
+        g2.add_connection(config, -1, new_node_id, 1.0, True)
+        self.assertNotEqual(self.genome.fingerprint(), g2.fingerprint())
+        self.assertEqual(self.genome.fingerprint(config, pruned=True), g2.fingerprint(config, pruned=True))
+        self.assertEqual(self.genome.get_pruned_copy(config).fingerprint(), g2.fingerprint(config, pruned=True))
+        with self.assertRaises(RuntimeError):
+            g2.fingerprint(pruned=True)
+
+    def test_stable(self):
+        # The fingerprint must not depend on the process (e.g. string hash randomization).
+        code = ("import pickle, sys; g = pickle.load(sys.stdin.buffer); "
+                "sys.stdout.write(g.fingerprint())")
+        for seed in ('1', '2'):
+            env = dict(os.environ, PYTHONHASHSEED=seed)
+            env['PYTHONPATH'] = os.pathsep.join([os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                                 env.get('PYTHONPATH', '')])
+            output = subprocess.run([sys.executable, '-c', code], input=pickle.dumps(self.genome),
+                                    stdout=subprocess.PIPE, env=env, check=True).stdout
+            self.assertEqual(output.decode(), self.genome.fingerprint())
+
+    def test_custom_genes(self):
+        local_dir = os.path.dirname(__file__)
+        config = neat.Config(neat.iznn.IZGenome, neat.DefaultReproduction,
+                             neat.DefaultSpeciesSet, neat.DefaultStagnation,
+                             os.path.join(local_dir, 'test_configuration_iznn'))
+        g = neat.iznn.IZGenome(1)
+        g.configure_new(config.genome_config)
+        g2 = neat.iznn.IZGenome(2)
+        g2.nodes = dict((k, ng.copy()) for k, ng in g.nodes.items())
+        g2.connections = dict((k, cg.copy()) for k, cg in g.connections.items())
+        self.assertEqual(g.fingerprint(), g2.fingerprint())
+        next(iter(g2.nodes.values())).a += 0.01
+        self.assertNotEqual(g.fingerprint(), g2.fingerprint())
+
+
+class TestVectorizedMutation(unittest.TestCase):
+    """Tests using unittest."""
+
+    def setUp(self):
+        local_dir = os.path.dirname(__file__)
+        config_path = os.path.join(local_dir, 'test_configuration')
+        self.config = neat.Config(neat.DefaultGenome, neat.DefaultReproduction,
+                                  neat.DefaultSpeciesSet, neat.DefaultStagnation,
+                                  config_path)
+        config = self.config.genome_config
+        config.weight_mutate_rate = 0.5
+        config.weight_replace_rate = 0.2
+        config.weight_mutate_power = 0.5
+        config.enabled_mutate_rate = 0.2
+        config.enabled_rate_to_true_add = 0.3
+        config.activation_options = ['sigmoid', 'relu', 'tanh']
+        config.activation_mutate_rate = 0.4
+
+    def compare(self, attribute, value, summaries):
+        """Compares mutate_values, on both the plain and NumPy paths, against mutate_value."""
+        config = self.config.genome_config
+        n = 20000
+        expected = [attribute.mutate_value(value, config) for _ in range(n)]
+        results = [attribute.mutate_values([value] * n, config)]
+        min_values = neat.attributes.NUMPY_MIN_VALUES
+        try:
+            neat.attributes.NUMPY_MIN_VALUES = n + 1
+            results.append(attribute.mutate_values([value] * n, config))
+        finally:
+            neat.attributes.NUMPY_MIN_VALUES = min_values
+        for values in results:
+            self.assertEqual(len(values), n)
+            self.assertEqual(set(type(v) for v in values), set(type(v) for v in expected))
+            for summary in summaries:
+                self.assertAlmostEqual(summary(values), summary(expected), delta=0.02)
+
+    def test_float(self):
+        attribute = neat.genes.DefaultConnectionGene._gene_attributes[0]
+        summaries = [lambda values: sum(v == 1.0 for v in values) / len(values)]
+        for threshold in (0.5, 1.0, 2.0, 3.0):
+            summaries.append(lambda values, t=threshold: sum(abs(v) < t for v in values) / len(values))
+        self.compare(attribute, 1.0, summaries)
+
+    def test_bool(self):
+        attribute = neat.genes.DefaultConnectionGene._gene_attributes[1]
+        for value in (True, False):
+            self.compare(attribute, value, [lambda values: sum(values) / len(values)])
+
+    def test_string(self):
+        attribute = neat.genes.DefaultNodeGene._gene_attributes[2]
+        summaries = [lambda values, o=option: values.count(o) / len(values)
+                     for option in self.config.genome_config.activation_options]
+        self.compare(attribute, 'sigmoid', summaries)
+
+    def test_integer(self):
+        attribute = neat.attributes.IntegerAttribute('count')
+        config = self.config.genome_config
+        config.count_mutate_rate = 0.5
+        config.count_replace_rate = 0.2
+        config.count_mutate_power = 2.0
+        config.count_min_value = -3
+        config.count_max_value = 3
+        summaries = [lambda values, c=count: values.count(c) / len(values) for count in range(-3, 4)]
+        self.compare(attribute, 1, summaries)
+
+    def test_genome(self):
+        config = self.config.genome_config
+        config.vectorized_mutation = True
+        config.num_hidden = 10
+        config.initial_connection = 'full_nodirect'
+        g = neat.DefaultGenome(1)
+        g.configure_new(config)
+        weights = dict((k, cg.weight) for k, cg in g.connections.items())
+        biases = dict((k, ng.bias) for k, ng in g.nodes.items())
+        for _ in range(5):
+            g.mutate(config)
+        self.assertTrue(any(g.connections[k].weight != w for k, w in weights.items() if k in g.connections))
+        self.assertTrue(any(g.nodes[k].bias != b for k, b in biases.items() if k in g.nodes))
+        for cg in g.connections.values():
+            self.assertIsInstance(cg.weight, float)
+            self.assertIsInstance(cg.enabled, bool)
+        for ng in g.nodes.values():
+            self.assertIn(ng.activation, config.activation_options)
+        neat.nn.FeedForwardNetwork.create(g, self.config).activate((0.5, 0.5))
+
+    def test_custom_genes(self):
+        local_dir = os.path.dirname(__file__)
+        config = neat.Config(neat.iznn.IZGenome, neat.DefaultReproduction,
+                             neat.DefaultSpeciesSet, neat.DefaultStagnation,
+                             os.path.join(local_dir, 'test_configuration_iznn'))
+        config.genome_config.vectorized_mutation = True
+        config.genome_config.a_mutate_rate = 1.0
+        config.genome_config.a_mutate_power = 0.01
+        g = neat.iznn.IZGenome(1)
+        g.configure_new(config.genome_config)
+        a = dict((k, ng.a) for k, ng in g.nodes.items())
+        g.mutate(config.genome_config)
+        self.assertTrue(all(g.nodes[k].a != v for k, v in a.items()))
+
+        # Gene classes with their own mutate method are mutated one gene at a time.
+        class CountingGene(neat.genes.DefaultNodeGene):
+            mutated = 0
+
+            def mutate(self, config):
+                CountingGene.mutated += 1
+
+        CountingGene.mutate_genes([CountingGene(0), CountingGene(1)], config.genome_config)
+        self.assertEqual(CountingGene.mutated, 2)
+
+
+class TestGeneOperators(unittest.TestCase):
+    """Tests using unittest."""
+
+    def setUp(self):
+        local_dir = os.path.dirname(__file__)
+        self.config = neat.Config(neat.DefaultGenome, neat.DefaultReproduction,
+                                  neat.DefaultSpeciesSet, neat.DefaultStagnation,
+                                  os.path.join(local_dir, 'test_configuration'))
+        self.iz_config = neat.Config(neat.iznn.IZGenome, neat.DefaultReproduction,
+                                     neat.DefaultSpeciesSet, neat.DefaultStagnation,
+                                     os.path.join(local_dir, 'test_configuration_iznn'))
+        config = self.config.genome_config
+        config.bias_mutate_rate = 0.5
+        config.bias_replace_rate = 0.3
+        config.activation_options = ['sigmoid', 'relu', 'tanh']
+        config.activation_mutate_rate = 0.5
+        config.enabled_mutate_rate = 0.5
+        self.iz_config.genome_config.a_mutate_rate = 0.5
+        self.iz_config.genome_config.a_mutate_power = 0.1
+
+    @staticmethod
+    def values(gene):
+        return tuple([gene.key] + [getattr(gene, a.name) for a in gene._gene_attributes])
+
+    def check_same_results(self, config, gene_type, key):
+        operators = config.get_gene_operators(gene_type)
+        for seed in range(10):
+            results = []
+            for compiled in (False, True):
+                random.seed(seed)
+                gene1 = gene_type(key)
+                gene2 = gene_type(key)
+                if compiled:
+                    operators.init_attributes(gene1)
+                    operators.init_attributes(gene2)
+                    operators.mutate(gene1)
+                    children = [operators.copy(gene1), operators.crossover(gene1, gene2)]
+                else:
+                    gene1.init_attributes(config)
+                    gene2.init_attributes(config)
+                    gene1.mutate(config)
+                    children = [gene1.copy(), gene1.crossover(gene2)]
+                results.append([self.values(g) for g in [gene1, gene2] + children])
+                for child in children:
+                    self.assertIs(type(child), gene_type)
+            self.assertEqual(results[0], results[1])
+
+    def test_same_results(self):
+        config = self.config.genome_config
+        self.check_same_results(config, config.node_gene_type, 0)
+        self.check_same_results(config, config.connection_gene_type, (-1, 0))
+        iz_config = self.iz_config.genome_config
+        self.check_same_results(iz_config, iz_config.node_gene_type, 0)
+
+    def test_same_genomes(self):
+        def evolve():
+            random.seed(1)
+            genomes = []
+            for key in range(5):
+                g = neat.DefaultGenome(key)
+                g.configure_new(config)
+                g.fitness = random.random()
+                genomes.append(g)
+            for generation in range(10):
+                children = []
+                for key in range(5):
+                    child = neat.DefaultGenome(key)
+                    child.configure_crossover(random.choice(genomes), random.choice(genomes), config)
+                    child.mutate(config)
+                    child.fitness = random.random()
+                    children.append(child)
+                genomes = children
+            return [[self.values(g) for g in sorted(genome.nodes.values())] +
+                    [self.values(g) for g in sorted(genome.connections.values())] for genome in genomes]
+
+        config = self.config.genome_config
+        config.node_add_prob = 0.3
+        config.conn_add_prob = 0.5
+        config.node_indexer = None
+        expected = evolve()
+
+        # Operators that just call the gene methods.
+        class Operators(neat.genes.GeneOperators):
+            def __init__(self, gene_type, config):
+                neat.genes.GeneOperators.__init__(self, gene_type, config)
+                self.init_attributes = lambda gene: gene.init_attributes(config)
+                self.mutate = lambda gene: gene.mutate(config)
+                self.copy = lambda gene: gene.copy()
+                self.crossover = lambda gene1, gene2: gene1.crossover(gene2)
+
+        config.node_indexer = None
+        config._gene_operators = dict((gene_type, Operators(gene_type, config))
+                                      for gene_type in (config.node_gene_type, config.connection_gene_type))
+        self.assertEqual(evolve(), expected)
+        self.assertIsInstance(config.get_gene_operators(config.node_gene_type), Operators)
+
+    def test_settings_changed(self):
+        config = self.config.genome_config
+        operators = config.get_gene_operators(config.connection_gene_type)
+        self.assertIs(config.get_gene_operators(config.connection_gene_type), operators)
+        config.weight_mutate_rate = 0.0
+        config.weight_replace_rate = 0.0
+        operators = config.get_gene_operators(config.connection_gene_type)
+        gene = config.connection_gene_type((-1, 0))
+        operators.init_attributes(gene)
+        weight = gene.weight
+        for _ in range(100):
+            operators.mutate(gene)
+        self.assertEqual(gene.weight, weight)
+
+    def test_pickle(self):
+        config = self.config.genome_config
+        config2 = pickle.loads(pickle.dumps(config))
+        self.assertNotIn('_gene_operators', config2.__getstate__())
+        gene = config2.connection_gene_type((-1, 0))
+        config2.get_gene_operators(config2.connection_gene_type).init_attributes(gene)
+        self.assertIsInstance(gene.weight, float)
+
+    def test_overridden_methods(self):
+        calls = []
+
+        class Gene(neat.genes.DefaultNodeGene):
+            def mutate(self, config):
+                calls.append('mutate')
+
+            def copy(self):
+                calls.append('copy')
+                return neat.genes.DefaultNodeGene.copy(self)
+
+        config = self.config.genome_config
+        operators = config.get_gene_operators(Gene)
+        gene = Gene(0)
+        operators.init_attributes(gene)
+        operators.mutate(gene)
+        operators.copy(gene)
+        self.assertIsInstance(operators.crossover(gene, gene), Gene)
+        self.assertEqual(calls, ['mutate', 'copy'])
+
+    def test_overridden_attribute_methods(self):
+        class Bias(neat.attributes.FloatAttribute):
+            def init_value(self, config):
+                return 7.0
+
+            def mutate_value(self, value, config):
+                return value + 1.0
+
+        class Flag(neat.attributes.BoolAttribute):
+            def mutate_value(self, value, config):
+                return not value
+
+        class Gene(neat.genes.DefaultNodeGene):
+            _gene_attributes = [Bias('bias'), Flag('enabled', default='true')] + \
+                               neat.genes.DefaultNodeGene._gene_attributes[1:]
+
+        config = self.config.genome_config
+        config.enabled_default = 'true'
+        operators = config.get_gene_operators(Gene)
+        gene = Gene(0)
+        operators.init_attributes(gene)
+        self.assertEqual((gene.bias, gene.enabled), (7.0, True))
+        operators.mutate(gene)
+        self.assertEqual((gene.bias, gene.enabled), (8.0, False))
+
+        # The vectorized mutation also calls the overrides.
+        bias, flag = Gene._gene_attributes[:2]
+        self.assertEqual(bias.mutate_values([0.0] * 100, config), [1.0] * 100)
+        self.assertEqual(flag.mutate_values([True] * 100, config), [False] * 100)
+
+        # Replacing a value calls an overridden init_value.
+        class InitBias(neat.attributes.FloatAttribute):
+            def init_value(self, config):
+                return 7.0
+
+        config.bias_mutate_rate = 0.0
+        config.bias_replace_rate = 1.0
+        self.assertEqual(InitBias('bias').compile_mutate(config)(0.0), 7.0)
+        self.assertEqual(InitBias('bias').mutate_values([0.0] * 100, config), [7.0] * 100)
+
+
+def load_distance_config():
+    """Returns a configuration whose mutations make genomes diverge quickly."""
+    local_dir = os.path.dirname(__file__)
+    config = neat.Config(neat.DefaultGenome, neat.DefaultReproduction,
+                         neat.DefaultSpeciesSet, neat.DefaultStagnation,
+                         os.path.join(local_dir, 'test_configuration'))
+    genome_config = config.genome_config
+    genome_config.node_add_prob = 0.5
+    genome_config.conn_add_prob = 0.8
+    genome_config.conn_delete_prob = 0.1
+    genome_config.activation_options = ['sigmoid', 'relu', 'tanh']
+    genome_config.activation_mutate_rate = 0.2
+    genome_config.enabled_mutate_rate = 0.2
+    return config
+
+
+def make_distance_genomes(config):
+    """Returns a list of genomes with increasing numbers of mutations from a common ancestor, and an empty one."""
+    random.seed(11)
+    ancestor = neat.DefaultGenome(0)
+    ancestor.configure_new(config)
+    ancestor.fitness = 0.5
+    genomes = [ancestor, neat.DefaultGenome(1)]
+    for key in range(2, 12):
+        g = neat.DefaultGenome(key)
+        g.configure_crossover(random.choice(genomes[:-1]), ancestor, config)
+        for _ in range(key):
+            g.mutate(config)
+        g.fitness = random.random()
+        genomes.insert(0, g)
+    return genomes
+
+
+class TestDistanceArrays(unittest.TestCase):
+    """Tests using unittest."""
+
+    def setUp(self):
+        try:
+            import numpy  # noqa: F401
+        except ImportError:  # pragma: no cover
+            self.skipTest("NumPy is not installed")
+        self.config = load_distance_config()
+
+    def make_genomes(self):
+        return make_distance_genomes(self.config.genome_config)
+
+    def test_same_distances(self):
+        config = self.config.genome_config
+        genomes = self.make_genomes()
+        arrays = [g.distance_arrays(config) for g in genomes]
+        for g1, a1 in zip(genomes, arrays):
+            for g2, a2 in zip(genomes, arrays):
+                # Exactly equal, not just close.
+                self.assertEqual(a1.distance(a2, config), g1.distance(g2, config))
+
+    def test_unsupported(self):
+        class Genome(neat.DefaultGenome):
+            def distance(self, other, config):
+                return 0.0
+
+        self.assertIsNone(Genome(1).distance_arrays(self.config.genome_config))
+        local_dir = os.path.dirname(__file__)
+        iz_config = neat.Config(neat.iznn.IZGenome, neat.DefaultReproduction,
+                                neat.DefaultSpeciesSet, neat.DefaultStagnation,
+                                os.path.join(local_dir, 'test_configuration_iznn'))
+        self.assertIsNone(neat.iznn.IZGenome(1).distance_arrays(iz_config.genome_config))
+
+    def test_cache(self):
+        config = self.config.genome_config
+        genomes = self.make_genomes()
+        min_genes = neat.species.DISTANCE_ARRAYS_MIN_GENES
+        try:
+            neat.species.DISTANCE_ARRAYS_MIN_GENES = 5
+            distances = neat.species.GenomeDistanceCache(config)
+            for g1 in genomes:
+                for g2 in genomes:
+                    self.assertEqual(distances(g1, g2), g1.distance(g2, config))
+        finally:
+            neat.species.DISTANCE_ARRAYS_MIN_GENES = min_genes
+        self.assertIsNone(distances.arrays[1])
+        self.assertIsInstance(distances.arrays[11], neat.genome.DistanceArrays)
+
+
+class TestBoundedDistance(unittest.TestCase):
+    """Tests using unittest."""
+
+    def setUp(self):
+        self.config = load_distance_config()
+
+    def check(self, distance, bounded_distance):
+        for bound in (0.0, 0.5 * distance, distance, 1.5 * distance, float('inf')):
+            d = bounded_distance(bound)
+            if distance < bound:
+                self.assertEqual(d, distance)
+            else:
+                self.assertGreaterEqual(d, bound)
+                self.assertLessEqual(d, distance)
+
+    def test_bound(self):
+        config = self.config.genome_config
+        genomes = make_distance_genomes(config)
+        for g1 in genomes:
+            for g2 in genomes:
+                self.check(g1.distance(g2, config), lambda bound: g1.distance(g2, config, bound))
+
+    def test_bound_arrays(self):
+        try:
+            import numpy  # noqa: F401
+        except ImportError:  # pragma: no cover
+            self.skipTest("NumPy is not installed")
+        config = self.config.genome_config
+        genomes = make_distance_genomes(config)
+        for g1 in genomes:
+            a1 = g1.distance_arrays(config)
+            for g2 in genomes:
+                a2 = g2.distance_arrays(config)
+                self.check(g1.distance(g2, config), lambda bound: a1.distance(a2, config, bound))
+
+    def test_early_exit(self):
+        # Far-apart genomes stop before their homologous genes are compared.
+        config = self.config.genome_config
+        genomes = make_distance_genomes(config)
+        calls = []
+
+        class Gene(neat.genes.DefaultConnectionGene):
+            __slots__ = ()
+
+            def distance(self, other, config):
+                calls.append(self.key)
+                return neat.genes.DefaultConnectionGene.distance(self, other, config)
+
+        g1, g2 = genomes[0], genomes[-2]
+        for g in (g1, g2):
+            for cg in g.connections.values():
+                cg.__class__ = Gene
+        distance = g1.distance(g2, config)
+        self.assertTrue(calls)
+        del calls[:]
+        self.assertGreaterEqual(g1.distance(g2, config, distance / 2), distance / 2)
+        self.assertLess(len(calls), len(g1.connections.keys() & g2.connections.keys()))
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -1,6 +1,6 @@
 import random
 
-from neat.graphs import creates_cycle, required_for_output, feed_forward_layers
+from neat.graphs import Adjacency, TopologicalIndex, creates_cycle, required_for_output, feed_forward_layers
 
 
 def assert_almost_equal(x, y, tol):
@@ -149,7 +149,203 @@ def test_fuzz_feed_forward_layers():
                 continue
             connections.append((a, b))
 
-        feed_forward_layers(inputs, outputs, connections)
+        layers = feed_forward_layers(inputs, outputs, connections)
+        required = required_for_output(inputs, outputs, connections)
+        # Every node's inputs must be available before the node's layer is evaluated.
+        available = set(inputs)
+        for layer in layers:
+            assert layer <= required
+            for n in layer:
+                assert all(a in available for (a, b) in connections if b == n)
+            available.update(layer)
+
+
+# Reference copies of the original connection-scanning implementations.
+def reference_creates_cycle(connections, test):
+    i, o = test
+    if i == o:
+        return True
+
+    visited = {o}
+    while True:
+        num_added = 0
+        for a, b in connections:
+            if a in visited and b not in visited:
+                if b == i:
+                    return True
+
+                visited.add(b)
+                num_added += 1
+
+        if num_added == 0:
+            return False
+
+
+def reference_required_for_output(inputs, outputs, connections):
+    required = set(outputs)
+    s = set(outputs)
+    while 1:
+        t = set(a for (a, b) in connections if b in s and a not in s)
+        if not t:
+            break
+
+        layer_nodes = set(x for x in t if x not in inputs)
+        if not layer_nodes:
+            break
+
+        required = required.union(layer_nodes)
+        s = s.union(t)
+
+    return required
+
+
+def reference_feed_forward_layers(inputs, outputs, connections):
+    required = reference_required_for_output(inputs, outputs, connections)
+
+    layers = []
+    s = set(inputs)
+    while 1:
+        c = set(b for (a, b) in connections if a in s and b not in s)
+        t = set()
+        for n in c:
+            if n in required and all(a in s for (a, b) in connections if b == n):
+                t.add(n)
+
+        if not t:
+            break
+
+        layers.append(t)
+        s = s.union(t)
+
+    return layers
+
+
+def random_graph(acyclic):
+    n_hidden = random.randint(0, 60)
+    n_in = random.randint(1, 6)
+    n_out = random.randint(1, 6)
+    nodes = list(set(random.randint(0, 200) for _ in range(n_in + n_out + n_hidden)))
+    random.shuffle(nodes)
+
+    inputs = nodes[:n_in]
+    outputs = nodes[n_in:n_in + n_out]
+    connections = []
+    for _ in range(random.randint(0, n_hidden * 3 + 5)):
+        a = random.choice(nodes)
+        b = random.choice(nodes)
+        if acyclic and a > b:
+            a, b = b, a
+        if a == b or (a in inputs and b in inputs) or (a in outputs and b in outputs):
+            continue
+        if (a, b) not in connections:
+            connections.append((a, b))
+
+    return nodes, inputs, outputs, connections
+
+
+def test_matches_reference():
+    for _ in range(1000):
+        nodes, inputs, outputs, connections = random_graph(acyclic=random.random() < 0.5)
+        adjacency = Adjacency(connections)
+        for graph in (connections, adjacency):
+            assert reference_required_for_output(inputs, outputs, connections) == \
+                required_for_output(inputs, outputs, graph)
+            assert reference_feed_forward_layers(inputs, outputs, connections) == \
+                feed_forward_layers(inputs, outputs, graph)
+
+
+def test_creates_cycle_matches_reference():
+    for _ in range(300):
+        nodes, inputs, outputs, connections = random_graph(acyclic=True)
+        adjacency = Adjacency(connections)
+        for _ in range(20):
+            test = (random.choice(nodes), random.choice(nodes))
+            expected = reference_creates_cycle(connections, test)
+            assert expected == creates_cycle(connections, test)
+            assert expected == creates_cycle(adjacency, test)
+
+
+def test_adjacency():
+    connections = [(0, 2), (1, 2), (2, 3), (1, 3)]
+    adjacency = Adjacency(connections)
+    assert len(adjacency) == 4
+    assert set(adjacency) == set(connections)
+    assert (2, 3) in adjacency
+    assert (3, 2) not in adjacency
+    assert adjacency.successors[1] == {2, 3}
+    assert adjacency.predecessors[3] == {1, 2}
+
+    adjacency.add(3, 4)
+    assert not creates_cycle(adjacency, (0, 4))
+    assert creates_cycle(adjacency, (4, 1))
+    adjacency.remove(1, 3)
+    assert adjacency.predecessors[3] == {2}
+    assert 1 in adjacency.successors
+
+    adjacency.remove_node(2)
+    assert set(adjacency) == {(3, 4)}
+    assert 2 not in adjacency.successors and 2 not in adjacency.predecessors
+    assert feed_forward_layers([0, 1], [4], adjacency) == []
+
+    # Incremental updates must give the same answers as rebuilding the index.
+    for _ in range(100):
+        nodes, inputs, outputs, connections = random_graph(acyclic=False)
+        adjacency = Adjacency()
+        for a, b in connections:
+            adjacency.add(a, b)
+        for a, b in connections[::2]:
+            adjacency.remove(a, b)
+        remaining = connections[1::2]
+        assert set(adjacency) == set(remaining)
+        assert feed_forward_layers(inputs, outputs, adjacency) == \
+            reference_feed_forward_layers(inputs, outputs, remaining)
+
+
+def test_topological_index():
+    for _ in range(200):
+        num_nodes = random.randint(2, 40)
+        index = TopologicalIndex()
+        connections = set()
+        for _ in range(random.randint(0, 200)):
+            r = random.random()
+            if r < 0.1 and connections:
+                a, b = random.choice(sorted(connections))
+                connections.discard((a, b))
+                index.remove(a, b)
+            elif r < 0.15:
+                n = random.randrange(num_nodes)
+                connections = set(c for c in connections if n not in c)
+                index.remove_node(n)
+            else:
+                test = (random.randrange(num_nodes), random.randrange(num_nodes))
+                cycle = reference_creates_cycle(list(connections), test)
+                assert cycle == index.creates_cycle(test)
+                if cycle:
+                    try:
+                        index.add(*test)
+                        assert False, "no error adding {0!r}".format(test)
+                    except RuntimeError:
+                        pass
+                else:
+                    connections.add(test)
+                    index.add(*test)
+
+            assert set(index) == connections
+            assert len(index) == len(connections)
+            for a, b in connections:
+                assert index.order[a] < index.order[b]
+
+        rebuilt = TopologicalIndex(connections)
+        position = dict((n, i) for i, n in enumerate(rebuilt.topological_order()))
+        for a, b in connections:
+            assert position[a] < position[b]
+        assert set(index.copy()) == connections
+
+    try:
+        TopologicalIndex([(0, 1), (1, 2), (2, 0)])
+        assert False, "no error for a cyclic graph"
+    except RuntimeError:
+        pass
 
 
 if __name__ == '__main__':
@@ -158,3 +354,7 @@ if __name__ == '__main__':
     test_fuzz_required()
     test_feed_forward_layers()
     test_fuzz_feed_forward_layers()
+    test_matches_reference()
+    test_creates_cycle_matches_reference()
+    test_adjacency()
+    test_topological_index()
@@ -0,0 +1,166 @@
+import os
+import random
+import unittest
+
+import neat
+from neat.islands import migration_destinations
+
+
+def eval_size_genomes(genomes, config):
+    for genome_id, genome in genomes:
+        genome.fitness = len(genome.connections) + sum(c.weight for c in genome.connections.values())
+
+
+def eval_failing_genomes(genomes, config):
+    raise ValueError("evaluation failed")
+
+
+def size_evaluator(index):
+    return eval_size_genomes
+
+
+def eval_size_genome(genome, config):
+    return len(genome.connections) + sum(c.weight for c in genome.connections.values())
+
+
+def parallel_evaluator(index):
+    return neat.ParallelEvaluator(2, eval_size_genome).evaluate
+
+
+class InfoReporter(neat.reporting.BaseReporter):
+    def __init__(self):
+        self.messages = []
+
+    def info(self, msg):
+        self.messages.append(msg)
+
+
+class TestMigrationDestinations(unittest.TestCase):
+    def test_topologies(self):
+        self.assertEqual(migration_destinations(3, 'ring'), [[1], [2], [0]])
+        self.assertEqual(migration_destinations(3, 'fully_connected'), [[1, 2], [0, 2], [0, 1]])
+        self.assertEqual(migration_destinations(1, 'ring'), [[]])
+        rng = random.Random(1)
+        for i in range(20):
+            for index, destinations in enumerate(migration_destinations(4, 'random', rng)):
+                self.assertEqual(len(destinations), 1)
+                self.assertNotEqual(destinations[0], index)
+                self.assertIn(destinations[0], range(4))
+        with self.assertRaises(RuntimeError):
+            migration_destinations(3, 'star')
+
+
+class TestIslandModel(unittest.TestCase):
+    def setUp(self):
+        local_dir = os.path.dirname(__file__)
+        self.config = neat.Config(neat.DefaultGenome, neat.DefaultReproduction,
+                                  neat.DefaultSpeciesSet, neat.DefaultStagnation,
+                                  os.path.join(local_dir, 'test_configuration'))
+        self.config.no_fitness_termination = True
+
+    def test_run(self):
+        for topology in ('ring', 'fully_connected', 'random'):
+            islands = neat.IslandModel(self.config, 3, migration_interval=2, num_migrants=2, topology=topology)
+            reporter = InfoReporter()
+            islands.add_reporter(reporter)
+            try:
+                best = islands.run(eval_size_genomes, 5)
+                self.assertEqual(islands.generation, 5)
+                self.assertIs(best, max(islands.best_genomes, key=lambda g: g.fitness))
+                self.assertEqual(len([m for m in reporter.messages if m.startswith('Migrated')]), 2)
+
+                # Genome keys are unique: each island's are equal to its index modulo 3.
+                for index, population in enumerate(islands.populations()):
+                    self.assertGreater(len(population), self.config.pop_size // 2)
+                    self.assertEqual(set(key % 3 for key in population), {(index + 1) % 3})
+            finally:
+                islands.close()
+            self.assertEqual(islands.islands, [])
+
+    def test_create_island(self):
+        genome_config = self.config.genome_config
+        num_outputs = len(genome_config.output_keys)
+        p = neat.islands.create_island(self.config, 1, 3)
+        self.assertEqual(len(p.population), self.config.pop_size)
+        self.assertEqual(set(key % 3 for key in p.population), {2})
+        self.assertEqual(sorted(p.species.genome_to_species), sorted(p.population))
+        g = next(iter(p.population.values()))
+        for i in range(3):
+            g.mutate_add_node(genome_config)
+        hidden = [key for key in g.nodes if key >= num_outputs]
+        self.assertEqual(len(hidden), 3)
+        self.assertEqual(set((key - num_outputs) % 3 for key in hidden), {1})
+
+        # Immigrants replace offspring, under new keys.
+        for g in p.population.values():
+            g.fitness = None
+        other = neat.islands.create_island(self.config, 0, 3)
+        immigrants = list(other.population.values())[:5]
+        old_keys = [g.key for g in immigrants]
+        size = len(p.population)
+        neat.islands.add_immigrants(p, immigrants)
+        self.assertEqual(len(p.population), size)
+        for old_key, g in zip(old_keys, immigrants):
+            self.assertIs(p.population[g.key], g)
+            self.assertEqual(g.key % 3, 2)
+            self.assertEqual(p.reproduction.ancestors[g.key], (old_key,))
+            self.assertIn(g.key, p.species.genome_to_species)
+
+        # With fewer offspring than immigrants, only the fittest immigrants are added.
+        for i, g in enumerate(p.population.values()):
+            g.fitness = None if i < 3 else 1.0
+        immigrants = list(other.population.values())[5:10]
+        for i, g in enumerate(immigrants):
+            g.fitness = float(i)
+        self.assertEqual(neat.islands.add_immigrants(p, immigrants), 3)
+        self.assertEqual(len(p.population), size)
+        self.assertEqual(sorted(gid for gid, g in p.population.items() if g.fitness is None),
+                         sorted(g.key for g in immigrants[2:]))
+
+    def test_parallel_reproduction(self):
+        # Its node keys would not be spread across the islands.
+        self.config.reproduction_type = neat.ParallelReproduction
+        with self.assertRaises(RuntimeError):
+            neat.IslandModel(self.config, 2)
+
+    def test_evaluator_factory(self):
+        islands = neat.IslandModel(self.config, 2, migration_interval=1, evaluator_factory=size_evaluator)
+        try:
+            islands.run(n=2)
+            islands.run(n=1)
+            self.assertEqual(islands.generation, 3)
+        finally:
+            islands.close()
+
+    def test_parallel_evaluator(self):
+        # Each island starts a pool of worker processes of its own.
+        islands = neat.IslandModel(self.config, 2, migration_interval=1, evaluator_factory=parallel_evaluator)
+        try:
+            best = islands.run(n=2)
+            self.assertEqual(best.fitness, eval_size_genome(best, self.config))
+            processes = [process for process, conn in islands.islands]
+        finally:
+            islands.close()
+        self.assertFalse([process for process in processes if process.is_alive()])
+        self.assertEqual([process.exitcode for process in processes], [0, 0])
+
+    def test_fitness_threshold(self):
+        self.config.no_fitness_termination = False
+        self.config.fitness_threshold = 10.0
+        islands = neat.IslandModel(self.config, 2, migration_interval=2)
+        try:
+            best = islands.run(eval_size_genomes, 20)
+            self.assertGreaterEqual(best.fitness, 10.0)
+            self.assertLess(islands.generation, 20)
+        finally:
+            islands.close()
+
+    def test_error(self):
+        islands = neat.IslandModel(self.config, 2)
+        with self.assertRaises(ValueError):
+            islands.run(eval_failing_genomes, 2)
+        self.assertEqual(islands.islands, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
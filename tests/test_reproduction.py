@@ -1,6 +1,24 @@
+import os
+import random
+import tempfile
 import unittest
 
-from neat.reproduction import DefaultReproduction
+import neat
+from neat.reproduction import DefaultReproduction, BatchReproduction, ParallelReproduction
+
+
+def load_config(genome_type=neat.DefaultGenome, reproduction_type=BatchReproduction):
+    # Configuration sections are named after the classes used.
+    local_dir = os.path.dirname(__file__)
+    with open(os.path.join(local_dir, 'test_configuration')) as f:
+        text = f.read().replace('[DefaultGenome]', f'[{genome_type.__name__}]')
+        text = text.replace('[DefaultReproduction]', f'[{reproduction_type.__name__}]')
+    with tempfile.TemporaryDirectory() as tmpdir:
+        config_path = os.path.join(tmpdir, 'config')
+        with open(config_path, 'w') as f:
+            f.write(text)
+        return neat.Config(genome_type, reproduction_type, neat.DefaultSpeciesSet, neat.DefaultStagnation,
+                           config_path)
 
 
 class TestSpawnComputation(unittest.TestCase):
@@ -53,5 +71,179 @@ class TestSpawnComputation(unittest.TestCase):
         self.assertEqual(spawn, [20, 20])
 
 
+class TestBatchReproduction(unittest.TestCase):
+    def setUp(self):
+        self.config = load_config()
+        genome_config = self.config.genome_config
+        genome_config.node_add_prob = 0.2
+        genome_config.conn_add_prob = 0.5
+
+    def make_parents(self, num_parents):
+        genome_config = self.config.genome_config
+        parents = []
+        for key in range(num_parents):
+            g = neat.DefaultGenome(key)
+            g.configure_new(genome_config)
+            for _ in range(10):
+                g.mutate(genome_config)
+            g.fitness = random.random()
+            parents.append(g)
+        return parents
+
+    def test_crossover_batch(self):
+        genome_config = self.config.genome_config
+        random.seed(3)
+        parents = self.make_parents(10)
+        pairs = [tuple(random.sample(parents, 2)) for _ in range(300)]
+        children = [neat.DefaultGenome(100 + i) for i in range(len(pairs))]
+        neat.DefaultGenome.configure_crossover_batch(children, pairs, genome_config)
+
+        from_parent2 = []
+        for child, (genome1, genome2) in zip(children, pairs):
+            parent1, parent2 = (genome1, genome2) if genome1.fitness > genome2.fitness else (genome2, genome1)
+            self.assertEqual(set(child.nodes), set(parent1.nodes))
+            self.assertEqual(set(child.connections), set(parent1.connections))
+            for genes, genes1, genes2 in ((child.nodes, parent1.nodes, parent2.nodes),
+                                          (child.connections, parent1.connections, parent2.connections)):
+                for key, gene in genes.items():
+                    self.assertIsNot(gene, genes1[key])
+                    for a in gene._gene_attributes:
+                        value = getattr(gene, a.name)
+                        if key in genes2 and getattr(genes1[key], a.name) != getattr(genes2[key], a.name):
+                            self.assertIn(value, (getattr(genes1[key], a.name), getattr(genes2[key], a.name)))
+                            from_parent2.append(value == getattr(genes2[key], a.name))
+                        else:
+                            self.assertEqual(value, getattr(genes1[key], a.name))
+        self.assertGreater(len(from_parent2), 150)
+        self.assertAlmostEqual(sum(from_parent2) / len(from_parent2), 0.5, delta=0.1)
+
+    def test_mutate_batch(self):
+        genome_config = self.config.genome_config
+        genome_config.node_add_prob = genome_config.node_delete_prob = 0.0
+        genome_config.conn_add_prob = genome_config.conn_delete_prob = 0.0
+        genome_config.weight_mutate_rate = 1.0
+        genome_config.bias_mutate_rate = 0.0
+        genome_config.bias_replace_rate = 0.0
+        genomes = self.make_parents(5)
+        weights = [dict((k, cg.weight) for k, cg in g.connections.items()) for g in genomes]
+        biases = [dict((k, ng.bias) for k, ng in g.nodes.items()) for g in genomes]
+        neat.DefaultGenome.mutate_batch(genomes, genome_config)
+        for g, w, b in zip(genomes, weights, biases):
+            self.assertEqual(set(g.connections), set(w))
+            self.assertTrue(all(g.connections[k].weight != v for k, v in w.items()))
+            self.assertEqual(dict((k, ng.bias) for k, ng in g.nodes.items()), b)
+
+    def test_create_offspring(self):
+        # Outside reproduce(), offspring are bred as soon as they are created.
+        reproduction = self.config.reproduction_type(self.config.reproduction_config, neat.reporting.ReporterSet(),
+                                                     None)
+        parents = [(g.key, g) for g in self.make_parents(4)]
+        offspring = reproduction.create_offspring(self.config, parents, 6)
+        self.assertEqual(len(offspring), 6)
+        for key, child in offspring.items():
+            self.assertTrue(child.nodes)
+            self.assertIn(reproduction.ancestors[key][0], [key for key, g in parents])
+
+    def run_population(self, config):
+        config.no_fitness_termination = True
+        p = neat.Population(config)
+
+        def eval_genomes(genomes, config):
+            keys = [genome_id for genome_id, genome in genomes]
+            self.assertEqual(len(keys), len(set(keys)))
+            for genome_id, genome in genomes:
+                net = neat.nn.FeedForwardNetwork.create(genome, config)
+                genome.fitness = 1.0 - abs(net.activate((0.5, 0.5))[0] - 0.25)
+
+        p.run(eval_genomes, 10)
+        for key, ancestors in p.reproduction.ancestors.items():
+            self.assertLess(len(ancestors), 3)
+            for ancestor in ancestors:
+                self.assertLess(ancestor, key)
+        return p
+
+    def test_run(self):
+        self.assertIsInstance(self.run_population(self.config).reproduction, BatchReproduction)
+
+    def test_run_other_genome(self):
+        # Genome classes without the batch methods are reproduced one genome at a time.
+        try:
+            import numpy  # noqa: F401
+        except ImportError:  # pragma: no cover
+            self.skipTest("NumPy is not installed")
+        self.run_population(load_config(neat.ArrayGenome))
+
+
+class TestParallelReproduction(unittest.TestCase):
+    def setUp(self):
+        self.config = load_config(reproduction_type=ParallelReproduction)
+        self.config.reproduction_config.chunk_size = 4
+        genome_config = self.config.genome_config
+        genome_config.node_add_prob = 0.2
+        genome_config.conn_add_prob = 0.5
+
+    def run_population(self, num_workers):
+        self.config.reproduction_config.num_workers = num_workers
+        self.config.genome_config.node_indexer = None
+        self.config.no_fitness_termination = True
+        random.seed(7)
+        p = neat.Population(self.config)
+
+        def eval_genomes(genomes, config):
+            for genome_id, genome in genomes:
+                net = neat.nn.FeedForwardNetwork.create(genome, config)
+                genome.fitness = 1.0 - abs(net.activate((0.5, 0.5))[0] - 0.25)
+
+        try:
+            p.run(eval_genomes, 5)
+        finally:
+            p.reproduction.close()
+        return p
+
+    def test_reproducible(self):
+        # The same seed gives the same genomes, in or out of worker processes.
+        p1 = self.run_population(1)
+        p2 = self.run_population(2)
+        self.assertEqual(list(p1.population), list(p2.population))
+        for key, genome in p1.population.items():
+            self.assertEqual(genome.fingerprint(), p2.population[key].fingerprint())
+        self.assertEqual(p1.reproduction.ancestors, p2.reproduction.ancestors)
+        for key, ancestors in p1.reproduction.ancestors.items():
+            for ancestor in ancestors:
+                self.assertLess(ancestor, key)
+
+    def test_create_offspring(self):
+        genome_config = self.config.genome_config
+        genome_config.node_add_prob = 1.0
+        self.config.reproduction_config.num_workers = 1
+        reproduction = ParallelReproduction(self.config.reproduction_config, neat.reporting.ReporterSet(), None)
+        parents = []
+        for key in range(4):
+            g = neat.DefaultGenome(key)
+            g.configure_new(genome_config)
+            g.fitness = float(key)
+            parents.append((key, g))
+
+        state = random.getstate()
+        offspring = reproduction.create_offspring(self.config, parents, 10)
+        self.assertEqual(list(offspring), list(range(1, 11)))
+
+        # Each offspring has a node of its own, numbered before the node indexer.
+        parent_nodes = set(k for key, g in parents for k in g.nodes)
+        new_nodes = [k for child in offspring.values() for k in child.nodes if k not in parent_nodes]
+        self.assertEqual(len(new_nodes), 10)
+        self.assertEqual(len(set(new_nodes)), 10)
+        self.assertGreater(genome_config.get_new_node_key({}), max(new_nodes))
+
+        # The offspring depend only on the state of the random module and the indexers.
+        for key, child in offspring.items():
+            self.assertIn(reproduction.ancestors[key][0], range(4))
+        random.setstate(state)
+        reproduction.genome_indexer = iter(range(1, 11))
+        genome_config.node_indexer = None
+        again = reproduction.create_offspring(self.config, parents, 10)
+        self.assertEqual([g.fingerprint() for g in offspring.values()], [g.fingerprint() for g in again.values()])
+
+
 if __name__ == '__main__':
     unittest.main()
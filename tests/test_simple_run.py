@@ -1,5 +1,8 @@
 import multiprocessing
 import os
+import random
+import tempfile
+import time
 
 import neat
 
@@ -366,6 +369,167 @@ def test_parallel():
     stats.save()
 
 
+def eval_size_genome(genome, config):
+    return len(genome.connections) + sum(c.weight for c in genome.connections.values())
+
+
+def eval_fitness_threshold(genome, config):
+    return config.fitness_threshold
+
+
+def eval_slow_genome(genome, config):
+    time.sleep(0.05)
+    return 1.0
+
+
+def test_parallel_timeout():
+    """Test that the ParallelEvaluator timeout is per genome, whatever the chunk size."""
+    local_dir = os.path.dirname(__file__)
+    config_path = os.path.join(local_dir, 'test_configuration')
+    config = neat.Config(neat.DefaultGenome, neat.DefaultReproduction,
+                         neat.DefaultSpeciesSet, neat.DefaultStagnation,
+                         config_path)
+    genomes = list(neat.Population(config).population.items())[:8]
+
+    # Chunks of 8 genomes take 0.4 seconds, within 8 times the timeout.
+    pe = neat.ParallelEvaluator(1, eval_slow_genome, timeout=0.25, chunk_size=8)
+    assert pe.get_chunk_timeout([g for gid, g in genomes]) == 2.0
+    pe.evaluate(genomes, config)
+    assert [g.fitness for gid, g in genomes] == [1.0] * 8
+    pe.close()
+
+    # A genome taking longer than the timeout still times out.
+    pe = neat.ParallelEvaluator(1, eval_slow_genome, timeout=0.01, chunk_size=1)
+    try:
+        pe.evaluate(genomes, config)
+    except multiprocessing.TimeoutError:
+        pass
+    else:
+        raise Exception("Should have timed out")
+    pe.close()
+
+    assert neat.ParallelEvaluator(2, eval_slow_genome).get_chunk_timeout([1, 2]) is None
+
+    # With num_workers None, there is a worker per CPU.
+    pe = neat.ParallelEvaluator(None, eval_size_genome)
+    assert pe.num_workers == (os.cpu_count() or 1)
+    assert pe.get_chunk_size(100) >= 1
+    pe.evaluate(genomes, config)
+    assert [g.fitness for gid, g in genomes] == [eval_size_genome(g, config) for gid, g in genomes]
+    pe.close()
+
+
+def test_parallel_chunks():
+    """Test that ParallelEvaluator gives each genome its own fitness, whatever the chunk size."""
+    local_dir = os.path.dirname(__file__)
+    config_path = os.path.join(local_dir, 'test_configuration')
+    config = neat.Config(neat.DefaultGenome, neat.DefaultReproduction,
+                         neat.DefaultSpeciesSet, neat.DefaultStagnation,
+                         config_path)
+    p = neat.Population(config)
+    genomes = list(p.population.items())
+    expected = [eval_size_genome(g, config) for gid, g in genomes]
+
+    for chunk_size in (None, 1, 7, len(genomes) + 1):
+        pe = neat.ParallelEvaluator(2, eval_size_genome, chunk_size=chunk_size)
+        for gid, g in genomes:
+            g.fitness = None
+        pe.evaluate(genomes, config)
+        assert [g.fitness for gid, g in genomes] == expected
+        assert pe.genome_time is not None
+        pe.close()
+
+    # Adaptive chunks: a few per worker, fewer genomes once they are known to be slow or large.
+    pe = neat.ParallelEvaluator(2, eval_size_genome)
+    assert pe.get_chunk_size(150) == 19
+    assert pe.get_chunk_size(3) == 1
+    pe.genome_time = pe.target_chunk_time / 5
+    assert pe.get_chunk_size(150) == 5
+    pe.genome_bytes = pe.target_chunk_bytes // 3
+    assert pe.get_chunk_size(150) == 3
+
+    # Another config is sent to the same workers, under a new configuration version.
+    pe = neat.ParallelEvaluator(2, eval_fitness_threshold, chunk_size=1)
+    pe.evaluate(genomes[:10], config)
+    pool = pe.pool
+    pe.evaluate(genomes[:10], config)
+    assert pe.pool is pool and pe.config_version == 1
+    config2 = neat.Config(neat.DefaultGenome, neat.DefaultReproduction,
+                          neat.DefaultSpeciesSet, neat.DefaultStagnation,
+                          config_path)
+    config2.fitness_threshold = config.fitness_threshold + 1.0
+    for test_config, version in ((config2, 2), (config, 3), (config, 3)):
+        pe.evaluate(genomes[:10], test_config)
+        assert pe.pool is pool and pe.config_version == version
+        assert [g.fitness for gid, g in genomes[:10]] == [test_config.fitness_threshold] * 10
+    pe.close()
+    assert pe.pool is None
+
+
+def eval_size_genomes(genomes, config):
+    for genome_id, genome in genomes:
+        genome.fitness = eval_size_genome(genome, config)
+
+
+def run_pipelined(fitness_function, pipelined, reporter=None):
+    local_dir = os.path.dirname(__file__)
+    config_path = os.path.join(local_dir, 'test_configuration')
+    config = neat.Config(neat.DefaultGenome, neat.DefaultReproduction,
+                         neat.DefaultSpeciesSet, neat.DefaultStagnation,
+                         config_path)
+    config.no_fitness_termination = True
+    random.seed(11)
+    p = neat.Population(config)
+    stats = neat.StatisticsReporter()
+    p.add_reporter(stats)
+    if reporter is not None:
+        p.add_reporter(reporter)
+    best = p.run(fitness_function, 10, pipelined=pipelined)
+    species = dict((sid, sorted(s.members)) for sid, s in p.species.species.items())
+    return best.key, [g.fitness for g in stats.most_fit_genomes], species
+
+
+def test_pipelined():
+    """Test that a pipelined run, evaluating each generation during its speciation, gives the same results."""
+    assert run_pipelined(eval_size_genomes, True) == run_pipelined(eval_size_genomes, False)
+
+    pe = neat.ParallelEvaluator(2, eval_dummy_genome_nn)
+    assert run_pipelined(pe.evaluate, True)[0] is not None
+
+    # Errors from the fitness function on the background thread are raised by run().
+    calls = []
+
+    def eval_failing_genomes(genomes, config):
+        calls.append(len(genomes))
+        if len(calls) == 3:
+            raise ValueError("third evaluation")
+        eval_size_genomes(genomes, config)
+
+    try:
+        run_pipelined(eval_failing_genomes, True)
+    except ValueError:
+        pass
+    else:
+        raise Exception("Should have had a failure")
+    assert len(calls) == 3
+
+    # Checkpoints are saved once the background evaluation has assigned every fitness.
+    def eval_slow_genomes(genomes, config):
+        for genome_id, genome in genomes:
+            time.sleep(0.0005)
+            genome.fitness = eval_size_genome(genome, config)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        prefix = os.path.join(tmpdir, 'neat-checkpoint-')
+        run_pipelined(eval_slow_genomes, True, neat.Checkpointer(1, None, prefix))
+        for generation in range(10):
+            p = neat.Checkpointer.restore_checkpoint(prefix + str(generation))
+            for g in p.population.values():
+                # The last generation is not evaluated, so its offspring have no fitness.
+                if g.fitness is not None or generation < 9:
+                    assert g.fitness == eval_size_genome(g, p.config)
+
+
 def test_threaded_evaluation():
     """Tests a neat evolution using neat.threaded.ThreadedEvaluator"""
     # Load configuration.
@@ -0,0 +1,365 @@
+import copy
+import os
+import pickle
+import random
+import unittest
+
+import neat
+from neat.math_util import mean, stdev
+from neat.reporting import ReporterSet
+
+
+class UnboundedGenome(neat.DefaultGenome):
+    """A DefaultGenome whose distance does not take a bound, so it is always computed in full."""
+
+    def distance(self, other, config):
+        return neat.DefaultGenome.distance(self, other, config)
+
+
+class PointGenome(object):
+    """A genome that is a point in the plane, with the Euclidean distance (or a power of it) between points."""
+
+    def __init__(self, key, x, y, power=1.0):
+        self.key = key
+        self.x = x
+        self.y = y
+        self.power = power
+
+    def distance(self, other, config):
+        return ((self.x - other.x) ** 2 + (self.y - other.y) ** 2) ** (0.5 * self.power)
+
+
+class InfoReporter(neat.reporting.BaseReporter):
+    def __init__(self):
+        self.messages = []
+
+    def info(self, msg):
+        self.messages.append(msg)
+
+
+class TestSpeciate(unittest.TestCase):
+    def setUp(self):
+        local_dir = os.path.dirname(__file__)
+        self.config = neat.Config(neat.DefaultGenome, neat.DefaultReproduction,
+                                  neat.DefaultSpeciesSet, neat.DefaultStagnation,
+                                  os.path.join(local_dir, 'test_configuration'))
+        genome_config = self.config.genome_config
+        genome_config.node_add_prob = 0.5
+        genome_config.conn_add_prob = 0.8
+        self.config.species_set_config.compatibility_threshold = 1.5
+
+    def make_population(self, first_key, size):
+        genome_config = self.config.genome_config
+        population = {}
+        for key in range(first_key, first_key + size):
+            g = neat.DefaultGenome(key)
+            g.configure_new(genome_config)
+            for _ in range(random.randrange(10)):
+                g.mutate(genome_config)
+            population[key] = g
+        return population
+
+    def speciate(self, species_set, population):
+        # Make set iteration order the same for both species sets.
+        random.seed(5)
+        species_set.speciate(self.config, population, 0)
+        return dict((sid, sorted(s.members)) for sid, s in species_set.species.items())
+
+    def test_bounded_same_species(self):
+        # Bounded distances give the same species as distances computed in full.
+        random.seed(1)
+        bounded = neat.DefaultSpeciesSet(self.config.species_set_config, ReporterSet())
+        unbounded = neat.DefaultSpeciesSet(self.config.species_set_config, ReporterSet())
+        for generation in range(3):
+            population = self.make_population(1 + 60 * generation, 60)
+            unbounded_population = copy.deepcopy(population)
+            for g in unbounded_population.values():
+                g.__class__ = UnboundedGenome
+            species = self.speciate(bounded, population)
+            self.assertGreater(len(species), 1)
+            self.assertEqual(species, self.speciate(unbounded, unbounded_population))
+            for sid, s in bounded.species.items():
+                self.assertEqual(s.representative.key, unbounded.species[sid].representative.key)
+
+    def test_cache_bound(self):
+        random.seed(2)
+        population = self.make_population(1, 20)
+        genome_config = self.config.genome_config
+        distances = neat.species.GenomeDistanceCache(genome_config)
+        genomes = list(population.values())
+        lower_bounds = 0
+        for g1 in genomes:
+            for g2 in genomes:
+                distance = g1.distance(g2, genome_config)
+                d = distances(g1, g2, 0.1)
+                if distance < 0.1:
+                    self.assertEqual(d, distance)
+                else:
+                    self.assertGreaterEqual(d, 0.1)
+                    lower_bounds += d < distance
+        self.assertGreater(lower_bounds, 0)
+        self.assertTrue(distances.lower_bounds)
+        # A lower bound is not returned for a larger bound, nor as the distance.
+        for (k1, k2), d in list(distances.lower_bounds.items()):
+            distance = population[k1].distance(population[k2], genome_config)
+            self.assertEqual(distances(population[k1], population[k2]), distance)
+        # The distance replaces the lower bound.
+        self.assertFalse(set(distances.lower_bounds) & set(distances.distances))
+
+    def test_cache_size(self):
+        random.seed(6)
+        population = self.make_population(1, 20)
+        genome_config = self.config.genome_config
+        genomes = list(population.values())
+        distances = neat.species.GenomeDistanceCache(genome_config)
+        values = []
+        for g1 in genomes:
+            for g2 in genomes:
+                if g1.key < g2.key:
+                    values.append(distances(g1, g2))
+                    # Each pair is stored once, for either order.
+                    self.assertEqual(distances(g2, g1), values[-1])
+        self.assertEqual(len(distances), len(values))
+        self.assertEqual(distances.hits, len(values))
+        self.assertEqual(distances.misses, len(values))
+        self.assertEqual(distances.statistics.count, len(values))
+        self.assertAlmostEqual(distances.statistics.mean, mean(values))
+        self.assertAlmostEqual(distances.statistics.stdev(), stdev(values))
+
+        # A bounded cache keeps the most recently used values.
+        bounded = neat.species.GenomeDistanceCache(genome_config, max_entries=10)
+        for g in genomes:
+            bounded(genomes[0], g)
+            bounded(genomes[1], genomes[2])
+        self.assertEqual(len(bounded), 10)
+        self.assertEqual(bounded.peak_entries, 10)
+        self.assertEqual(bounded.evictions, len(genomes) - 9)
+        self.assertIn((2, 3), bounded.distances)
+        self.assertNotIn((1, 2), bounded.distances)
+        self.assertEqual(bounded(genomes[0], genomes[1]), genomes[0].distance(genomes[1], genome_config))
+
+        bounded.clear()
+        self.assertEqual(len(bounded), 0)
+        self.assertEqual(bounded.misses, len(genomes) + 2)
+
+    def test_distance_cache_size(self):
+        # A bounded cache gives the same species.
+        random.seed(7)
+        unlimited = neat.DefaultSpeciesSet(self.config.species_set_config, ReporterSet())
+        limited_config = copy.copy(self.config.species_set_config)
+        limited_config.distance_cache_size = 50
+        limited = neat.DefaultSpeciesSet(limited_config, ReporterSet())
+        for generation in range(3):
+            population = self.make_population(1 + 60 * generation, 60)
+            self.assertEqual(self.speciate(limited, population), self.speciate(unlimited, population))
+        self.assertEqual(limited.distance_cache.peak_entries, 50)
+        self.assertGreater(limited.distance_cache.evictions, 0)
+        self.assertEqual(len(limited.distance_cache), 0)
+        self.assertEqual(unlimited.distance_cache.evictions, 0)
+
+        # The cache counts are only kept as attributes; the distance report says which distances it covers.
+        reporters = ReporterSet()
+        reporter = InfoReporter()
+        reporters.add(reporter)
+        species_set = neat.DefaultSpeciesSet(self.config.species_set_config, reporters)
+        self.speciate(species_set, population)
+        messages = [m for m in reporter.messages if m.startswith('Mean genetic distance')]
+        self.assertEqual(len(messages), 1)
+        distances = species_set.distance_cache
+        self.assertGreater(distances.bounded, 0)
+        self.assertIn('of the {0} distances computed in full ({1} more, found to exceed a bound, left out)'.format(
+            distances.statistics.count, distances.bounded), messages[0])
+        self.assertFalse([m for m in reporter.messages if 'cache' in m])
+
+        # Without bounds, every distance is computed in full and covered by the report.
+        reporter.messages = []
+        points = dict((key, PointGenome(key, random.uniform(0, 10), random.uniform(0, 10))) for key in range(1, 61))
+        species_set = neat.DefaultSpeciesSet(self.config.species_set_config, reporters)
+        species_set.speciate(self.config, points, 0)
+        distances = species_set.distance_cache
+        self.assertEqual(distances.bounded, 0)
+        messages = [m for m in reporter.messages if m.startswith('Mean genetic distance')]
+        self.assertEqual(messages, ['Mean genetic distance {0:.3f}, standard deviation {1:.3f}'.format(
+            distances.statistics.mean, distances.statistics.stdev())])
+
+    def test_parallel_same_species(self):
+        # Distances computed in worker processes give the same species as serial speciation.
+        random.seed(3)
+        serial = neat.DefaultSpeciesSet(self.config.species_set_config, ReporterSet())
+        parallel_config = copy.copy(self.config.species_set_config)
+        parallel_config.num_workers = 2
+        reporters = ReporterSet()
+        reporter = InfoReporter()
+        reporters.add(reporter)
+        parallel = neat.DefaultSpeciesSet(parallel_config, reporters)
+        try:
+            for generation in range(3):
+                population = self.make_population(1 + 60 * generation, 60)
+                species = self.speciate(parallel, population)
+                self.assertGreater(len(species), 1)
+                self.assertEqual(species, self.speciate(serial, population))
+                for sid, s in parallel.species.items():
+                    self.assertEqual(s.representative.key, serial.species[sid].representative.key)
+            self.assertIsNotNone(parallel.pool)
+            self.assertEqual(len([m for m in reporter.messages if 'worker processes' in m]), 3)
+
+            # The worker processes are not pickled (for checkpoints, for instance).
+            restored = pickle.loads(pickle.dumps(parallel))
+            self.assertIsNone(restored.pool)
+            self.assertEqual(sorted(restored.species), sorted(parallel.species))
+        finally:
+            parallel.close()
+        self.assertIsNone(parallel.pool)
+
+    def test_adaptive_threshold(self):
+        random.seed(8)
+        config = copy.copy(self.config.species_set_config)
+        config.compatibility_threshold = 0.5
+        config.target_num_species = 5
+        config.threshold_adjust_gain = 0.2
+        config.max_compatibility_threshold = 3.0
+        reporters = ReporterSet()
+        reporter = InfoReporter()
+        reporters.add(reporter)
+        species_set = neat.DefaultSpeciesSet(config, reporters)
+        population = self.make_population(1, 60)
+        species_set.speciate(self.config, population, 0)
+        num_species = len(species_set.species)
+        self.assertGreater(num_species, 5)
+        expected = 0.5 * (1.0 + 0.2 * (num_species - 5) / 5.0)
+        self.assertAlmostEqual(species_set.compatibility_threshold, min(3.0, expected))
+        self.assertEqual(len([m for m in reporter.messages if 'Compatibility threshold' in m]), 1)
+
+        # Too few species lower the threshold, down to the minimum.
+        config.max_compatibility_threshold = 2000.0
+        species_set.species = {}
+        species_set.compatibility_threshold = 1000.0
+        species_set.speciate(self.config, self.make_population(61, 60), 1)
+        self.assertEqual(len(species_set.species), 1)
+        self.assertAlmostEqual(species_set.compatibility_threshold, 1000.0 * (1.0 - 0.2 * 4 / 5.0))
+        config.min_compatibility_threshold = 900.0
+        species_set.species = {}
+        species_set.speciate(self.config, self.make_population(121, 60), 2)
+        self.assertEqual(species_set.compatibility_threshold, 900.0)
+
+        # With no target, the configured threshold is used.
+        config.target_num_species = 0
+        species_set.speciate(self.config, self.make_population(181, 60), 3)
+        self.assertEqual(species_set.compatibility_threshold, 0.5)
+
+    def test_threshold_bounds(self):
+        params = {'compatibility_threshold': '3.0', 'target_num_species': '10',
+                  'min_compatibility_threshold': '0.0'}
+        with self.assertRaises(RuntimeError):
+            neat.DefaultSpeciesSet.parse_config(params)
+        params['min_compatibility_threshold'] = '1.0'
+        config = neat.DefaultSpeciesSet.parse_config(params)
+        self.assertEqual(config.target_num_species, 10)
+        self.assertEqual(config.max_compatibility_threshold, 100.0)
+
+    def test_add_remove_genome(self):
+        random.seed(9)
+        species_set = neat.DefaultSpeciesSet(self.config.species_set_config, ReporterSet())
+        population = self.make_population(1, 40)
+        self.speciate(species_set, population)
+        for g in self.make_population(41, 20).values():
+            sid = species_set.add_genome(self.config, g, 1)
+            self.assertIs(species_set.get_species(g.key).members[g.key], g)
+            d = min(g.distance(s.representative, self.config.genome_config) for s in species_set.species.values())
+            if species_set.species[sid].representative is g:
+                self.assertEqual(species_set.species[sid].created, 1)
+            else:
+                self.assertEqual(g.distance(species_set.species[sid].representative, self.config.genome_config), d)
+                self.assertLess(d, self.config.species_set_config.compatibility_threshold)
+
+        sid = species_set.get_species_id(1)
+        for gid in list(species_set.species[sid].members):
+            self.assertEqual(species_set.remove_genome(gid), sid)
+        self.assertNotIn(sid, species_set.species)
+        self.assertNotIn(1, species_set.genome_to_species)
+
+
+class TestRepresentativeIndex(unittest.TestCase):
+    def make_points(self, n, power=1.0):
+        random.seed(4)
+        return [PointGenome(key, random.uniform(0, 10), random.uniform(0, 10), power) for key in range(n)]
+
+    def partition(self, points, num_pivots, bound):
+        index = neat.species.RepresentativeIndex(neat.species.GenomeDistanceCache(None), num_pivots)
+        assignments = []
+        for g in points:
+            sid = index.nearest(g, bound)
+            if sid is None:
+                sid = g.key
+                index.add(sid, g)
+            assignments.append(sid)
+        return assignments, index
+
+    def test_same_as_exhaustive(self):
+        points = self.make_points(500)
+        expected, exhaustive = self.partition(points, 0, 1.0)
+        self.assertEqual(exhaustive.pruned, 0)
+        for num_pivots in (1, 4, 16):
+            assignments, index = self.partition(points, num_pivots, 1.0)
+            self.assertEqual(assignments, expected)
+            self.assertTrue(index.metric)
+            self.assertGreater(index.pruned, 0)
+            self.assertLess(index.computed, exhaustive.computed)
+
+    def test_not_metric(self):
+        # The squared distance does not satisfy the triangle inequality.
+        points = self.make_points(500, power=2.0)
+        assignments, index = self.partition(points, 4, 1.0)
+        self.assertFalse(index.metric)
+        pruned = index.pruned
+        g = PointGenome(len(points), 5.0, 5.0, power=2.0)
+        index.nearest(g, 1.0)
+        self.assertEqual(index.pruned, pruned)
+
+    def test_wrong_species_if_not_metric(self):
+        # With the squared distance, the pivot at 0 puts the representative at 2 at least
+        # |1.44 - 4| away from a genome at 1.2, which is in fact 0.64 from it; no distance
+        # computed shows the triangle inequality fails, so the wrong species is chosen.
+        pivot, other = PointGenome(0, 0.0, 0.0, power=2.0), PointGenome(1, 2.0, 0.0, power=2.0)
+        g = PointGenome(2, 1.2, 0.0, power=2.0)
+        for num_pivots, expected in ((0, 1), (1, 0)):
+            index = neat.species.RepresentativeIndex(neat.species.GenomeDistanceCache(None), num_pivots)
+            index.add(0, pivot)
+            index.add(1, other)
+            self.assertEqual(index.nearest(g, 2.0), expected)
+            self.assertTrue(index.metric)
+
+        # So the species set only uses pivots for a distance declared to be a metric.
+        params = {'compatibility_threshold': '3.0', 'num_pivots': '4'}
+        with self.assertRaises(RuntimeError):
+            neat.DefaultSpeciesSet.parse_config(params)
+        params['distance_is_metric'] = 'True'
+        self.assertEqual(neat.DefaultSpeciesSet.parse_config(params).num_pivots, 4)
+
+    def test_speciate(self):
+        local_dir = os.path.dirname(__file__)
+        config = neat.Config(neat.DefaultGenome, neat.DefaultReproduction,
+                             neat.DefaultSpeciesSet, neat.DefaultStagnation,
+                             os.path.join(local_dir, 'test_configuration'))
+        config.species_set_config.compatibility_threshold = 1.5
+        config.species_set_config.num_pivots = 4
+        config.species_set_config.distance_is_metric = True
+        reporters = ReporterSet()
+        reporter = InfoReporter()
+        reporters.add(reporter)
+        species_set = neat.DefaultSpeciesSet(config.species_set_config, reporters)
+        random.seed(5)
+        population = {}
+        for key in range(1, 101):
+            g = neat.DefaultGenome(key)
+            g.configure_new(config.genome_config)
+            for _ in range(random.randrange(10)):
+                g.mutate(config.genome_config)
+            population[key] = g
+        species_set.speciate(config, population, 0)
+        self.assertEqual(sorted(species_set.genome_to_species), sorted(population))
+        self.assertEqual(len([m for m in reporter.messages if 'Representative index' in m]), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
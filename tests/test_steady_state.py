@@ -0,0 +1,101 @@
+import os
+import tempfile
+import unittest
+
+import neat
+
+
+def eval_size(genome, config):
+    return len(genome.connections) + sum(c.weight for c in genome.connections.values())
+
+
+def eval_failing(genome, config):
+    raise ValueError("evaluation failed")
+
+
+class TestSteadyStatePopulation(unittest.TestCase):
+    def setUp(self):
+        local_dir = os.path.dirname(__file__)
+        self.config = neat.Config(neat.DefaultGenome, neat.DefaultReproduction,
+                                  neat.DefaultSpeciesSet, neat.DefaultStagnation,
+                                  os.path.join(local_dir, 'test_configuration'))
+        self.config.no_fitness_termination = True
+
+    def check_population(self, p):
+        self.assertEqual(len(p.population), self.config.pop_size)
+        species_set = p.species
+        for gid, sid in species_set.genome_to_species.items():
+            self.assertIs(species_set.species[sid].members[gid], p.population[gid])
+        for s in species_set.species.values():
+            self.assertTrue(s.members)
+            for g in s.members.values():
+                self.assertIsNotNone(g.fitness)
+
+    def test_run(self):
+        p = neat.SteadyStatePopulation(self.config)
+        stats = neat.StatisticsReporter()
+        p.add_reporter(stats)
+        initial_keys = set(p.population)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            prefix = os.path.join(tmpdir, 'checkpoint-')
+            p.add_reporter(neat.Checkpointer(1, None, prefix))
+            best = p.run(eval_size, 3, num_workers=2)
+            self.assertEqual(p.generation, 3)
+            self.assertEqual(len(stats.most_fit_genomes), 3)
+            self.assertEqual(best.fitness, max(g.fitness for g in stats.most_fit_genomes))
+            self.assertTrue(set(p.population) - initial_keys)
+            self.check_population(p)
+
+            # Continue from the last checkpoint.
+            restored = neat.Checkpointer.restore_checkpoint(prefix + '2')
+            p = neat.SteadyStatePopulation(restored.config,
+                                           (restored.population, restored.species, restored.generation))
+            p.run(eval_size, 1, num_workers=2)
+            self.assertEqual(p.generation, restored.generation + 1)
+            self.check_population(p)
+
+    def test_fitness_threshold(self):
+        self.config.no_fitness_termination = False
+        self.config.fitness_threshold = 10.0
+        p = neat.SteadyStatePopulation(self.config)
+        best = p.run(eval_size, 10, num_workers=2)
+        self.assertGreaterEqual(best.fitness, 10.0)
+        self.assertLess(p.generation, 10)
+
+    def test_replace_worst(self):
+        p = neat.SteadyStatePopulation(self.config)
+        for i, g in enumerate(p.population.values()):
+            g.fitness = float(i)
+        worst = min(p.population.values(), key=lambda g: g.fitness / len(p.species.get_species(g.key).members))
+        child = p.replace_worst()
+        self.assertNotIn(worst.key, p.population)
+        self.assertNotIn(worst.key, p.species.genome_to_species)
+        self.assertIs(p.population[child.key], child)
+        self.assertIsNone(child.fitness)
+
+    def test_elitism(self):
+        # Elite members are replaced once no other genome can be: with every genome
+        # in a species of its own, or with elitism as large as the population.
+        self.config.species_set_config.compatibility_threshold = 1e-9
+        p = neat.SteadyStatePopulation(self.config)
+        self.assertEqual(len(p.species.species), self.config.pop_size)
+        p.run(eval_size, 2, num_workers=1)
+        self.assertEqual(p.generation, 2)
+        self.check_population(p)
+
+        self.config.species_set_config.compatibility_threshold = 3.0
+        self.config.pop_size = 10
+        self.config.reproduction_config.elitism = 10
+        p = neat.SteadyStatePopulation(self.config)
+        p.run(eval_size, 2, num_workers=1)
+        self.assertEqual(p.generation, 2)
+        self.check_population(p)
+
+    def test_error(self):
+        p = neat.SteadyStatePopulation(self.config)
+        with self.assertRaises(ValueError):
+            p.run(eval_failing, 1, num_workers=2)
+
+
+if __name__ == '__main__':
+    unittest.main()
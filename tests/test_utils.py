@@ -33,5 +33,18 @@ def test_softmax():
     # print("Softmax for [1, 2, 3, 4, 1, 2, 3] is {!r}".format(softmax_result))
 
 
+def test_running_stats():
+    """Test the neat.math_util.RunningStats class against mean and stdev."""
+    values = [0.5, 2.0, 1.25, 3.5, 0.75, 2.0]
+    stats = neat.math_util.RunningStats()
+    for v in values:
+        stats.add(v)
+    assert stats.count == len(values)
+    assert_almost_equal(stats.mean, neat.math_util.mean(values))
+    assert_almost_equal(stats.variance(), neat.math_util.variance(values))
+    assert_almost_equal(stats.stdev(), neat.math_util.stdev(values))
+
+
 if __name__ == '__main__':
     test_softmax()
+    test_running_stats()
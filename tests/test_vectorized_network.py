@@ -0,0 +1,172 @@
+import os
+import random
+import unittest
+
+import neat
+from neat import activations, aggregations
+from neat.nn import FeedForwardNetwork, VectorizedFeedForwardNetwork, VectorizedPopulationNetwork
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+
+def load_config():
+    local_dir = os.path.dirname(__file__)
+    config_path = os.path.join(local_dir, 'test_configuration')
+    return neat.Config(neat.DefaultGenome, neat.DefaultReproduction,
+                       neat.DefaultSpeciesSet, neat.DefaultStagnation,
+                       config_path)
+
+
+def random_genome(config, key, num_mutations):
+    g = neat.DefaultGenome(key)
+    g.configure_new(config.genome_config)
+    for _ in range(num_mutations):
+        g.mutate(config.genome_config)
+    activation_names = sorted(config.genome_config.activation_defs.functions)
+    aggregation_names = sorted(config.genome_config.aggregation_function_defs.functions)
+    for ng in g.nodes.values():
+        ng.activation = random.choice(activation_names)
+        ng.aggregation = random.choice(aggregation_names)
+    return g
+
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class TestVectorizedFeedForwardNetwork(unittest.TestCase):
+    def setUp(self):
+        self.config = load_config()
+        self.config.genome_config.num_inputs = 3
+        self.config.genome_config.input_keys = [-1, -2, -3]
+        self.config.genome_config.num_outputs = 2
+        self.config.genome_config.output_keys = [0, 1]
+        self.config.genome_config.node_add_prob = 0.5
+        self.config.genome_config.node_delete_prob = 0.05
+        self.config.genome_config.conn_delete_prob = 0.05
+
+    def test_activation_functions(self):
+        from neat.nn.vectorized import vectorize_activation
+        z = [x / 10.0 for x in range(-100, 101)] + [-1e6, 1e6, 1e-9]
+        for name, f in activations.ActivationFunctionSet().functions.items():
+            vf = vectorize_activation(f)
+            expected = [f(x) for x in z]
+            np.testing.assert_allclose(vf(np.array(z)), expected, rtol=1e-9, atol=1e-12, err_msg=name)
+
+    def test_aggregation_functions(self):
+        from neat.nn.vectorized import vectorize_aggregation
+        x = np.array([[0.5, -2.0, 1.5, 0.25], [3.0, -3.0, 1.0, 2.0]])
+        for name, f in aggregations.AggregationFunctionSet().functions.items():
+            vf = vectorize_aggregation(f)
+            expected = [f(list(row)) for row in x]
+            np.testing.assert_allclose(vf(x, axis=-1), expected, err_msg=name)
+
+    def test_custom_functions(self):
+        def half(z):
+            return z / 2.0
+
+        def first(x):
+            return list(x)[0]
+
+        self.config.genome_config.add_activation('half', half)
+        self.config.genome_config.add_aggregation('first', first)
+        for key in range(20):
+            g = random_genome(self.config, key, 20)
+            for ng in g.nodes.values():
+                ng.activation = random.choice(['half', 'tanh'])
+                ng.aggregation = random.choice(['first', 'sum'])
+            self.check_equivalent(g)
+
+    def test_random_genomes(self):
+        for key in range(100):
+            g = random_genome(self.config, key, random.randint(0, 60))
+            self.check_equivalent(g)
+
+    def test_unconnected(self):
+        self.config.genome_config.initial_connection = 'unconnected'
+        g = neat.DefaultGenome(0)
+        g.configure_new(self.config.genome_config)
+        net = VectorizedFeedForwardNetwork.create(g, self.config)
+        self.assertEqual(net.activate([1.0, 2.0, 3.0]), [0.0, 0.0])
+
+    def test_wrong_number_of_inputs(self):
+        g = random_genome(self.config, 0, 5)
+        net = VectorizedFeedForwardNetwork.create(g, self.config)
+        with self.assertRaises(RuntimeError):
+            net.activate([1.0])
+
+    def test_activate_batch(self):
+        for key in range(50):
+            g = random_genome(self.config, key, random.randint(0, 60))
+            net = FeedForwardNetwork.create(g, self.config)
+            vnet = VectorizedFeedForwardNetwork.create(g, self.config)
+            inputs = np.random.uniform(-2.0, 2.0, (17, 3))
+            expected = [net.activate(row) for row in inputs]
+            np.testing.assert_allclose(net.activate_batch(inputs), expected, rtol=1e-9, atol=1e-9)
+            np.testing.assert_allclose(vnet.activate_batch(inputs), expected, rtol=1e-9, atol=1e-9)
+
+    def test_activate_batch_shape(self):
+        g = random_genome(self.config, 0, 5)
+        for net in (FeedForwardNetwork.create(g, self.config), VectorizedFeedForwardNetwork.create(g, self.config)):
+            self.assertEqual(net.activate_batch(np.zeros((0, 3))).shape, (0, 2))
+            self.assertEqual(net.activate_batch([[1.0, 2.0, 3.0]]).shape, (1, 2))
+            with self.assertRaises(RuntimeError):
+                net.activate_batch([1.0, 2.0, 3.0])
+            with self.assertRaises(RuntimeError):
+                net.activate_batch(np.zeros((4, 2)))
+
+    def test_population_network(self):
+        genomes = [random_genome(self.config, key, random.randint(0, 60)) for key in range(40)]
+        pnet = VectorizedPopulationNetwork.create(genomes, self.config)
+        self.assertEqual(pnet.genome_keys, list(range(40)))
+
+        inputs = np.random.uniform(-2.0, 2.0, (23, 3))
+        outputs = pnet.activate_batch(inputs)
+        self.assertEqual(outputs.shape, (40, 23, 2))
+        for g, genome_outputs in zip(genomes, outputs):
+            net = FeedForwardNetwork.create(g, self.config)
+            expected = [net.activate(row) for row in inputs]
+            np.testing.assert_allclose(genome_outputs, expected, rtol=1e-9, atol=1e-9)
+
+        single = pnet.activate(inputs[0])
+        self.assertEqual(single.shape, (40, 2))
+        np.testing.assert_allclose(single, outputs[:, 0, :])
+
+    def test_population_network_segments(self):
+        # A packed population is too sparse for dense matrix products; its segmented
+        # reductions loop over the distinct numbers of inputs, not over the nodes.
+        genomes = [random_genome(self.config, key, random.randint(20, 60)) for key in range(40)]
+        for g in genomes:
+            for ng in g.nodes.values():
+                ng.aggregation = 'sum'
+        pnet = VectorizedPopulationNetwork.create(genomes, self.config)
+        groups = [group for layer in pnet.layers for group in layer.aggregation_groups]
+        segment_groups = [group for group in groups if isinstance(group, neat.nn.vectorized._SegmentGroup)]
+        self.assertTrue(segment_groups)
+        self.assertFalse([group for group in groups if isinstance(group, neat.nn.vectorized._GenericGroup)])
+        for group in segment_groups:
+            fan_ins = np.diff(np.append(group.offsets, len(group.sources)))
+            self.assertEqual([k for nodes, k, sources, weights in group.fan_in_groups], sorted(set(fan_ins.tolist())))
+        self.assertLess(sum(len(group.fan_in_groups) for group in segment_groups),
+                        sum(group.stop - group.start for group in segment_groups))
+
+        inputs = np.random.uniform(-2.0, 2.0, (9, 3))
+        outputs = pnet.activate_batch(inputs)
+        for g, genome_outputs in zip(genomes, outputs):
+            net = FeedForwardNetwork.create(g, self.config)
+            np.testing.assert_allclose(genome_outputs, [net.activate(row) for row in inputs], rtol=1e-9, atol=1e-9)
+
+    def test_empty_population_network(self):
+        pnet = VectorizedPopulationNetwork.create([], self.config)
+        self.assertEqual(pnet.activate_batch(np.zeros((5, 3))).shape, (0, 5, 2))
+
+    def check_equivalent(self, g):
+        net = FeedForwardNetwork.create(g, self.config)
+        vnet = VectorizedFeedForwardNetwork.create(g, self.config)
+        for _ in range(5):
+            inputs = [random.uniform(-2.0, 2.0) for _ in range(3)]
+            np.testing.assert_allclose(vnet.activate(inputs), net.activate(inputs), rtol=1e-9, atol=1e-9)
+
+
+if __name__ == '__main__':
+    unittest.main()